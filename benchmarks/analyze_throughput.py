@@ -0,0 +1,48 @@
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from novel_tools.toolkit import analyze
+from novel_tools.utils import get_config
+from .corpus import generate_novel
+
+
+def run(config_filename: str, text_path: Path, out_dir: Path, **kwargs) -> float:
+    config = get_config(config_filename, Path('config'))
+    start = time.perf_counter()
+    analyze(config, filename=text_path, out_dir=out_dir, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures the wall time of the built-in toolkits.')
+    parser.add_argument('-t', '--toolkit', default='struct', help='The toolkit to run, e.g. struct or create.')
+    parser.add_argument('-c', '--chapters', type=int, default=50, help='Number of chapters per volume.')
+    parser.add_argument('-b', '--batch_size', type=int, nargs='*', default=[1, 64, 512])
+    parser.add_argument('-p', '--pipelined', action='store_true', help='Also run every batch size pipelined.')
+    parser.add_argument('-C', '--compiled', action='store_true', help='Also run every batch size compiled.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        text_path = generate_novel(tmp / 'novel.txt', chapters=args.chapters)
+        size = text_path.stat().st_size / 2 ** 20
+        if args.toolkit == 'create':
+            # The create toolkit needs the structure file generated by struct, plus the book metadata.
+            run('struct_config.json', text_path, tmp)
+            with (tmp / 'metadata.json').open('wt') as f:
+                json.dump({'title': 'Benchmark'}, f)
+
+        print(f'{args.toolkit}: {size:.1f} MB')
+        for batch_size in args.batch_size:
+            for pipelined in [False, True] if args.pipelined else [False]:
+                for compiled in [False, True] if args.compiled else [False]:
+                    elapsed = run(f'{args.toolkit}_config.json', text_path, tmp, batch_size=batch_size,
+                                  pipelined=pipelined, compiled=compiled)
+                    print(f'batch_size={batch_size}, pipelined={pipelined}, compiled={compiled}: {elapsed:.2f}s '
+                          f'({size / elapsed:.1f} MB/s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+import random
+from pathlib import Path
+
+chinese_digits = '一二三四五六七八九'
+sentence = '他抬头望向远方的群山，心中默默想着那些早已逝去的日子。'
+
+
+def to_chinese(num: int) -> str:
+    """Converts a number below 1000 to its Chinese form, which is enough for volume and chapter indices."""
+    hundreds, rest = divmod(num, 100)
+    tens, ones = divmod(rest, 10)
+    result = chinese_digits[hundreds - 1] + '百' if hundreds else ''
+    if tens:
+        result += '十' if tens == 1 and not hundreds else chinese_digits[tens - 1] + '十'
+    elif hundreds and ones:
+        result += '零'
+    return result + (chinese_digits[ones - 1] if ones else '')
+
+
+def generate_lines(volumes: int = 10, chapters: int = 50, paragraphs: int = 80, seed: int = 0) -> list[str]:
+    """Generates the lines of a synthetic Chinese novel that can be processed by `config/struct_config.json`."""
+    rng = random.Random(seed)
+    lines = ['示例小说', '']
+    for volume in range(1, volumes + 1):
+        lines.append(f'第{to_chinese(volume)}卷 卷名{volume}')
+        lines.append('')
+        for chapter in range(1, chapters + 1):
+            lines.append(f'第{to_chinese(chapter)}章 章名{chapter}')
+            lines.append('')
+            for _ in range(paragraphs):
+                lines.append('　　' + sentence * rng.randint(1, 6))
+                lines.append('')
+
+    return lines
+
+
+def generate_novel(path: Path, **kwargs) -> Path:
+    with path.open('wt', encoding='utf-8') as f:
+        f.write('\n'.join(generate_lines(**kwargs)))
+    return path
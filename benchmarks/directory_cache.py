@@ -0,0 +1,37 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from novel_tools.readers.directory_reader import DirectoryReader
+from .directory_prefetch import generate_directory
+
+
+def run(in_dir: Path, **kwargs) -> float:
+    reader = DirectoryReader({'in_dir': in_dir, 'read_contents': True, 'discard_chapters': False} | kwargs)
+    start = time.perf_counter()
+    for _ in reader.read():
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures DirectoryReader with and without the incremental cache.')
+    parser.add_argument('-v', '--volumes', type=int, default=10)
+    parser.add_argument('-c', '--chapters', type=int, default=500, help='Number of chapters per volume.')
+    parser.add_argument('-e', '--edits', type=int, default=5, help='Number of chapter files to edit between runs.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        in_dir = generate_directory(Path(tmp), args.volumes, args.chapters)
+        print(f'{args.volumes * args.chapters} chapter files')
+        print(f'no cache: {run(in_dir):.2f}s')
+        print(f'cache, first run: {run(in_dir, cache=True):.2f}s')
+        print(f'cache, unchanged: {run(in_dir, cache=True):.2f}s')
+        for chapter in sorted(in_dir.glob('*/*.txt'))[:args.edits]:
+            with chapter.open('at', encoding='utf-8') as f:
+                f.write('\n新的一行')
+        print(f'cache, {args.edits} files edited: {run(in_dir, cache=True):.2f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+from novel_tools.readers.directory_reader import DirectoryReader
+from .corpus import generate_lines
+
+
+def generate_directory(path: Path, volumes: int, chapters: int) -> Path:
+    """Writes one file per chapter, in the layout generated by DirectoryWriter."""
+    lines = generate_lines(volumes, chapters, paragraphs=20)
+    volume_path = None
+    chapter_lines = []
+    for line in lines[2:] + ['第']:
+        if line.startswith('第') and chapter_lines:
+            with (volume_path / f'{chapter_lines[0]}.txt').open('wt', encoding='utf-8') as f:
+                f.write('\n'.join(chapter_lines))
+            chapter_lines = []
+
+        if line.endswith(tuple(f'卷名{i}' for i in range(1, volumes + 1))):
+            volume_path = path / line
+            volume_path.mkdir()
+        elif line.startswith('第'):
+            chapter_lines.append(line)
+        elif chapter_lines:
+            chapter_lines.append(line)
+
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures DirectoryReader with different prefetch depths.')
+    parser.add_argument('-v', '--volumes', type=int, default=10)
+    parser.add_argument('-c', '--chapters', type=int, default=500, help='Number of chapters per volume.')
+    parser.add_argument('-p', '--prefetch', type=int, nargs='*', default=[0, 4, 16])
+    parser.add_argument('-l', '--latency', type=float, default=2.0,
+                        help='Simulated latency in ms when opening a file, as on a network filesystem. Use 0 to '
+                             'measure the local filesystem.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        in_dir = generate_directory(Path(tmp), args.volumes, args.chapters)
+        print(f'{args.volumes * args.chapters} chapter files, {args.latency} ms latency')
+        open_file = Path.open
+
+        def slow_open(self, *a, **kw):
+            time.sleep(args.latency / 1000)
+            return open_file(self, *a, **kw)
+
+        with patch.object(Path, 'open', slow_open) if args.latency > 0 else patch.object(Path, 'open', open_file):
+            for prefetch in args.prefetch:
+                reader = DirectoryReader({'in_dir': in_dir, 'read_contents': True, 'discard_chapters': False,
+                                          'prefetch': prefetch})
+                start = time.perf_counter()
+                count = sum(1 for _ in reader.read())
+                print(f'prefetch={prefetch}: {time.perf_counter() - start:.2f}s ({count} lines)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from novel_tools.framework import Worker
+from novel_tools.processors.matchers.__aggregate_matcher__ import AggregateMatcher
+from novel_tools.toolkit import analyze
+from novel_tools.utils import create_workflow, get_config, Stage
+from .corpus import generate_novel
+
+
+def create_worker(toolkit: str, text_path: Path, out_dir: Path, batch_size: int) -> Worker:
+    """Builds the Worker the same way `analyze()` does, so that the dispatch can be switched off."""
+    config = get_config(f'{toolkit}_config.json', Path('config'))
+    workflow = create_workflow(config, {'in_dir': out_dir, 'out_dir': out_dir, 'text_filename': str(text_path)})
+    matcher = AggregateMatcher(workflow.get(Stage.matchers) or [])
+    processors = [matcher] + (workflow.get(Stage.validators) or []) + (workflow.get(Stage.transformers) or [])
+    return Worker(workflow.get(Stage.readers), processors, workflow.get(Stage.writers), batch_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures the per-line time of the built-in toolkits with and '
+                                                 'without type-based dispatch.')
+    parser.add_argument('-t', '--toolkit', nargs='*', default=['struct', 'create'])
+    parser.add_argument('-c', '--chapters', type=int, default=50, help='Number of chapters per volume.')
+    parser.add_argument('-b', '--batch_size', type=int, nargs='*', default=[1, 512])
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='The best of this many runs is reported.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        text_path = generate_novel(tmp / 'novel.txt', chapters=args.chapters)
+        with text_path.open('rt') as f:
+            lines = sum(1 for _ in f)
+        # The create toolkit needs the structure file generated by struct, plus the book metadata.
+        analyze(get_config('struct_config.json', Path('config')), filename=text_path, out_dir=tmp)
+        with (tmp / 'metadata.json').open('wt') as f:
+            json.dump({'title': 'Benchmark'}, f)
+
+        print(f'{lines} lines')
+        for toolkit in args.toolkit:
+            for batch_size in args.batch_size:
+                results = []
+                for dispatch in [False, True]:
+                    best = float('inf')
+                    for _ in range(args.repeat):
+                        worker = create_worker(toolkit, text_path, tmp, batch_size)
+                        worker.dispatch = worker.dispatch and dispatch
+                        start = time.perf_counter()
+                        worker.execute()
+                        best = min(best, time.perf_counter() - start)
+                    results.append(best / lines * 1e6)
+                print(f'{toolkit}, batch_size={batch_size}: {results[0]:.2f} -> {results[1]:.2f} us/line '
+                      f'({(1 - results[1] / results[0]) * 100:.1f}% saved)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+import argparse
+import time
+from pathlib import Path
+from novel_tools.framework import NovelData
+from novel_tools.processors.matchers.__aggregate_matcher__ import AggregateMatcher
+from novel_tools.utils import create_workflow, get_config, Stage
+from .corpus import generate_lines
+
+
+def measure(matcher: AggregateMatcher, lines: list[str], compiled: bool, repeat: int) -> float:
+    """Returns the best time of matching all the lines, in microseconds per line."""
+    best = float('inf')
+    for _ in range(repeat):
+        batch = [NovelData(line) for line in lines]
+        start = time.perf_counter()
+        if compiled:
+            process = matcher.compile()
+            for data in batch:
+                process(data)
+        else:
+            matcher.process_batch(batch)
+        best = min(best, time.perf_counter() - start)
+    return best / len(lines) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures the per-line time of the matchers of a toolkit with and '
+                                                 'without fusing their regexes.')
+    parser.add_argument('-t', '--toolkit', default='struct')
+    parser.add_argument('-c', '--chapters', type=int, default=200, help='Number of chapters per volume.')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='The best of this many runs is reported.')
+    args = parser.parse_args()
+
+    config = get_config(f'{args.toolkit}_config.json', Path('config'))
+    matchers = create_workflow({Stage.matchers.value: config[Stage.matchers.value]}, {})[Stage.matchers]
+    lines = generate_lines(chapters=args.chapters)
+    print(f'{len(lines)} lines, {len(matchers)} matchers')
+    for compiled in [False, True]:
+        results = [measure(AggregateMatcher(matchers, fused=fused), lines, compiled, args.repeat)
+                   for fused in [False, True]]
+        print(f'compiled={compiled}: {results[0]:.3f} -> {results[1]:.3f} us/line '
+              f'({(1 - results[1] / results[0]) * 100:.1f}% saved)')
+
+
+if __name__ == '__main__':
+    main()
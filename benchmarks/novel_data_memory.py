@@ -0,0 +1,35 @@
+import tracemalloc
+from pathlib import Path
+from novel_tools.framework import NovelData, FileContext, SourceLine
+from .corpus import generate_lines
+
+
+def measure(lines: list[str], mode: str) -> float:
+    """Returns the number of bytes allocated per line, excluding the line strings themselves."""
+    source = Path('text.txt')
+    contents = [line.lstrip() for line in lines]
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    if mode == 'verbose':
+        data = [NovelData(content, source=source, line_num=i, raw=line) for i, (content, line) in
+                enumerate(zip(contents, lines))]
+    elif mode == 'source line':
+        context = FileContext(source, 'utf-8')
+        data = [SourceLine(content, context, i, line) for i, (content, line) in enumerate(zip(contents, lines))]
+    else:
+        data = [NovelData(content) for content in contents]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+    return (after - before) / len(lines)
+
+
+def main():
+    lines = generate_lines()
+    print(f'{len(lines)} lines')
+    for mode in ['plain', 'verbose', 'source line']:
+        print(f'{mode}: {measure(lines, mode):.1f} bytes/line')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from novel_tools.toolkit import analyze
+from novel_tools.utils import get_config
+from .corpus import generate_novel
+
+
+def run(text_path: Path, out_dir: Path, **kwargs) -> tuple[float, bytes]:
+    out_dir.mkdir()
+    start = time.perf_counter()
+    analyze(get_config('struct_config.json', Path('config')), filename=text_path, out_dir=out_dir, **kwargs)
+    elapsed = time.perf_counter() - start
+    return elapsed, (out_dir / 'list.csv').read_bytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures the struct toolkit with the titles located by scanning '
+                                                 'whole blocks, against matching every line.')
+    parser.add_argument('-c', '--chapters', type=int, default=200, help='Number of chapters per volume.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        text_path = generate_novel(tmp / 'novel.txt', chapters=args.chapters)
+        print(f'{text_path.stat().st_size / 2 ** 20:.1f} MB')
+
+        runs = {
+            'per line': {},
+            'per line, batch_size=512, compiled': {'batch_size': 512, 'compiled': True},
+            'scan': {'scan': True},
+        }
+        expected = None
+        for i, (name, kwargs) in enumerate(runs.items()):
+            elapsed, actual = run(text_path, tmp / str(i), **kwargs)
+            expected = expected or actual
+            identical = 'identical' if actual == expected else 'DIFFERENT'
+            print(f'{name}: {elapsed:.2f}s, output {identical}')
+
+
+if __name__ == '__main__':
+    main()
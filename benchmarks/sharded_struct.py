@@ -0,0 +1,40 @@
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from novel_tools.toolkit import analyze
+from novel_tools.utils import get_config
+from .corpus import generate_novel
+
+
+def run(text_path: Path, out_dir: Path, processes: int | None) -> tuple[float, bytes]:
+    out_dir.mkdir()
+    start = time.perf_counter()
+    analyze(get_config('struct_config.json', Path('config')), filename=text_path, out_dir=out_dir,
+            processes=processes)
+    elapsed = time.perf_counter() - start
+    return elapsed, (out_dir / 'list.csv').read_bytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures the speedup of the sharded struct toolkit.')
+    parser.add_argument('-c', '--chapters', type=int, default=100, help='Number of chapters per volume.')
+    parser.add_argument('-n', '--processes', type=int, default=os.cpu_count(), help='Maximum number of processes.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        text_path = generate_novel(tmp / 'novel.txt', chapters=args.chapters)
+        print(f'{text_path.stat().st_size / 2 ** 20:.1f} MB, {os.cpu_count()} cores')
+
+        serial, expected = run(text_path, tmp / 'serial', None)
+        print(f'serial: {serial:.2f}s')
+        for processes in range(1, args.processes + 1):
+            elapsed, actual = run(text_path, tmp / str(processes), processes)
+            identical = 'identical' if actual == expected else 'DIFFERENT'
+            print(f'{processes} processes: {elapsed:.2f}s, speedup {serial / elapsed:.2f}x, output {identical}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from novel_tools.readers.text_reader import TextReader
+from .corpus import generate_novel
+
+
+def measure(text_path: Path, repeat: int, **kwargs) -> float:
+    """Returns the best time of consuming the whole reader."""
+    best = float('inf')
+    for _ in range(repeat):
+        reader = TextReader({'text_filename': str(text_path)} | kwargs)
+        start = time.perf_counter()
+        for _ in reader.read():
+            pass
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures the throughput of TextReader with and without mmap.')
+    parser.add_argument('-c', '--chapters', type=int, default=200, help='Number of chapters per volume.')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='The best of this many runs is reported.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        text_path = generate_novel(Path(tmp) / 'novel.txt', chapters=args.chapters)
+        size = text_path.stat().st_size / 2 ** 20
+        print(f'{size:.1f} MB')
+        for verbose in [False, True]:
+            for mmap in [False, True]:
+                elapsed = measure(text_path, args.repeat, verbose=verbose, mmap=mmap)
+                print(f'verbose={verbose}, mmap={mmap}: {elapsed:.2f}s ({size / elapsed:.1f} MB/s)')
+
+
+if __name__ == '__main__':
+    main()
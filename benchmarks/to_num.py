@@ -0,0 +1,68 @@
+import argparse
+import timeit
+from novel_tools.utils import helpers
+from .corpus import to_chinese
+
+legacy_digits = dict(zip('零〇一二两三四五六七八九', [0, 0, 1, 2, 2, 3, 4, 5, 6, 7, 8, 9])) | \
+    {'十': 10, '廿': 20, '卅': 30, '卌': 40, '百': 100, '千': 1000}
+
+
+def legacy_to_num(num: str) -> int:
+    """The previous implementation, for comparison."""
+    num = num.strip()
+    try:
+        value = 0
+        digit = 1
+        for i in range(len(num)):
+            v = legacy_digits[num[i]]
+            if v >= 10:
+                digit *= v
+                value += digit
+            elif i == len(num) - 1:
+                value += v
+            else:
+                digit = v
+    except KeyError:
+        value = int(num)
+    return value
+
+
+def uncached_to_num(num: str) -> int:
+    value = helpers._to_num.__wrapped__(num.strip())
+    if value is None:
+        raise ValueError(num)
+    return value
+
+
+def measure(function, inputs: list[str], repeat: int) -> float:
+    """Returns the best time per call in microseconds."""
+    def run():
+        for num in inputs:
+            try:
+                function(num)
+            except ValueError:
+                pass
+
+    return min(timeit.repeat(run, number=1, repeat=repeat)) / len(inputs) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures the time of converting the indices of titles to numbers.')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='The best of this many runs is reported.')
+    args = parser.parse_args()
+
+    # The indices of a novel with 10 volumes of 200 chapters, where every index is converted once per title.
+    titles = [to_chinese(chapter) for _ in range(10) for chapter in range(1, 201)]
+    cases = {
+        'chinese': titles,
+        'arabic': [str(chapter) for chapter in range(1, 2001)],
+        'invalid': ['十人', 'One', 'Lorem ipsum'] * 500,
+    }
+    for name, inputs in cases.items():
+        results = [measure(function, inputs, args.repeat)
+                   for function in [legacy_to_num, uncached_to_num, helpers.to_num]]
+        print(f'{name}: legacy {results[0]:.3f}, uncached {results[1]:.3f}, cached {results[2]:.3f} us/call')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,30 @@
-from .data import Type, NovelData
+from .data import Type, NovelData, FileContext, SourceLine
+from .profiler import Profiler
 from .worker import Worker
+from .pipelined_worker import PipelinedWorker
 from .reader import Reader
 from .processor import Processor
+from .compiler import compile_pipeline
 from .writer import Writer
+from .async_reader import AsyncReader, ThreadedReader
+from .async_writer import AsyncWriter, ThreadedWriter
+from .async_worker import AsyncWorker
 
 __all__ = [
     Type,
     NovelData,
+    FileContext,
+    SourceLine,
+    Profiler,
     Worker,
+    PipelinedWorker,
     Reader,
     Processor,
-    Writer
+    compile_pipeline,
+    Writer,
+    AsyncReader,
+    ThreadedReader,
+    AsyncWriter,
+    ThreadedWriter,
+    AsyncWorker
 ]
@@ -0,0 +1,55 @@
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from itertools import islice
+from typing import AsyncIterator
+from .reader import Reader
+
+
+class AsyncReader(ABC):
+    @abstractmethod
+    def read(self) -> AsyncIterator:
+        pass
+
+    async def read_batches(self, batch_size: int) -> AsyncIterator[list]:
+        """Reads the data in batches. Override this if the data can be produced in batches more cheaply."""
+        batch = []
+        async for data in self.read():
+            batch.append(data)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+
+class ThreadedReader(AsyncReader):
+    """Runs a Reader on an executor, so that its file I/O does not block the event loop."""
+
+    def __init__(self, reader: Reader, executor: Executor | None = None, batch_size: int = 64):
+        """
+        Args:
+            reader: The reader to run.
+            executor: The executor to run the reader on. Defaults to the default executor of the event loop.
+            batch_size: The number of items to read in one go in `read()`.
+        """
+        self.reader = reader
+        self.executor = executor
+        self.batch_size = batch_size
+
+    async def read(self) -> AsyncIterator:
+        async for batch in self.read_batches(self.batch_size):
+            for data in batch:
+                yield data
+
+    async def read_batches(self, batch_size: int) -> AsyncIterator[list]:
+        loop = asyncio.get_running_loop()
+        it = iter(self.reader.read())
+        try:
+            while batch := await loop.run_in_executor(self.executor, lambda: list(islice(it, batch_size))):
+                yield batch
+        finally:
+            # The generator might be holding a file open if the reading stops early.
+            if hasattr(it, 'close'):
+                await loop.run_in_executor(self.executor, it.close)
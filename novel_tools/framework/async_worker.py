@@ -0,0 +1,50 @@
+import asyncio
+from concurrent.futures import Executor
+from .async_reader import AsyncReader
+from .async_writer import AsyncWriter
+from .processor import Processor
+from .worker import Worker, _accepts
+
+
+class AsyncWorker(Worker):
+    """
+    A Worker for asyncio. The data is read from AsyncReaders and written to AsyncWriters in batches, and the event loop
+    is free while they wait for I/O. Use ThreadedReader and ThreadedWriter to run the existing readers and writers on a
+    thread pool.
+
+    The processors run on the event loop by default. If an executor is given, they run on it instead, one batch at a
+    time, so that the loop stays responsive while they are busy. As the processors keep state, the executor must run
+    them in this process, e.g., a ThreadPoolExecutor.
+
+    The data goes through the stages in the same order as in the sequential Worker, so the output is the same.
+    """
+
+    def __init__(self, readers: list[AsyncReader], processors: list[Processor], writers: list[AsyncWriter],
+                 batch_size: int = 64, compiled: bool = False, executor: Executor | None = None):
+        super().__init__(readers, processors, writers, batch_size, compiled=compiled)
+        self.executor = executor
+
+    async def execute(self):
+        loop = asyncio.get_running_loop()
+        try:
+            for reader in self.readers:
+                async for batch in reader.read_batches(self.batch_size):
+                    if self.executor is None:
+                        batch = self._process_batch(batch)
+                    else:
+                        batch = await loop.run_in_executor(self.executor, self._process_batch, batch)
+                    await self.__accept_batch(batch)
+
+            self._close_processors()
+            for writer in self.writers:
+                await writer.write()
+        finally:
+            for writer in self.writers:
+                await writer.close()
+
+    async def __accept_batch(self, batch: list):
+        for writer in self.writers:
+            if not self.dispatch or (writer.accepted_types is None and writer.accepted_tags is None):
+                await writer.accept_batch(batch)
+            elif accepted := [data for data in batch if _accepts(writer, data)]:
+                await writer.accept_batch(accepted)
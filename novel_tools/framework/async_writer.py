@@ -0,0 +1,56 @@
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from .writer import Writer
+
+
+class AsyncWriter(ABC):
+    # The data types that this writer accepts, or None for all types. Workers will not pass data of any other type to
+    # the writer.
+    accepted_types: set | None = None
+    # The tags (the 'tag' field, None if absent) that this writer accepts, or None for all tags.
+    accepted_tags: set | None = None
+
+    @abstractmethod
+    async def accept(self, data) -> None:
+        pass
+
+    async def accept_batch(self, batch: list) -> None:
+        """Accepts a batch of data in order. Override this if the batch can be handled in a tighter loop."""
+        for data in batch:
+            await self.accept(data)
+
+    @abstractmethod
+    async def write(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        """See `Writer.close()`."""
+        pass
+
+
+class ThreadedWriter(AsyncWriter):
+    """Runs a Writer on an executor, so that its file I/O does not block the event loop."""
+
+    def __init__(self, writer: Writer, executor: Executor | None = None):
+        """
+        Args:
+            writer: The writer to run. Its accepted types and tags are kept.
+            executor: The executor to run the writer on. Defaults to the default executor of the event loop.
+        """
+        self.writer = writer
+        self.executor = executor
+        self.accepted_types = writer.accepted_types
+        self.accepted_tags = writer.accepted_tags
+
+    async def accept(self, data) -> None:
+        await asyncio.get_running_loop().run_in_executor(self.executor, self.writer.accept, data)
+
+    async def accept_batch(self, batch: list) -> None:
+        await asyncio.get_running_loop().run_in_executor(self.executor, self.writer.accept_batch, batch)
+
+    async def write(self) -> None:
+        await asyncio.get_running_loop().run_in_executor(self.executor, self.writer.write)
+
+    async def close(self) -> None:
+        await asyncio.get_running_loop().run_in_executor(self.executor, self.writer.close)
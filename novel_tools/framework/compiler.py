@@ -0,0 +1,62 @@
+from types import CodeType
+from typing import Callable
+from .data import Type
+from .processor import Processor
+
+_cache: dict[tuple, CodeType] = {}
+
+
+def compile_pipeline(processors: list[Processor]) -> Callable:
+    """
+    Fuses the processors into a single function that passes one piece of data through all of them. Each processor is
+    replaced by its `Processor.compile()` result, and its type and tag filters are inlined as identity checks. The
+    result is the same as calling `process()` on the processors one after another, skipping those that do not accept
+    the data.
+
+    The generated code only depends on the filters of the processors, so it is cached on them. Compiling the same
+    workflow again only binds the new processor instances.
+    """
+    signature = tuple((_sorted_types(processor.accepted_types), processor.accepted_tags is not None)
+                      for processor in processors)
+    code = _cache.get(signature)
+    if code is None:
+        code = _cache[signature] = compile(_generate(signature), '<pipeline>', 'exec')
+
+    namespace = {'Type': Type}
+    exec(code, namespace)
+    return namespace['make_pipeline']([processor.compile() for processor in processors],
+                                      [processor.accepted_tags for processor in processors])
+
+
+def _sorted_types(types: set[Type] | None) -> tuple[Type, ...] | None:
+    return None if types is None else tuple(sorted(types, key=lambda data_type: data_type.value))
+
+
+def _generate(signature: tuple) -> str:
+    lines = ['def make_pipeline(stages, tags):']
+    used_types = {data_type for types, _ in signature if types is not None for data_type in types}
+    for data_type in sorted(used_types, key=lambda t: t.value):
+        lines.append(f'    {data_type.name} = Type.{data_type.name}')
+    for i, (_, has_tags) in enumerate(signature):
+        lines.append(f'    stage_{i} = stages[{i}]')
+        if has_tags:
+            lines.append(f'    tags_{i} = tags[{i}]')
+
+    lines += ['', '    def pipeline(data):', '        data_type = data.type']
+    for i, (types, has_tags) in enumerate(signature):
+        conditions = []
+        if types is not None:
+            conditions.append(' or '.join(f'data_type is {data_type.name}' for data_type in types) or 'False')
+        if has_tags:
+            conditions.append(f"data.get('tag') in tags_{i}")
+
+        if conditions:
+            lines.append('        if ' + ' and '.join(f'({condition})' for condition in conditions) + ':')
+            indent = ' ' * 12
+        else:
+            indent = ' ' * 8
+        lines.append(f'{indent}data = stage_{i}(data)')
+        lines.append(f'{indent}data_type = data.type')
+
+    lines += ['        return data', '', '    return pipeline', '']
+    return '\n'.join(lines)
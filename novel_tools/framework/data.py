@@ -1,5 +1,6 @@
 from copy import deepcopy
 from enum import Enum, auto
+from pathlib import Path
 
 
 class Type(Enum):
@@ -29,33 +30,54 @@ class NovelData:
           index detection.
         - For special titles, the id should be negative.
     - error: If there is an error during processing, this field will be populated with the error message.
-    - others: Contains additional data needed for processors/writers here.
+    - others: Contains additional data needed for processors/writers here. Since most lines do not carry any, the dict
+      is only allocated when the first field is set.
     """
 
+    __slots__ = ('content', 'type', 'index', '_others')
+
     def __init__(self, content: str, data_type: Type = Type.UNRECOGNIZED, index: int = None, **kwargs):
         self.content = content
         self.type = data_type
         self.index = index
-        self.others = kwargs
+        # Most lines of a novel carry no additional fields, so `others` is only allocated once it is needed.
+        self._others = kwargs or None
+
+    @property
+    def others(self) -> dict:
+        if self._others is None:
+            self._others = {}
+        return self._others
+
+    @others.setter
+    def others(self, others: dict):
+        self._others = others
 
     def has(self, key: str) -> bool:
-        return self.others and key in self.others
+        return self._others is not None and key in self._others
 
     def get(self, key: str, default=None):
-        return self.others.get(key, default)
+        if self._others is None:
+            return default
+        return self._others.get(key, default)
 
     def set(self, **kwargs):
-        self.others |= kwargs
+        if self._others is None:
+            self._others = kwargs
+        else:
+            self._others |= kwargs
 
     def pop(self, key: str):
-        return self.others.pop(key)
+        if self._others is None:
+            raise KeyError(key)
+        return self._others.pop(key)
 
     def format(self, format_str: str, **kwargs):
         """Formats the novel data by a given format string. Use kw to overwrite existing fields if necessary."""
         return format_str.format(**(self.flat_dict() | kwargs))
 
     def to_dict(self):
-        return {'type': self.type, 'content': self.content, 'index': self.index, 'others': self.others}
+        return {'type': self.type, 'content': self.content, 'index': self.index, 'others': self._fields()}
 
     def flat_dict(self, fields: list[str] = None):
         """Creates a flattened version of the dict."""
@@ -64,15 +86,27 @@ class NovelData:
             'content': self.content,
             'index': self.index,
         }
-        flat_dict |= self.others
+        flat_dict |= self._fields()
 
         if fields is None:
             return flat_dict
 
         return {field: flat_dict.get(field) for field in fields}
 
-    def copy(self):
-        return deepcopy(self)
+    def copy(self, deep: bool = True):
+        """
+        Copies the data. A shallow copy gets its own `others` dict, but shares the values within it with the original.
+        It is therefore safe as long as fields are replaced with `set()` rather than modified in place, which is what all
+        built-in processors do.
+        """
+        if deep:
+            return deepcopy(self)
+
+        return NovelData(self.content, self.type, self.index, **self._fields())
+
+    def _fields(self) -> dict:
+        """Returns all additional fields without allocating `others`."""
+        return self._others or {}
 
     def __str__(self):
         return str(self.to_dict())
@@ -82,13 +116,87 @@ class NovelData:
         return str(self.to_dict())
 
     def __eq__(self, other):
-        if type(other) is not NovelData:
+        if not isinstance(other, NovelData):
             return False
 
-        eq = self.type == other.type and self.content == other.content and self.index == other.index and len(
-            self.others) == len(other.others)
+        return self.type == other.type and self.content == other.content and self.index == other.index and \
+            self._fields() == other._fields()
+
+
+class FileContext:
+    """Values that are shared by all lines read from the same file."""
+
+    __slots__ = ('source', 'encoding')
+
+    def __init__(self, source: Path, encoding: str):
+        self.source = source
+        self.encoding = encoding
+
+
+_line_fields = ('source', 'line_num', 'raw')
+
 
-        for key, item in self.others.items():
-            eq = eq and key in other.others and item == other.others[key]
+class SourceLine(NovelData):
+    """
+    A line read by a Reader in verbose mode. It behaves exactly like a NovelData with `source`, `line_num` and `raw` in
+    `others`, but `source` is held by a FileContext shared by the whole file, and the other two are stored in slots, so
+    that no dict is needed for most lines. If `raw` does not contain any leading whitespace, it will share the same
+    string object with `content`.
+
+    The fields are only moved into a real `others` dict when it is accessed directly. Fields that are set afterward
+    take precedence over the ones from the file.
+    """
+
+    __slots__ = ('context', 'line_num', 'raw')
+
+    def __init__(self, content: str, context: FileContext, line_num: int, raw: str, data_type: Type = Type.UNRECOGNIZED,
+                 index: int = None, **kwargs):
+        super().__init__(content, data_type, index, **kwargs)
+        self.context = context
+        self.line_num = line_num
+        self.raw = raw
+
+    @property
+    def others(self) -> dict:
+        if self.context is not None:
+            self.__materialize()
+        return NovelData.others.fget(self)
 
-        return eq
+    @others.setter
+    def others(self, others: dict):
+        self.context = None
+        self._others = others
+
+    def has(self, key: str) -> bool:
+        if self._others is not None and key in self._others:
+            return True
+        return self.context is not None and key in _line_fields
+
+    def get(self, key: str, default=None):
+        if self._others is not None and key in self._others:
+            return self._others[key]
+        if self.context is not None:
+            if key == 'source':
+                return self.context.source
+            if key == 'line_num':
+                return self.line_num
+            if key == 'raw':
+                return self.raw
+        return default
+
+    def pop(self, key: str):
+        if self.context is not None and key in _line_fields:
+            self.__materialize()
+        return super().pop(key)
+
+    def _fields(self) -> dict:
+        if self.context is None:
+            return super()._fields()
+        fields = {'source': self.context.source, 'line_num': self.line_num, 'raw': self.raw}
+        if self._others:
+            fields |= self._others
+        return fields
+
+    def __materialize(self):
+        self._others = self._fields()
+        self.context = None
@@ -0,0 +1,100 @@
+from queue import Queue, Empty, Full
+from threading import Event, Thread
+from .reader import Reader
+from .processor import Processor
+from .writer import Writer
+from .worker import Worker
+from .profiler import Profiler
+
+_end = object()
+
+
+class _Aborted(Exception):
+    """Raised inside a stage when another stage has failed and the pipeline is shutting down."""
+    pass
+
+
+class PipelinedWorker(Worker):
+    """
+    A Worker that runs reading, processing and writing on separate threads. The stages are connected by bounded queues
+    of batches, so that disk I/O in the readers and writers overlaps with the work of the processors, while the memory
+    in flight stays bounded by `queue_size * batch_size` items per queue.
+
+    Each stage is still consumed by a single thread, so the order in which the processors and writers see the data is
+    exactly the same as in the sequential Worker.
+    """
+
+    def __init__(self, readers: list[Reader], processors: list[Processor], writers: list[Writer], batch_size: int = 1,
+                 queue_size: int = 16, profiler: Profiler | None = None, compiled: bool = False):
+        super().__init__(readers, processors, writers, batch_size, profiler, compiled)
+        if queue_size < 1:
+            raise ValueError('Queue size must be positive.')
+
+        self.queue_size = queue_size
+        self._abort = Event()
+        self._errors: list[BaseException] = []
+
+    def execute(self):
+        self._abort.clear()
+        self._errors.clear()
+        read_queue = Queue(self.queue_size)
+        write_queue = Queue(self.queue_size)
+        threads = [Thread(target=self.__run_stage, args=(self.__read, read_queue), daemon=True),
+                   Thread(target=self.__run_stage, args=(self.__process, read_queue, write_queue), daemon=True)]
+        for thread in threads:
+            thread.start()
+
+        try:
+            # Writers are driven by the calling thread.
+            self.__run_stage(self.__accept, write_queue)
+            for thread in threads:
+                thread.join()
+
+            if self._errors:
+                raise self._errors[0]
+
+            self._close_processors()
+            for writer in self.writers:
+                writer.write()
+        finally:
+            self._close_writers()
+
+    def __run_stage(self, stage, *queues: Queue):
+        try:
+            stage(*queues)
+        except _Aborted:
+            pass
+        except BaseException as e:
+            self._errors.append(e)
+            self._abort.set()
+
+    def __read(self, out_queue: Queue):
+        for batch in self._read_batches():
+            self.__put(out_queue, batch)
+        self.__put(out_queue, _end)
+
+    def __process(self, in_queue: Queue, out_queue: Queue):
+        while (batch := self.__get(in_queue)) is not _end:
+            self.__put(out_queue, self._process_batch(batch))
+        self.__put(out_queue, _end)
+
+    def __accept(self, in_queue: Queue):
+        while (batch := self.__get(in_queue)) is not _end:
+            self._accept_batch(batch)
+
+    def __put(self, queue: Queue, item):
+        while True:
+            try:
+                queue.put(item, timeout=0.1)
+                return
+            except Full:
+                if self._abort.is_set():
+                    raise _Aborted()
+
+    def __get(self, queue: Queue):
+        while True:
+            try:
+                return queue.get(timeout=0.1)
+            except Empty:
+                if self._abort.is_set():
+                    raise _Aborted()
@@ -1,7 +1,32 @@
 from abc import ABC, abstractmethod
+from typing import Callable
 
 
 class Processor(ABC):
+    # The data types that this processor acts on, or None for all types. Workers skip the processor for data of any
+    # other type, so `process()` must return such data untouched and must not update its state with it.
+    accepted_types: set | None = None
+    # The tags (the 'tag' field, None if absent) that this processor acts on, or None for all tags. Same rules apply.
+    accepted_tags: set | None = None
+
     @abstractmethod
     def process(self, data):
         pass
+
+    def process_batch(self, batch: list) -> list:
+        """Processes a batch of data in order. Override this if the batch can be handled in a tighter loop."""
+        return [self.process(data) for data in batch]
+
+    def compile(self) -> Callable:
+        """
+        Returns a function that does the same as `process()`, used when the processors are compiled into a single
+        pipeline. Override this to return a closure with the options bound as local variables.
+        """
+        return self.process
+
+    def close(self) -> None:
+        """
+        Called by the Workers once all the data has been processed, before the writers write. Override this to report
+        anything that the processor has found in the whole run.
+        """
+        pass
@@ -0,0 +1,224 @@
+import json
+from time import perf_counter
+from typing import Iterator
+from .reader import Reader
+from .processor import Processor
+from .writer import Writer
+
+
+class StageStats:
+    """Counters of a single stage."""
+
+    def __init__(self, name: str, kind: str):
+        self.name = name
+        self.kind = kind
+        self.calls = 0
+        self.items_in = 0
+        self.items_out = 0
+        self.time = 0.0
+        self.hits: int | None = None
+        self.children: list[StageStats] = []
+
+    def to_dict(self) -> dict:
+        stats = {'name': self.name, 'kind': self.kind, 'calls': self.calls, 'items_in': self.items_in,
+                 'items_out': self.items_out, 'time': self.time}
+        if self.hits is not None:
+            stats['hits'] = self.hits
+        if self.children:
+            stats['children'] = [child.to_dict() for child in self.children]
+        return stats
+
+
+class Profiler:
+    """
+    Records wall time, call counts and item counts for every stage of a Worker. The Worker only wraps its stages when a
+    Profiler is given, so there is no overhead when profiling is off.
+
+    For processors that aggregate other matchers (i.e., that have a `matchers` list), the hit count of each matcher is
+    recorded as well. If several matchers are fused into one (i.e., one that has `matchers` and an `on_hit` callback),
+    the hits of each of them are recorded under the fused one.
+    """
+
+    def __init__(self):
+        self.stages: list[StageStats] = []
+
+    def add(self, name: str, kind: str) -> StageStats:
+        stats = StageStats(name, kind)
+        self.stages.append(stats)
+        return stats
+
+    def wrap_reader(self, reader: Reader) -> Reader:
+        return ProfiledReader(reader, self.add(type(reader).__name__, 'reader'))
+
+    def wrap_processor(self, processor: Processor) -> Processor:
+        stats = self.add(type(processor).__name__, 'processor')
+        if isinstance(getattr(processor, 'matchers', None), list):
+            processor.matchers = [ProfiledProcessor(matcher, self.__add_child(stats, matcher), count_hits=True)
+                                  for matcher in processor.matchers]
+            for matcher in processor.matchers:
+                if isinstance(getattr(matcher, 'matchers', None), list) and hasattr(matcher, 'on_hit'):
+                    self.__count_fused_hits(matcher.processor, matcher.stats)
+        return ProfiledProcessor(processor, stats)
+
+    def wrap_writer(self, writer: Writer) -> Writer:
+        return ProfiledWriter(writer, self.add(type(writer).__name__, 'writer'))
+
+    def to_dict(self) -> dict:
+        return {'stages': [stats.to_dict() for stats in self.stages]}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def report(self) -> str:
+        """Formats the stats as a plain-text table."""
+        total = sum(stats.time for stats in self.stages) or 1.0
+        rows = [('Stage', 'Kind', 'Calls', 'In', 'Out', 'Hits', 'Time (s)', '%')]
+        for stats in self.stages:
+            rows.extend(self.__rows(stats, total, ''))
+
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        lines = []
+        for row in rows:
+            cells = [row[0].ljust(widths[0]), row[1].ljust(widths[1])]
+            cells += [row[i].rjust(widths[i]) for i in range(2, len(row))]
+            lines.append('  '.join(cells))
+        return '\n'.join(lines)
+
+    @staticmethod
+    def __add_child(parent: StageStats, stage) -> StageStats:
+        stats = StageStats(type(stage).__name__, 'matcher')
+        stats.hits = 0
+        parent.children.append(stats)
+        return stats
+
+    @classmethod
+    def __count_fused_hits(cls, fused: Processor, stats: StageStats):
+        """Records the hits of the matchers in a fused matcher, which are not called one by one."""
+        children = {id(matcher): cls.__add_child(stats, matcher) for matcher in fused.matchers}
+
+        def on_hit(matcher: Processor):
+            children[id(matcher)].hits += 1
+
+        fused.on_hit = on_hit
+
+    @classmethod
+    def __rows(cls, stats: StageStats, total: float, indent: str) -> Iterator[tuple]:
+        yield cls.__row(stats, total, indent)
+        for child in stats.children:
+            yield from cls.__rows(child, total, indent + '  ')
+
+    @staticmethod
+    def __row(stats: StageStats, total: float, indent: str) -> tuple:
+        hits = '' if stats.hits is None else str(stats.hits)
+        return (indent + stats.name, stats.kind, str(stats.calls), str(stats.items_in), str(stats.items_out), hits,
+                f'{stats.time:.3f}', f'{stats.time / total * 100:.1f}')
+
+
+class ProfiledReader(Reader):
+    def __init__(self, reader: Reader, stats: StageStats):
+        self.reader = reader
+        self.stats = stats
+
+    def __getattr__(self, name):
+        return getattr(self.reader, name)
+
+    def read(self) -> Iterator:
+        stats = self.stats
+        start = perf_counter()
+        it = iter(self.reader.read())
+        stats.time += perf_counter() - start
+        while True:
+            start = perf_counter()
+            try:
+                data = next(it)
+            except StopIteration:
+                stats.calls += 1
+                stats.time += perf_counter() - start
+                return
+            stats.calls += 1
+            stats.items_out += 1
+            stats.time += perf_counter() - start
+            yield data
+
+
+class ProfiledProcessor(Processor):
+    def __init__(self, processor: Processor, stats: StageStats, count_hits: bool = False):
+        self.processor = processor
+        self.stats = stats
+        self.count_hits = count_hits
+
+    def __getattr__(self, name):
+        return getattr(self.processor, name)
+
+    @property
+    def accepted_types(self):
+        return self.processor.accepted_types
+
+    @property
+    def accepted_tags(self):
+        return self.processor.accepted_tags
+
+    def process(self, data):
+        start = perf_counter()
+        result = self.processor.process(data)
+        stats = self.stats
+        stats.time += perf_counter() - start
+        stats.calls += 1
+        stats.items_in += 1
+        stats.items_out += 1
+        if self.count_hits and result is not data and result.get('matched', False):
+            stats.hits += 1
+        return result
+
+    def process_batch(self, batch: list) -> list:
+        start = perf_counter()
+        results = self.processor.process_batch(batch)
+        stats = self.stats
+        stats.time += perf_counter() - start
+        stats.calls += 1
+        stats.items_in += len(batch)
+        stats.items_out += len(results)
+        return results
+
+    def close(self) -> None:
+        self.processor.close()
+
+
+class ProfiledWriter(Writer):
+    def __init__(self, writer: Writer, stats: StageStats):
+        self.writer = writer
+        self.stats = stats
+
+    def __getattr__(self, name):
+        return getattr(self.writer, name)
+
+    @property
+    def accepted_types(self):
+        return self.writer.accepted_types
+
+    @property
+    def accepted_tags(self):
+        return self.writer.accepted_tags
+
+    def accept(self, data) -> None:
+        start = perf_counter()
+        self.writer.accept(data)
+        self.stats.time += perf_counter() - start
+        self.stats.calls += 1
+        self.stats.items_in += 1
+
+    def accept_batch(self, batch: list) -> None:
+        start = perf_counter()
+        self.writer.accept_batch(batch)
+        self.stats.time += perf_counter() - start
+        self.stats.calls += 1
+        self.stats.items_in += len(batch)
+
+    def write(self) -> None:
+        start = perf_counter()
+        self.writer.write()
+        self.stats.time += perf_counter() - start
+        self.stats.calls += 1
+
+    def close(self) -> None:
+        self.writer.close()
@@ -1,22 +1,170 @@
+from itertools import islice
+from .data import Type
 from .reader import Reader
 from .processor import Processor
 from .writer import Writer
+from .profiler import Profiler
+from .compiler import compile_pipeline
 
 
 class Worker:
-    def __init__(self, readers: list[Reader], processors: list[Processor], writers: list[Writer]):
+    def __init__(self, readers: list[Reader], processors: list[Processor], writers: list[Writer], batch_size: int = 1,
+                 profiler: Profiler | None = None, compiled: bool = False):
+        """
+        Args:
+            readers: The readers to consume, one after another.
+            processors: The processors that every piece of data goes through, in order.
+            writers: The writers that accept the processed data.
+            batch_size: If larger than 1, data will be pulled from the readers in batches of this size and passed to
+                        `Processor.process_batch()` and `Writer.accept_batch()`, so that the per-call overhead is paid
+                        once per batch instead of once per line.
+            profiler: If specified, every stage will be wrapped to record its timing and counters into the profiler.
+            compiled: If set to True, the processors will be fused into a single function by `compile_pipeline()`,
+                      which is used for every piece of data instead of the processors themselves.
+        """
+        if batch_size < 1:
+            raise ValueError('Batch size must be positive.')
+
+        if profiler is not None:
+            readers = [profiler.wrap_reader(reader) for reader in readers]
+            processors = [profiler.wrap_processor(processor) for processor in processors]
+            writers = [profiler.wrap_writer(writer) for writer in writers]
+
         self.readers = readers
         self.processors = processors
         self.writers = writers
+        self.batch_size = batch_size
+        self.profiler = profiler
+
+        # Dispatch tables built from the types and tags each stage declares. For each type, `next_processors[type][i]`
+        # is the position of the first processor at or after i that accepts the type, so that the processors that
+        # cannot act on an item are skipped without being called, even if a processor changes the type on the way.
+        # They are only used if at least one stage declares anything.
+        stages = processors + writers
+        self.dispatch = any(stage.accepted_types is not None or stage.accepted_tags is not None for stage in stages)
+        self.next_processors = {data_type: self.__next_positions(data_type) for data_type in Type}
+        self.type_writers = {data_type: [writer for writer in writers if _accepts_type(writer, data_type)]
+                             for data_type in Type}
+        self.pipeline = compile_pipeline(processors) if compiled else None
 
     def execute(self):
+        try:
+            if self.batch_size > 1:
+                self._execute_batch()
+            elif self.pipeline is not None:
+                self._execute_compiled()
+            elif self.dispatch:
+                self._execute_dispatch()
+            else:
+                for reader in self.readers:
+                    for obj in reader.read():
+                        for processor in self.processors:
+                            obj = processor.process(obj)
+
+                        for writer in self.writers:
+                            writer.accept(obj)
+
+            self._close_processors()
+            for writer in self.writers:
+                writer.write()
+        finally:
+            self._close_writers()
+
+    def _execute_dispatch(self):
+        processors = self.processors
+        tags = [processor.accepted_tags for processor in processors]
+        next_processors = self.next_processors
+        type_writers = self.type_writers
+        count = len(processors)
         for reader in self.readers:
             for obj in reader.read():
-                for processor in self.processors:
-                    obj = processor.process(obj)
+                # Enum hashing is not free, so the table is only looked up again when the type changes.
+                data_type = obj.type
+                positions = next_processors[data_type]
+                i = positions[0]
+                while i < count:
+                    if tags[i] is None or obj.get('tag') in tags[i]:
+                        obj = processors[i].process(obj)
+                        if obj.type is not data_type:
+                            data_type = obj.type
+                            positions = next_processors[data_type]
+                    i = positions[i + 1]
+
+                for writer in type_writers[data_type]:
+                    if _accepts_tag(writer, obj):
+                        writer.accept(obj)
+
+    def _execute_compiled(self):
+        pipeline = self.pipeline
+        type_writers = self.type_writers
+        for reader in self.readers:
+            for obj in reader.read():
+                obj = pipeline(obj)
+                for writer in type_writers[obj.type]:
+                    if _accepts_tag(writer, obj):
+                        writer.accept(obj)
+
+    def _execute_batch(self):
+        for batch in self._read_batches():
+            batch = self._process_batch(batch)
+            self._accept_batch(batch)
+
+    def _process_batch(self, batch: list) -> list:
+        """Passes a batch through every processor. Each processor only gets the items it accepts, in order."""
+        if self.pipeline is not None:
+            return list(map(self.pipeline, batch))
+
+        for processor in self.processors:
+            if not self.dispatch or (processor.accepted_types is None and processor.accepted_tags is None):
+                batch = processor.process_batch(batch)
+                continue
 
-                for writer in self.writers:
-                    writer.accept(obj)
+            positions = [i for i, data in enumerate(batch) if _accepts(processor, data)]
+            if len(positions) == len(batch):
+                batch = processor.process_batch(batch)
+            elif positions:
+                batch = batch.copy()
+                for i, data in zip(positions, processor.process_batch([batch[i] for i in positions])):
+                    batch[i] = data
 
+        return batch
+
+    def _accept_batch(self, batch: list):
+        for writer in self.writers:
+            if not self.dispatch or (writer.accepted_types is None and writer.accepted_tags is None):
+                writer.accept_batch(batch)
+            elif accepted := [data for data in batch if _accepts(writer, data)]:
+                writer.accept_batch(accepted)
+
+    def _close_processors(self):
+        for processor in self.processors:
+            processor.close()
+
+    def _close_writers(self):
         for writer in self.writers:
-            writer.write()
+            writer.close()
+
+    def _read_batches(self):
+        for reader in self.readers:
+            it = iter(reader.read())
+            while batch := list(islice(it, self.batch_size)):
+                yield batch
+
+    def __next_positions(self, data_type: Type) -> list[int]:
+        positions = [len(self.processors)]
+        for i in reversed(range(len(self.processors))):
+            positions.append(i if _accepts_type(self.processors[i], data_type) else positions[-1])
+        positions.reverse()
+        return positions
+
+
+def _accepts_type(stage, data_type: Type) -> bool:
+    return stage.accepted_types is None or data_type in stage.accepted_types
+
+
+def _accepts_tag(stage, data) -> bool:
+    return stage.accepted_tags is None or data.get('tag') in stage.accepted_tags
+
+
+def _accepts(stage, data) -> bool:
+    return _accepts_type(stage, data.type) and _accepts_tag(stage, data)
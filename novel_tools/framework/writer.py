@@ -2,10 +2,28 @@ from abc import ABC, abstractmethod
 
 
 class Writer(ABC):
+    # The data types that this writer accepts, or None for all types. Workers will not pass data of any other type to
+    # the writer.
+    accepted_types: set | None = None
+    # The tags (the 'tag' field, None if absent) that this writer accepts, or None for all tags.
+    accepted_tags: set | None = None
+
     @abstractmethod
     def accept(self, data) -> None:
         pass
 
+    def accept_batch(self, batch: list) -> None:
+        """Accepts a batch of data in order. Override this if the batch can be handled in a tighter loop."""
+        for data in batch:
+            self.accept(data)
+
     @abstractmethod
     def write(self) -> None:
         pass
+
+    def close(self) -> None:
+        """
+        Called by the Workers when the run ends, whether it has succeeded or not. Override this to release anything that
+        is held across calls, e.g., an output file that is written as the data arrives.
+        """
+        pass
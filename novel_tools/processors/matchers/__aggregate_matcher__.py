@@ -1,4 +1,9 @@
-from novel_tools.framework import NovelData, Processor
+import re
+from typing import Callable, Pattern
+from novel_tools.framework import NovelData, Type, Processor
+from novel_tools.utils import has_group_references, prefilter, line_locator
+from .numbered_matcher import NumberedMatcher
+from .special_matcher import SpecialMatcher
 
 
 class AggregateMatcher(Processor):
@@ -7,12 +12,25 @@ class AggregateMatcher(Processor):
     Accepts a line and matches against the given list of regular Matchers.
     If one Matcher returns a non-UNRECOGNIZED result, that will be returned.
     If all Matchers return UNRECOGNIZED, then the original data is returned.
+
+    If `fused` is set to True, consecutive NumberedMatchers and SpecialMatchers are fused into a single regex, so that a
+    line is matched once instead of once per Matcher. The result is the same.
+
+    If all Matchers are NumberedMatchers and SpecialMatchers, lines that none of their regexes can match (judging from
+    the literal prefixes and lengths) are returned right away.
     """
 
-    def __init__(self, args: list[Processor]):
-        self.matchers = args
+    def __init__(self, args: list[Processor], fused: bool = False):
+        self.matchers = _fuse(args) if fused else args
+        self.prefixes = _merge_prefixes(args)
+        self.accepts = _merge_prefilters(args)
+        if all(matcher.accepted_types is not None for matcher in args):
+            self.accepted_types = set().union(*(matcher.accepted_types for matcher in args))
 
     def process(self, data: NovelData) -> NovelData:
+        if self.accepts is not None and not self.accepts(data.content):
+            return data
+
         for matcher in self.matchers:
             new_data = matcher.process(data)
             if new_data.get('matched', False):
@@ -20,3 +38,184 @@ class AggregateMatcher(Processor):
                 return new_data
 
         return data
+
+    def process_batch(self, batch: list[NovelData]) -> list[NovelData]:
+        matchers = self.matchers
+        accepts = self.accepts
+        results = []
+        for data in batch:
+            if accepts is not None and not accepts(data.content):
+                results.append(data)
+                continue
+
+            for matcher in matchers:
+                new_data = matcher.process(data)
+                if new_data is not data and new_data.get('matched', False):
+                    new_data.pop('matched')
+                    data = new_data
+                    break
+
+            results.append(data)
+
+        return results
+
+    def compile(self) -> Callable[[NovelData], NovelData]:
+        matchers = tuple(matcher.compile() for matcher in self.matchers)
+        accepts = self.accepts
+
+        def process(data: NovelData) -> NovelData:
+            if accepts is not None and not accepts(data.content):
+                return data
+
+            for matcher in matchers:
+                new_data = matcher(data)
+                if new_data is not data and new_data.get('matched', False):
+                    new_data.pop('matched')
+                    return new_data
+
+            return data
+
+        return process
+
+    def close(self) -> None:
+        for matcher in self.matchers:
+            matcher.close()
+
+    def locator(self) -> Pattern:
+        """
+        Returns a MULTILINE regex that matches at the start of every line in a block of text that any of the Matchers
+        could match, judging from the literal prefixes. The other lines are left as they are by `process()`.
+        """
+        return line_locator(self.prefixes)
+
+
+class _GroupView:
+    """A match of a fused regex, with the groups numbered as in the regex of a single Matcher."""
+    __slots__ = ('m', 'offset')
+
+    def __init__(self, m: re.Match, offset: int):
+        self.m = m
+        self.offset = offset
+
+    def __getitem__(self, group: int) -> str | None:
+        return self.m[self.offset + group]
+
+
+class _FusedMatcher(Processor):
+    """
+    Matches against the alternation of the regexes of several Matchers, in their order. A regex alternation tries the
+    branches from left to right, so the first Matcher whose regex matches wins, as it does when they run one by one.
+    Each Matcher's regex is wrapped in a named group, whose number is the offset of the regex's own groups.
+
+    Every data type has its own regex, which only contains the Matchers that accept the type.
+
+    If `on_hit` is set, it is called with the Matcher that each title comes from, e.g., by the Profiler to count the
+    hits of every Matcher.
+    """
+
+    def __init__(self, matchers: list[NumberedMatcher | SpecialMatcher], flags: int):
+        self.matchers = matchers
+        self.accepted_types = set().union(*(matcher.accepted_types for matcher in matchers))
+        self.accepts = _merge_prefilters(matchers)
+        self.on_hit: Callable[[Processor], None] | None = None
+        # data type: (the match function, the Matchers, {group name: (index of the Matcher, group offset)})
+        self.fused = {}
+        for data_type in Type:
+            accepted = [matcher for matcher in matchers
+                        if data_type == Type.UNRECOGNIZED or data_type == matcher.type]
+            if not accepted:
+                continue
+
+            branches = []
+            groups = {}
+            offset = 1
+            for i, matcher in enumerate(accepted):
+                name = f'_m{i}'
+                branches.append(f'(?P<{name}>{matcher.regex.pattern})')
+                groups[name] = (i, offset)
+                offset += matcher.regex.groups + 1
+            self.fused[data_type] = (re.compile('|'.join(branches), flags).match, accepted, groups)
+
+    def process(self, data: NovelData) -> NovelData:
+        fused = self.fused.get(data.type)
+        if fused is None:
+            return data
+
+        if self.accepts is not None and not self.accepts(data.content):
+            return data
+
+        match, matchers, groups = fused
+        m = match(data.content)
+        if m is None:
+            return data
+
+        i, offset = groups[m.lastgroup]
+        matcher = matchers[i]
+        accepts = matcher.accepts
+        new_data = matcher.create(data, _GroupView(m, offset)) if accepts is None or accepts(data.content) else data
+        if new_data is data:
+            # The match is not valid, e.g., the index is not a number, or the line is longer than the max_length of the
+            # Matcher, which the merged prefilter does not tell. Like the sequential run, try the rest.
+            for matcher in matchers[i + 1:]:
+                new_data = matcher.process(data)
+                if new_data is not data:
+                    break
+
+        if self.on_hit is not None and new_data is not data:
+            self.on_hit(matcher)
+        return new_data
+
+
+def _merge_prefixes(matchers: list[Processor]) -> tuple[str, ...] | None:
+    """Returns the prefixes of the lines that any of the Matchers could match, or None if any line could match."""
+    if not matchers or not all(isinstance(matcher, (NumberedMatcher, SpecialMatcher)) for matcher in matchers):
+        return None
+    if any(matcher.prefixes is None for matcher in matchers):
+        return None
+    return tuple(prefix for matcher in matchers for prefix in matcher.prefixes)
+
+
+def _merge_prefilters(matchers: list[Processor]) -> Callable[[str], bool] | None:
+    """Returns the prefilter of the lines that any of the Matchers could match, or None if it cannot be told."""
+    if not matchers or not all(isinstance(matcher, (NumberedMatcher, SpecialMatcher)) for matcher in matchers):
+        return None
+
+    prefixes = _merge_prefixes(matchers)
+    min_length = min(matcher.min_length for matcher in matchers)
+    max_lengths = [matcher.max_length for matcher in matchers]
+    max_length = None if None in max_lengths else max(max_lengths)
+    return prefilter(prefixes, min_length, max_length)
+
+
+def _fusable(matcher: Processor) -> bool:
+    # The groups are renumbered in the fused regex, so the regex must not refer to them, and the names must not clash.
+    return isinstance(matcher, (NumberedMatcher, SpecialMatcher)) and not matcher.regex.groupindex and \
+        not has_group_references(matcher.regex)
+
+
+def _fuse(matchers: list[Processor]) -> list[Processor]:
+    """Replaces every run of fusable Matchers with the same regex flags with a _FusedMatcher."""
+    result = []
+    run = []
+
+    def flush():
+        if len(run) > 1:
+            try:
+                result.append(_FusedMatcher(run.copy(), run[0].regex.flags))
+            except re.error:  # e.g., inline global flags, which are only allowed at the start of the whole regex
+                result.extend(run)
+        else:
+            result.extend(run)
+        run.clear()
+
+    for matcher in matchers:
+        if not _fusable(matcher):
+            flush()
+            result.append(matcher)
+        else:
+            if run and matcher.regex.flags != run[0].regex.flags:
+                flush()
+            run.append(matcher)
+
+    flush()
+    return result
@@ -0,0 +1,121 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Hashable
+from novel_tools.framework import NovelData, Processor
+
+
+class ListMatcher(Processor, ABC):
+    """
+    *** INTERNAL CLASS ***
+    Matches data against a list of titles, each of which can only be matched once.
+
+    The titles are indexed by their keys, e.g., their line numbers or contents, so that a line is matched with a few
+    dict lookups no matter how long the list is. By default, the list is matched in order: a line can only match the
+    title after the last matched one. With a positive `lookahead`, it can also match the titles up to that many places
+    further, so that a title that is missing from the text does not stop the ones after it from being matched; the
+    skipped titles can still be matched later, in case they are only out of order. With `unordered`, any title can be
+    matched. If several titles can be matched, the earliest one in the list wins.
+
+    The titles that are never matched are reported when the matcher is closed.
+    """
+
+    def __init__(self, titles: list[NovelData], lookahead: int = 0, unordered: bool = False):
+        self.list = titles
+        self.lookahead = lookahead
+        self.unordered = unordered
+        self.matched = [False] * len(titles)
+        self.remaining = len(titles)
+        # The position after the last matched title.
+        self.list_index = 0
+        # shape: {key: positions of the unmatched titles with the key, in ascending order}. An index is built for each
+        # shape of data that is seen, as the keys of a title might depend on the fields of the data it is compared to.
+        self.tables = {}
+
+    @abstractmethod
+    def _shape(self, data: NovelData) -> Hashable:
+        """Returns the shape of the data, which decides the keys of the titles it is compared to."""
+        pass
+
+    @abstractmethod
+    def _title_keys(self, title: NovelData, shape: Hashable) -> list[Hashable]:
+        """Returns the keys that the title is matched by, when compared to data of the given shape."""
+        pass
+
+    @abstractmethod
+    def _data_keys(self, data: NovelData) -> list[Hashable]:
+        """Returns the keys that the data matches a title by."""
+        pass
+
+    @abstractmethod
+    def _boundary(self, title: NovelData, text_path: Path) -> tuple[int | None, str | None]:
+        """Returns the line number in the text file and the content of the lines that the title can match, if any."""
+        pass
+
+    @abstractmethod
+    def _create(self, title: NovelData, data: NovelData, position: int) -> NovelData:
+        """Returns the matched data, from the title at the given position in the list."""
+        pass
+
+    def process(self, data: NovelData) -> NovelData:
+        # When the list is exhausted, stop matching
+        if self.remaining == 0:
+            return data
+
+        shape = self._shape(data)
+        table = self.tables.get(shape)
+        if table is None:
+            table = self.tables[shape] = self.__build_table(shape)
+
+        position = None
+        for key in self._data_keys(data):
+            positions = table.get(key)
+            if positions and (position is None or positions[0] < position):
+                position = positions[0]
+
+        if position is None or (not self.unordered and position > self.list_index + self.lookahead):
+            return data
+
+        self.__mark(position)
+        return self._create(self.list[position], data, position)
+
+    def boundaries(self, text_path: Path) -> tuple[set[int], set[str]]:
+        """
+        Returns the line numbers and the contents of the lines in the text file that the titles in the list can match,
+        so that these lines are never joined with others when the text is reflowed.
+        """
+        line_nums, contents = set(), set()
+        for title in self.list:
+            line_num, content = self._boundary(title, text_path)
+            if line_num is not None:
+                line_nums.add(line_num)
+            if content:
+                contents.add(content)
+        return line_nums, contents
+
+    def close(self):
+        unmatched = [title for title, matched in zip(self.list, self.matched) if not matched]
+        if unmatched:
+            print(f'{type(self).__name__}: {len(unmatched)} title(s) in the list were not matched:')
+            for title in unmatched:
+                line_num = f' (line {title.get("line_num")})' if title.has('line_num') else ''
+                print(f'  {title.content}{line_num}')
+
+    def __build_table(self, shape: Hashable) -> dict[Hashable, list[int]]:
+        table = {}
+        for position, title in enumerate(self.list):
+            if not self.matched[position]:
+                for key in self._title_keys(title, shape):
+                    table.setdefault(key, []).append(position)
+        return table
+
+    def __mark(self, position: int):
+        self.matched[position] = True
+        self.remaining -= 1
+        self.list_index = max(self.list_index, position + 1)
+        title = self.list[position]
+        for shape, table in self.tables.items():
+            for key in self._title_keys(title, shape):
+                positions = table[key]
+                positions.remove(position)
+                if not positions:
+                    del table[key]
@@ -0,0 +1,62 @@
+from abc import ABC, abstractmethod
+from typing import Callable, Pattern
+from novel_tools.framework import NovelData, Type, Processor
+from novel_tools.utils import literal_prefixes, length_range, prefilter
+
+
+class RegexMatcher(Processor, ABC):
+    """
+    *** INTERNAL CLASS ***
+    Matches unrecognized data, or data of its own type, against a regex, and creates a title from each match.
+
+    Lines that cannot match are rejected by a cheap check on their prefix and length before the regex runs. A
+    positive `max_length` further limits the length of the lines that are matched.
+    """
+
+    def __init__(self, data_type: Type, regex: Pattern, max_length: int = 0):
+        self.type = data_type
+        self.regex = regex
+        self.prefixes = literal_prefixes(regex)
+        self.min_length, self.max_length = length_range(regex)
+        if max_length > 0:
+            self.max_length = min(self.max_length or max_length, max_length)
+        self.accepts = prefilter(self.prefixes, self.min_length, self.max_length)
+        self.accepted_types = {Type.UNRECOGNIZED, data_type}
+
+    @abstractmethod
+    def create(self, data: NovelData, m) -> NovelData:
+        """Creates the title from a match of the regex, or returns the data as is if the match is not valid."""
+        pass
+
+    def process(self, data: NovelData) -> NovelData:
+        if data.type != Type.UNRECOGNIZED and data.type != self.type:
+            return data
+
+        if self.accepts is not None and not self.accepts(data.content):
+            return data
+
+        m = self.regex.match(data.content)
+        if m:
+            return self.create(data, m)
+
+        return data
+
+    def compile(self) -> Callable[[NovelData], NovelData]:
+        match = self.regex.match
+        accepts = self.accepts
+        data_type = self.type
+        unrecognized = Type.UNRECOGNIZED
+        create = self.create
+
+        def process(data: NovelData) -> NovelData:
+            if data.type is not unrecognized and data.type is not data_type:
+                return data
+
+            content = data.content
+            if accepts is not None and not accepts(content):
+                return data
+
+            m = match(content)
+            return create(data, m) if m else data
+
+        return process
@@ -1,6 +1,9 @@
 from pydantic import BaseModel, DirectoryPath, Field
-from novel_tools.framework import NovelData, Type, Processor
+from pathlib import Path
+from typing import Hashable
+from novel_tools.framework import NovelData, Type
 from novel_tools.readers.csv_reader import CsvReader
+from .__list_matcher__ import ListMatcher
 
 
 class Options(BaseModel):
@@ -14,9 +17,13 @@ class Options(BaseModel):
     join_dir: list[str] = Field(default=['source'], description='Specifies fields names that need dir joining. See '
                                                                 'CsvReader for more details.')
     data_type: str | None = Field(default=None, description='If present, specifies the type of all the titles.')
+    lookahead: int = Field(default=0, description='The number of titles after the next one in the list that can also be '
+                                                  'matched, so that a title missing from the text does not stop the '
+                                                  'titles after it from being matched.')
+    unordered: bool = Field(default=False, description='If set to True, the titles can be matched in any order.')
 
 
-class CsvMatcher(Processor):
+class CsvMatcher(ListMatcher):
     """
     Matches data by a given csv list. This matcher can be used in cases where the titles are irregular or do not have
     an explicit index. Examples include "Volume 12.5" or "Tales of the Wind".
@@ -32,60 +39,69 @@ class CsvMatcher(Processor):
     - If the csv list contains a "type" field, then it will be used;
     - If a type is specified in the args, then all lines will be set to that specific type;
     - If none of these is in the arguments, then an exception will be raised during construction.
+
+    By default, the titles are matched in the order of the list. Use `lookahead` or `unordered` if some titles might be
+    missing from the text or out of order. The titles that are not matched are printed at the end.
     """
 
     def __init__(self, args):
         options = Options(**args)
-        self.list = list(CsvReader(options.model_dump()).read())
+        self.data_type = Type[options.data_type.upper()] if options.data_type is not None else None
+        super().__init__([self.__check_type(title) for title in CsvReader(options.model_dump()).read()],
+                         options.lookahead, options.unordered)
+
+        # The original csv file may not have an `index` column. If it doesn't exist, the index will be the order of the
+        # title among the titles of the same type.
+        counts = {}
+        self.auto_indices = []
         for title in self.list:
-            if options.data_type is not None:
-                title.type = Type[options.data_type.upper()]
-            elif title.type == Type.UNRECOGNIZED:
-                raise ValueError('Type of title is not specified in file or arguments.')
-
-        # We assume that the list is in order, and can only be matched from the beginning.
-        # Therefore, we will keep track of the number of objects that have already been matched.
-        # If it exceeds the length of the list we stop matching.
-        self.list_index = 0
-        self.indices = {}
-
-    def process(self, data: NovelData) -> NovelData:
-        # When the list is exhausted, stop matching
-        if self.list_index >= len(self.list):
-            return data
+            counts[title.type] = counts.get(title.type, 0) + 1
+            self.auto_indices.append(counts[title.type])
 
-        next_title = self.list[self.list_index]
+    def _shape(self, data: NovelData) -> Hashable:
+        return data.has('source'), data.has('line_num')
 
+    def _title_keys(self, title: NovelData, shape: Hashable) -> list[Hashable]:
+        has_source, has_line_num = shape
         # First, check for `source` (if it exists). This is usually populated if we use a DirectoryWriter or multiple
         # TextReaders. If we only have one TextReader, there is only one file, so source is not necessary, and we can
         # simply omit this field when we write the results using a CsvWriter. If `source` exist and match, compare
         # `line_num`.
-        if next_title.has('source') and data.has('source'):
-            if next_title.get('source') != data.get('source') or next_title.get('line_num') != data.get('line_num'):
-                return data
-            return self.__merge(next_title, data)
+        if has_source and title.has('source'):
+            return [('source', title.get('source'), title.get('line_num'))]
 
         # If we only have one TextReader and don't have `source` in the csv, we simply compare line_num.
-        if next_title.has('line_num') and data.has('line_num'):
-            if next_title.get('line_num') != data.get('line_num'):
-                return data
-            return self.__merge(next_title, data)
+        if has_line_num and title.has('line_num'):
+            return [('line_num', title.get('line_num'))]
 
         # If the csv is not created from a CsvWriter and doesn't have `line_num`, we will use raw and/or content.
-        if next_title.get('raw', next_title.content) == data.get('raw', data.content):
-            return self.__merge(next_title, data)
-
-        return data
-
-    def __merge(self, title: NovelData, data: NovelData) -> NovelData:
-        self.list_index += 1
-        # The original csv file may not have an `index` column. If it doesn't exist, an index will be auto
-        # generated.
-        data_type = title.type
-        if data_type not in self.indices:
-            self.indices[data_type] = 0
-        self.indices[data_type] += 1
-
+        return [('raw', title.get('raw', title.content))]
+
+    def _data_keys(self, data: NovelData) -> list[Hashable]:
+        keys = []
+        if data.has('source'):
+            keys.append(('source', data.get('source'), data.get('line_num')))
+        if data.has('line_num'):
+            keys.append(('line_num', data.get('line_num')))
+        keys.append(('raw', data.get('raw', data.content)))
+        return keys
+
+    def _boundary(self, title: NovelData, text_path: Path) -> tuple[int | None, str | None]:
+        line_num = title.get('line_num')
+        # The line number of a title from another file does not apply.
+        if title.has('source') and Path(title.get('source')).resolve() != text_path.resolve():
+            line_num = None
+        # Without line numbers in the data, the title is matched by its raw text instead.
+        return line_num, title.get('raw', title.content).strip()
+
+    def _create(self, title: NovelData, data: NovelData, position: int) -> NovelData:
         others = data.others | title.others
-        return NovelData(title.content, data_type, title.index or self.indices[data_type],
-                         list_index=self.list_index, matched=True, **others)
+        return NovelData(title.content, title.type, title.index or self.auto_indices[position],
+                         list_index=position + 1, matched=True, **others)
+
+    def __check_type(self, title: NovelData) -> NovelData:
+        if self.data_type is not None:
+            title.type = self.data_type
+        elif title.type == Type.UNRECOGNIZED:
+            raise ValueError('Type of title is not specified in file or arguments.')
+        return title
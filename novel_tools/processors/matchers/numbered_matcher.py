@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field
 from typing import Pattern
-from novel_tools.framework import NovelData, Type, Processor
+from novel_tools.framework import NovelData, Type
 from novel_tools.utils import to_num
+from .__regex_matcher__ import RegexMatcher
 
 
 class Options(BaseModel):
@@ -11,6 +12,9 @@ class Options(BaseModel):
     index_group: int = Field(default=0, description='The group index for the title\'s order/index (starting from 0).')
     content_group: int = Field(default=1, description='The group index for the title\'s content (starting from 0). '
                                                       'Use -1 if there is no content.')
+    max_length: int = Field(default=0, description='Lines longer than this will not be matched. As titles are usually '
+                                                   'short, this rejects long lines cheaply before the regex runs. 0 '
+                                                   'means no limit other than the one implied by the regex.')
     tag: str | None = Field(default=None, description='The tag to append to matched data. Sometimes there may exist '
                                                       'several independent sets of indices within the same book; for '
                                                       'example, there might be two different Introductions by '
@@ -20,29 +24,22 @@ class Options(BaseModel):
                                                       'only checks for that tag.')
 
 
-class NumberedMatcher(Processor):
+class NumberedMatcher(RegexMatcher):
     """Matches a regular chapter/volume, with an index and/or a title."""
 
     def __init__(self, args):
         options = Options(**args)
-        self.type = Type[options.type.upper()]
-        self.regex = options.regex
+        super().__init__(Type[options.type.upper()], options.regex, options.max_length)
         self.index_group = options.index_group + 1
         self.content_group = options.content_group + 1
         self.tag = options.tag
 
-    def process(self, data: NovelData) -> NovelData:
-        if data.type != Type.UNRECOGNIZED and data.type != self.type:
+    def create(self, data: NovelData, m) -> NovelData:
+        """Creates the title from a match of the regex, or returns the data as is if the match is not valid."""
+        try:
+            index = to_num(m[self.index_group])
+            title = m[self.content_group].strip() if self.content_group != 0 else ''
+            tag = {'tag': self.tag} if self.tag else {}
+            return NovelData(title, self.type, index, matched=True, **(data.others | tag))
+        except ValueError:  # Not a valid number
             return data
-
-        m = self.regex.match(data.content)
-        if m:
-            try:
-                index = to_num(m[self.index_group])
-                title = m[self.content_group].strip() if self.content_group != 0 else ''
-                tag = {'tag': self.tag} if self.tag else {}
-                return NovelData(title, self.type, index, matched=True, **(data.others | tag))
-            except ValueError:  # Not a valid number
-                return data
-
-        return data
@@ -1,6 +1,9 @@
 from pydantic import BaseModel, DirectoryPath, Field
-from novel_tools.framework import NovelData, Processor
+from pathlib import Path
+from typing import Hashable
+from novel_tools.framework import NovelData
 from novel_tools.readers.toc_reader import TocReader
+from .__list_matcher__ import ListMatcher
 
 
 class Options(BaseModel):
@@ -12,30 +15,42 @@ class Options(BaseModel):
     has_volume: bool = Field(description='Specifies whether the toc contains volumes.')
     discard_chapters: bool = Field(description='If set to True, will start from chapter 1 again when entering a new '
                                                'volume.')
+    lookahead: int = Field(default=0, description='The number of titles after the next one in the toc that can also be '
+                                                  'matched, so that a title missing from the text does not stop the '
+                                                  'titles after it from being matched.')
+    unordered: bool = Field(default=False, description='If set to True, the titles can be matched in any order.')
 
 
-class TocMatcher(Processor):
+class TocMatcher(ListMatcher):
     """
     Matches data by a given Table of Contents (TOC) file. It is not advised to use toc files as a matcher; while the
     file is better human-readable, it contains less information than csv files and will not provide as many options as
     a csv file does.
+
+    A title is matched by either its line number or its content. By default, the titles are matched in the order of the
+    toc. Use `lookahead` or `unordered` if some titles might be missing from the text or out of order. The titles that
+    are not matched are printed at the end.
     """
 
     def __init__(self, args):
         options = Options(**args)
-        self.list = list(TocReader(options.model_dump()).read())
-        self.list_index = 0
-
-    def process(self, data: NovelData) -> NovelData:
-        if self.list_index >= len(self.list):
-            return data
-
-        next_title = self.list[self.list_index]
-        # Use different default values to avoid field being absent from both dicts
-        if next_title.get('line_num', -1) == data.get('line_num', 1) or next_title.content == data.content:
-            self.list_index += 1
-            others = data.others | next_title.others
-            return NovelData(next_title.content, next_title.type, next_title.index, list_index=self.list_index,
-                             matched=True, **others)
-
-        return data
+        super().__init__(list(TocReader(options.model_dump()).read()), options.lookahead, options.unordered)
+
+    def _shape(self, data: NovelData) -> Hashable:
+        return None
+
+    def _title_keys(self, title: NovelData, shape: Hashable) -> list[Hashable]:
+        return self._data_keys(title)
+
+    def _data_keys(self, data: NovelData) -> list[Hashable]:
+        keys = [('content', data.content)]
+        if data.has('line_num'):
+            keys.append(('line_num', data.get('line_num')))
+        return keys
+
+    def _boundary(self, title: NovelData, text_path: Path) -> tuple[int | None, str | None]:
+        return title.get('line_num'), title.content
+
+    def _create(self, title: NovelData, data: NovelData, position: int) -> NovelData:
+        others = data.others | title.others
+        return NovelData(title.content, title.type, title.index, list_index=position + 1, matched=True, **others)
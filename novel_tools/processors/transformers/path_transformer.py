@@ -17,10 +17,15 @@ class PathTransformer(Processor):
         options = Options(**args)
         self.in_dir = options.in_dir
         self.fields = options.fields
+        # Most data share the same few sources, so the relative paths are cached to avoid recomputing them.
+        self.relative_paths: dict[Path, Path] = {}
 
     def process(self, data: NovelData) -> NovelData:
         for field in self.fields:
             path = data.get(field, None)
             if isinstance(path, Path):
-                data.set(**{field: path.relative_to(self.in_dir)})
+                relative_path = self.relative_paths.get(path)
+                if relative_path is None:
+                    relative_path = self.relative_paths[path] = path.relative_to(self.in_dir)
+                data.set(**{field: relative_path})
         return data
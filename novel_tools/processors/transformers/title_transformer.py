@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Any
+from typing import Any, Callable
 from novel_tools.framework import NovelData, Type, Processor
 
 
@@ -23,6 +23,24 @@ class UnitProcessor:
         data_dict = data.flat_dict()
         return all(data_dict.get(key) == val for key, val in self.title_filter.items())
 
+    def compile_filter(self) -> Callable[[NovelData], bool]:
+        """Returns a predicate equivalent to `filter()` that does not build the flattened dict."""
+        checks = []
+        for key, val in self.title_filter.items():
+            if key in ('type', 'content', 'index'):
+                # Fields in `others` take precedence in the flattened dict.
+                checks.append(lambda data, key=key, val=val: data.get(key, getattr(data, key)) == val)
+            else:
+                checks.append(lambda data, key=key, val=val: data.get(key) == val)
+
+        def filter_data(data: NovelData) -> bool:
+            for check in checks:
+                if not check(data):
+                    return False
+            return True
+
+        return checks[0] if len(checks) == 1 else filter_data
+
     def format(self, data: NovelData) -> NovelData:
         if type(self.title_format) is str:
             data.set(formatted=data.format(self.title_format))
@@ -55,11 +73,16 @@ class TitleTransformer(Processor):
 
     Be careful if you want to use this on non-title data, for most writers use 'formatted' to determine whether the data
     is a title.
+
+    If every unit filters on `type`, the Worker will skip this transformer for data of other types, which saves a lot of
+    time on content lines. Therefore, prefer adding a `type` to tag filters.
     """
 
     def __init__(self, args):
         options = Options(**args)
         self.units = [UnitProcessor(unit) for unit in options.units]
+        if all('type' in unit.title_filter for unit in self.units):
+            self.accepted_types = {unit.title_filter['type'] for unit in self.units}
 
     def process(self, data: NovelData) -> NovelData:
         for unit in self.units:
@@ -67,3 +90,24 @@ class TitleTransformer(Processor):
                 return unit.format(data)
 
         return data
+
+    def process_batch(self, batch: list[NovelData]) -> list[NovelData]:
+        units = self.units
+        for data in batch:
+            for unit in units:
+                if unit.filter(data):
+                    unit.format(data)
+                    break
+
+        return batch
+
+    def compile(self) -> Callable[[NovelData], NovelData]:
+        units = tuple((unit.compile_filter(), unit.format) for unit in self.units)
+
+        def process(data: NovelData) -> NovelData:
+            for filter_data, format_data in units:
+                if filter_data(data):
+                    return format_data(data)
+            return data
+
+        return process
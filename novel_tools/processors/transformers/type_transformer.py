@@ -29,3 +29,29 @@ class TypeTransformer(Processor):
 
         self.first_line = False
         return data
+
+    def process_batch(self, batch: list[NovelData]) -> list[NovelData]:
+        # Same state machine as `process`, but with the state kept in locals for the duration of the batch.
+        in_volume = self.in_volume
+        in_chapter = self.in_chapter
+        first_line = self.first_line
+        for data in batch:
+            data_type = data.type
+            if data_type == Type.VOLUME_TITLE:
+                in_volume = True
+                in_chapter = False
+            elif data_type == Type.CHAPTER_TITLE:
+                in_chapter = True
+            elif in_chapter:
+                data.type = Type.CHAPTER_CONTENT
+            elif in_volume:
+                data.type = Type.VOLUME_INTRO
+            else:
+                data.type = Type.BOOK_TITLE if first_line else Type.BOOK_INTRO
+
+            first_line = False
+
+        self.in_volume = in_volume
+        self.in_chapter = in_chapter
+        self.first_line = first_line
+        return batch
@@ -42,7 +42,7 @@ class Validator(Processor):
         if not self.check(data):
             return data
 
-        new_data = data.copy()
+        new_data = data.copy(deep=False)
         corrected_index = data.index
 
         # Duplicate detection
@@ -21,6 +21,7 @@ class ChapterValidator(Validator):
 
         self.curr_volume = None
         self.validate_curr_volume = True
+        self.accepted_types = {Type.VOLUME_TITLE, Type.CHAPTER_TITLE}
 
     def check(self, data: NovelData) -> bool:
         if data.type == Type.VOLUME_TITLE:
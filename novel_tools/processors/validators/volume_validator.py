@@ -10,6 +10,8 @@ class VolumeValidator(Validator):
     def __init__(self, args):
         options = BaseOptions(**args)
         self.init_fields(options)
+        self.accepted_types = {Type.VOLUME_TITLE}
+        self.accepted_tags = {self.tag}
 
     def check(self, data: NovelData) -> bool:
         return data.type == Type.VOLUME_TITLE and data.index >= 0 and data.get('tag') == self.tag
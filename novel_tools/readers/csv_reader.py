@@ -1,8 +1,9 @@
 import csv
 from pydantic import BaseModel, DirectoryPath, Field
 from pathlib import Path
-from typing import Iterator
+from typing import Any, Callable, Iterator
 from novel_tools.framework import NovelData, Type, Reader
+from novel_tools.utils import open_text
 
 
 class Options(BaseModel):
@@ -25,50 +26,76 @@ class CsvReader(Reader):
     """
     Recovers the novel structure from the csv list. The csv is required to contain a "content" column, but it does not
     have to contain the other fields from a NovelData.
+
+    The rows are read lazily, and the conversion of each column is decided once from the header row. The file can be
+    compressed, in the same way as TextReader.
     """
 
     def __init__(self, args):
         options = Options(**args)
         self.in_dir = options.in_dir
         csv_file = Path(options.csv_filename)
-        csv_file = csv_file if csv_file.is_file() else Path(self.in_dir, csv_file)
-        with csv_file.open('rt', encoding=options.encoding) as f:
-            self.list = []
-            reader = csv.DictReader(f)
-            for row in reader:
-                self.list.append(row)
+        self.csv_file = csv_file if csv_file.is_file() else Path(self.in_dir, csv_file)
+        self.encoding = options.encoding
+        self.types = options.types
+        self.join_dir = options.join_dir
 
-        if 'content' not in self.list[0]:
+        with open_text(self.csv_file, self.encoding, newline='') as f:
+            header = next(csv.reader(f), [])
+
+        if 'content' not in header:
             raise ValueError('csv does not contain valid columns.')
 
-        self.types = options.types
-        self.join_dir = options.join_dir
+        self.converters = tuple(self.__converter(name) for name in header)
 
     def read(self) -> Iterator[NovelData]:
-        for i in range(len(self.list)):
-            data: dict = self.list[i]
-            content = data.pop('content')
-            data_type = Type[data.pop('type', 'unrecognized').upper()]
-            index = data.pop('index', None)
-            if index is not None:
-                index = int(index)
-
-            for name, field_type in self.types.items():
-                if name not in data:
+        names = tuple(name for name, _ in self.converters)
+        converters = tuple(converter for _, converter in self.converters)
+        with open_text(self.csv_file, self.encoding, newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)  # Header
+            for row in reader:
+                # Skip blank lines, as csv.DictReader does.
+                if not row:
                     continue
 
-                try:
-                    if field_type == 'int':
-                        data[name] = int(data[name])
-                    if field_type == 'bool':
-                        data[name] = bool(data[name])
-                    if field_type == 'Path':
-                        data[name] = Path(data[name])
-                except ValueError:
-                    data[name] = None
-
-            for name in self.join_dir:
-                if isinstance(data.get(name, None), Path):
-                    data[name] = self.in_dir / data[name]
-
-            yield NovelData(content, data_type, index, **data)
+                data = {name: value if converter is None else converter(value)
+                        for name, converter, value in zip(names, converters, row)}
+                content = data.pop('content', '')
+                data_type = data.pop('type', Type.UNRECOGNIZED)
+                index = data.pop('index', None)
+                yield NovelData(content, data_type, index, **data)
+
+    def __converter(self, name: str) -> tuple[str, Callable[[str], Any] | None]:
+        """Returns the name of the column and the function to convert its values, or None if they are kept as str."""
+        if name == 'type':
+            return name, _to_type
+        if name == 'index':
+            return name, _to_index
+
+        field_type = self.types.get(name)
+        if field_type == 'int':
+            return name, _to_int
+        if field_type == 'bool':
+            return name, bool
+        if field_type == 'Path':
+            if name in self.join_dir:
+                in_dir = self.in_dir
+                return name, lambda value: in_dir / value
+            return name, Path
+        return name, None
+
+
+def _to_type(value: str) -> Type:
+    return Type[value.upper()]
+
+
+def _to_index(value: str) -> int | None:
+    return int(value) if value else None
+
+
+def _to_int(value: str) -> int | None:
+    try:
+        return int(value)
+    except ValueError:
+        return None
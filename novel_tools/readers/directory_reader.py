@@ -1,15 +1,25 @@
-from pydantic import BaseModel, DirectoryPath, Field
-from pathlib import Path
+from pydantic import BaseModel, DirectoryPath, FilePath, Field
+import hashlib
+import io
+import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from threading import get_ident
+from pathlib import Path, PurePosixPath
 from typing import Iterator
 from natsort import os_sorted
-from novel_tools.framework import NovelData, Type, Reader
+from novel_tools.framework import NovelData, Type, Reader, FileContext, SourceLine
+from novel_tools.utils import Archive, decompress_stream, strip_compression
 from .text_reader import TextReader
 
 supported_extensions = ['.txt', '.md']
+cache_dirname = '.novel_tools_cache'
+blob_suffix = '.lines.json'
 
 
 class Options(BaseModel):
-    in_dir: DirectoryPath = Field(description='The working directory.')
+    in_dir: DirectoryPath | FilePath = Field(description='The working directory, or a zip or tar archive of it.')
     read_contents: bool = Field(description='If set to True, will open the files to read the contents.')
     discard_chapters: bool = Field(description='If set to True, will start from chapter 1 again when entering a new '
                                                'volume.')
@@ -23,12 +33,27 @@ class Options(BaseModel):
                                                             'one. Sometimes newline characters carry meanings, and we '
                                                             'do not want decorative newlines to mix with those '
                                                             'meaningful ones.')
+    prefetch: int = Field(default=0, ge=0, description='If larger than 0, up to this many upcoming files will be read '
+                                                       'ahead on a thread pool while the earlier ones are being '
+                                                       'processed, which helps on slow or network filesystems. The '
+                                                       'order of the data is unchanged. 0 reads the files one at a '
+                                                       'time.')
+    cache: bool = Field(default=False, description='If set to True, the parsed data of every file will be cached in '
+                                                   f'`{cache_dirname}` under the working directory, along with a '
+                                                   'manifest of the size, modification time and hash of the files. '
+                                                   'On the next run, only the files that have changed will be read '
+                                                   'again.')
+    rebuild_cache: bool = Field(default=False, description='If set to True, the cache will be discarded and every file '
+                                                           'will be read again.')
 
 
 class DirectoryReader(Reader):
     """
     Reads from a directory structure. This directory should be generated from FileWriter, as it will follow certain
     conventions, such as the first line of the chapter file being the title.
+
+    The directory can also be read from a zip or tar archive, and the files can be compressed, in the same way as
+    TextReader.
     """
 
     def __init__(self, args):
@@ -40,20 +65,64 @@ class DirectoryReader(Reader):
         self.encoding = options.encoding
         self.intro_filename = options.intro_filename
         self.merge_newlines = options.merge_newlines
+        self.prefetch = options.prefetch
+        self.cache = options.cache
+        self.rebuild_cache = options.rebuild_cache
+        self.cache_dir = self.in_dir / cache_dirname
+        self.archive = Archive(self.in_dir) if self.in_dir.is_file() else None
+        if self.archive is not None and self.cache:
+            raise ValueError('The cache is not supported when reading from an archive.')
 
         # Create the list of volumes/directories to look for
-        self.volumes: list[Path] = [dir_path for dir_path in os_sorted(self.in_dir.iterdir()) if dir_path.is_dir()]
+        self.volumes: list[Path] = [dir_path for dir_path in os_sorted(self.__iterdir(self.in_dir))
+                                    if self.__is_dir(dir_path) and dir_path.name != cache_dirname]
         if self.default_volume in self.volumes:
             self.volumes = [self.default_volume]
 
     def read(self) -> Iterator[NovelData]:
+        if self.cache:
+            self.__open_cache()
+
+        yield from self.__read_entries()
+
+        # Only save the cache when everything has been read, so that the manifest is complete.
+        if self.cache:
+            self.__save_cache()
+
+    def __read_entries(self) -> Iterator[NovelData]:
+        entries = self.__entries()
+        if self.prefetch == 0:
+            for entry in entries:
+                if isinstance(entry, NovelData):
+                    yield entry
+                else:
+                    yield from self.__read_file(*entry)
+            return
+
+        # Keep at most `prefetch` files in flight, and yield them in the original order.
+        with ThreadPoolExecutor(self.prefetch) as executor:
+            pending = deque()
+            try:
+                for entry in entries:
+                    if not isinstance(entry, NovelData):
+                        entry = executor.submit(lambda args: list(self.__read_file(*args)), entry)
+                    pending.append(entry)
+                    while len(pending) > self.prefetch:
+                        yield from self.__result(pending.popleft())
+
+                while pending:
+                    yield from self.__result(pending.popleft())
+            finally:
+                for entry in pending:
+                    if not isinstance(entry, NovelData):
+                        entry.cancel()
+
+    def __entries(self) -> Iterator[NovelData | tuple[Path, Type, int | None]]:
+        """Lists the volume titles and the files to read, as (path, type, chapter index), in order."""
         # Read intro file
-        intro_path = self.in_dir / self.intro_filename
-        if self.read_contents and intro_path.is_file():
-            text_reader = self.__get_text_reader(intro_path)
-            for data in text_reader.read():
-                data.type = Type.BOOK_INTRO
-                yield data
+        intro_path = self.__find_intro([path for path in self.__iterdir(self.in_dir) if self.__is_file(path)])
+        if self.read_contents and intro_path is not None:
+            yield intro_path, Type.BOOK_INTRO, None
 
         volume_index = 0
         chapter_index = 0
@@ -65,36 +134,179 @@ class DirectoryReader(Reader):
             if volume != self.default_volume:
                 yield NovelData(volume.stem, Type.VOLUME_TITLE, volume_index, source=volume)
 
-            chapter: Path  # natsort can accept a range of types, so we need to make type checker happy
-            chapters = [chapter for chapter in os_sorted(volume.iterdir()) if chapter.is_file()
-                        and chapter.suffix in supported_extensions]
+            chapters = self.__list_chapters(volume)
             # Read intro file
-            intro_path = Path(volume, self.intro_filename)
-            if intro_path in chapters:
+            intro_path = self.__find_intro(chapters)
+            if intro_path is not None:
                 chapters.remove(intro_path)
                 if self.read_contents:
-                    text_reader = self.__get_text_reader(intro_path)
-                    for data in text_reader.read():
-                        data.type = Type.VOLUME_INTRO
-                        yield data
+                    yield intro_path, Type.VOLUME_INTRO, None
 
             for chapter in chapters:
                 chapter_index += 1
-                text_reader = self.__get_text_reader(chapter)
-                read = text_reader.read()
-                data = next(read)  # Title
-                data.type = Type.CHAPTER_TITLE
-                data.index = chapter_index
-                yield data
-                if self.read_contents:
-                    for data in read:
-                        data.type = Type.CHAPTER_CONTENT
-                        yield data
+                yield chapter, Type.CHAPTER_TITLE, chapter_index
+
+    def __list_chapters(self, volume: Path) -> list[Path]:
+        """Lists the chapter files of the volume in natural order, from the cache if the directory has not changed."""
+        if self.cache:
+            # Adding, removing or renaming a file changes the modification time of the directory, editing one does not.
+            name = volume.relative_to(self.in_dir).as_posix()
+            mtime_ns = volume.stat().st_mtime_ns
+            entry = self.manifest_volumes.get(name)
+            if entry is not None and entry['mtime_ns'] == mtime_ns:
+                chapters = [volume / chapter for chapter in entry['chapters']]
+                self.new_manifest_volumes[name] = entry
+                return chapters
+
+        chapters = [chapter for chapter in os_sorted(self.__iterdir(volume)) if self.__is_file(chapter)
+                    and Path(strip_compression(chapter.name)).suffix in supported_extensions]
+        if self.cache:
+            self.new_manifest_volumes[name] = {'mtime_ns': mtime_ns, 'chapters': [chapter.name for chapter in chapters]}
+        return chapters
+
+    def __find_intro(self, files: list[Path]) -> Path | None:
+        """Finds the intro file among the files, which might be compressed."""
+        return next((file for file in files if strip_compression(file.name) == self.intro_filename), None)
+
+    def __iterdir(self, directory: Path) -> list[Path]:
+        if self.archive is None:
+            return list(directory.iterdir())
+        return [directory / name for name in self.archive.iterdir(self.__member(directory))]
+
+    def __is_dir(self, path: Path) -> bool:
+        return path.is_dir() if self.archive is None else self.archive.is_dir(self.__member(path))
+
+    def __is_file(self, path: Path) -> bool:
+        return path.is_file() if self.archive is None else self.archive.is_file(self.__member(path))
+
+    def __member(self, path: Path) -> PurePosixPath:
+        return PurePosixPath(path.relative_to(self.in_dir).as_posix())
+
+    def __read_text(self, path: Path) -> Iterator[NovelData]:
+        if self.archive is None:
+            yield from self.__get_text_reader(path).read()
+            return
+
+        # Archive members are read into memory as a whole, as chapter files are small.
+        data = io.BytesIO(self.archive.read_bytes(self.__member(path)))
+        with decompress_stream(data, path.name) as binary, io.TextIOWrapper(binary, self.encoding) as f:
+            yield from self.__get_text_reader(path)._to_data(f, path)
+
+    def __read_file(self, path: Path, data_type: Type, index: int | None) -> Iterator[NovelData]:
+        if self.cache:
+            read = (data for data in self.__load(path, data_type == Type.CHAPTER_TITLE and not self.read_contents))
+        else:
+            read = self.__read_text(path)
+
+        if data_type == Type.CHAPTER_TITLE:
+            data = next(read)  # Title
+            data.type = Type.CHAPTER_TITLE
+            data.index = index
+            yield data
+            if not self.read_contents:
+                read.close()
+                return
+            data_type = Type.CHAPTER_CONTENT
+
+        for data in read:
+            data.type = data_type
+            yield data
+
+    def __open_cache(self):
+        self.cache_dir.mkdir(exist_ok=True)
+        # Everything that affects the parsed data is part of the key.
+        self.cache_key = hashlib.blake2b(json.dumps([self.encoding, self.merge_newlines]).encode(),
+                                         digest_size=8).hexdigest()
+        manifest_path = self.cache_dir / 'manifest.json'
+        self.manifest = {}
+        self.manifest_volumes = {}
+        if manifest_path.is_file() and not self.rebuild_cache:
+            with manifest_path.open('rt') as f:
+                manifest = json.load(f)
+            if manifest.get('key') == self.cache_key:
+                self.manifest = manifest['files']
+                self.manifest_volumes = manifest['volumes']
+        self.new_manifest = {}
+        self.new_manifest_volumes = {}
+
+    def __load(self, path: Path, title_only: bool) -> list[SourceLine]:
+        """Returns the parsed data of the file, from the cache if the file has not changed."""
+        name = path.relative_to(self.in_dir).as_posix()
+        stat = path.stat()
+        entry = self.manifest.get(name)
+        if entry is None or entry['size'] != stat.st_size or entry['mtime_ns'] != stat.st_mtime_ns:
+            with path.open('rb') as f:
+                digest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+        else:
+            digest = entry['hash']
+
+        # The blobs are addressed by content, so a moved or renamed file can still be served from the cache.
+        blob = self.cache_dir / self.__blob_name(digest, title_only)
+        data = self.__load_blob(blob, path) if blob.is_file() and not self.rebuild_cache else None
+        if data is None:
+            read = self.__get_text_reader(path).read()
+            data = list(islice(read, 1)) if title_only else list(read)
+            read.close()
+            # Write to a temporary file first, as another thread might be reading a file with the same contents.
+            temp = blob.with_name(f'{blob.name}.{get_ident()}.tmp')
+            with temp.open('wt', encoding='utf-8') as f:
+                json.dump([[line.line_num for line in data], [line.raw for line in data]], f, ensure_ascii=False)
+            temp.replace(blob)
+
+        self.new_manifest[name] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': digest}
+        return data
+
+    def __blob_name(self, digest: str, title_only: bool) -> str:
+        return f'{self.cache_key}-{digest}{"-title" if title_only else ""}{blob_suffix}'
+
+    def __load_blob(self, blob: Path, path: Path) -> list[SourceLine] | None:
+        """
+        Returns the data stored in the blob, or None if it is not valid. Only the line numbers and the raw lines are
+        stored, as plain JSON, so that a blob planted in the cache directory can do no more than give wrong lines.
+        """
+        try:
+            with blob.open('rt', encoding='utf-8') as f:
+                line_nums, raws = json.load(f)
+        except ValueError:  # Includes JSONDecodeError and UnicodeDecodeError
+            return None
+        if not isinstance(line_nums, list) or not isinstance(raws, list) or len(line_nums) != len(raws) or \
+                not all(type(line_num) is int for line_num in line_nums) or not all(type(raw) is str for raw in raws):
+            return None
+
+        context = FileContext(path, self.encoding)
+        return [SourceLine(raw.lstrip(), context, line_num, raw) for line_num, raw in zip(line_nums, raws)]
+
+    def __save_cache(self):
+        # The files that were not read in this run, e.g., the intros when only the titles are read, are kept as long as
+        # they have not changed.
+        for name, entry in self.manifest.items():
+            path = self.in_dir / name
+            if name not in self.new_manifest and path.is_file():
+                stat = path.stat()
+                if entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                    self.new_manifest[name] = entry
+
+        with (self.cache_dir / 'manifest.json').open('wt') as f:
+            json.dump({'key': self.cache_key, 'files': self.new_manifest, 'volumes': self.new_manifest_volumes}, f)
+
+        # Remove the blobs of files that no longer exist or have changed. The blobs of the titles and of the whole files
+        # are kept alike, so that runs with and without `read_contents` do not discard each other's blobs.
+        blobs = {self.__blob_name(entry['hash'], title_only) for entry in self.new_manifest.values()
+                 for title_only in (False, True)}
+        for blob in self.cache_dir.glob(f'*{blob_suffix}'):
+            if blob.name not in blobs:
+                blob.unlink()
+
+    @staticmethod
+    def __result(entry) -> Iterator[NovelData]:
+        if isinstance(entry, NovelData):
+            yield entry
+        else:
+            yield from entry.result()
 
     def __get_text_reader(self, filename: Path) -> TextReader:
         return TextReader({
             'text_filename': str(filename),
-            'in_dir': self.in_dir,
             'encoding': self.encoding,
             'verbose': True,
             'merge_newlines': self.merge_newlines
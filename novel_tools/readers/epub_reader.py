@@ -0,0 +1,196 @@
+from pydantic import BaseModel, DirectoryPath, Field
+import posixpath
+import xml.etree.ElementTree as ElementTree
+import zipfile
+from pathlib import Path
+from typing import Iterator
+from urllib.parse import unquote
+from bs4 import BeautifulSoup
+from bs4.element import Tag
+from novel_tools.framework import NovelData, Type, Reader
+
+_namespaces = {
+    'container': 'urn:oasis:names:tc:opendocument:xmlns:container',
+    'opf': 'http://www.idpf.org/2007/opf',
+    'dc': 'http://purl.org/dc/elements/1.1/',
+    'ncx': 'http://www.daisy.org/z3986/2005/ncx/',
+    'xhtml': 'http://www.w3.org/1999/xhtml',
+    'epub': 'http://www.idpf.org/2007/ops',
+}
+_content_types = {Type.BOOK_INTRO, Type.VOLUME_INTRO, Type.CHAPTER_CONTENT}
+_type_names = [data_type.name for data_type in Type]
+
+
+class Options(BaseModel):
+    epub_filename: str = Field(default='book.epub', description='The filename of the epub.')
+    in_dir: DirectoryPath | None = Field(default=None, description='The directory to read the epub from. Required if '
+                                                                   'the filename does not contain the path.')
+    discard_chapters: bool = Field(default=False, description='If set to True, will start from chapter 1 again when '
+                                                              'entering a new volume.')
+
+
+class EpubReader(Reader):
+    """
+    Reads from an epub, such as one generated by EpubWriter. The documents are read one at a time in the order of the
+    spine, so that the memory usage is bounded by the largest document instead of the whole book.
+
+    The BOOK_TITLE is created from the metadata of the epub, with the authors, id, languages, tags, publisher and date
+    in its `others` field, as in MetadataJsonReader.
+
+    Within each document, `<h1>` is read as a title, and `<p>` (or a standalone `<br>`, which is an empty line) as the
+    content. Their types are decided as follows:
+    - If the element is inside an element whose class is the name of a type, such as `<div class="CHAPTER_CONTENT">` in
+      the templates of EpubWriter, that type will be used. Elements that are not inside such an element are ignored if
+      the document contains any of them, e.g., the metadata on the metadata page.
+    - Otherwise, a title is a VOLUME_TITLE if its document has children in the table of contents, and a CHAPTER_TITLE
+      if not. The content is the intro of the volume or the content of the chapter after it.
+
+    The BOOK_TITLE on the metadata page is skipped, as it has already been created from the metadata. Only the text of
+    the elements is kept, except for images, which are converted back to markdown. The class of each element, which
+    EpubWriter writes from the tag of the data, is restored as `tag`.
+    """
+
+    def __init__(self, args):
+        options = Options(**args)
+        epub_path = Path(options.epub_filename)
+        self.epub_path = epub_path if epub_path.is_file() else options.in_dir / epub_path
+        self.discard_chapters = options.discard_chapters
+
+    def read(self) -> Iterator[NovelData]:
+        with zipfile.ZipFile(self.epub_path) as epub:
+            container = ElementTree.fromstring(epub.read('META-INF/container.xml'))
+            opf_path = container.find('.//container:rootfile', _namespaces).get('full-path')
+            opf = ElementTree.fromstring(epub.read(opf_path))
+            yield self.__read_metadata(opf)
+
+            # id: (path, properties)
+            manifest = {item.get('id'): (_join(opf_path, item.get('href')), item.get('properties', '').split())
+                        for item in opf.iterfind('opf:manifest/opf:item', _namespaces)}
+            volumes = self.__read_toc(epub, opf, manifest)
+
+            volume_index = 0
+            chapter_index = 0
+            current_type = None
+            for itemref in opf.iterfind('opf:spine/opf:itemref', _namespaces):
+                path, properties = manifest[itemref.get('idref')]
+                if itemref.get('linear') == 'no' or 'nav' in properties:
+                    continue
+
+                default_title = Type.VOLUME_TITLE if path in volumes else Type.CHAPTER_TITLE
+                soup = BeautifulSoup(epub.read(path), 'html.parser')
+                body = soup.body or soup
+                typed = body.find(class_=_type_names) is not None
+                # Line breaks within a paragraph are part of its content.
+                elements = [element for element in body.find_all(['h1', 'p', 'br'])
+                            if element.name != 'br' or element.find_parent('p') is None]
+                for element in elements:
+                    data_type = _get_type(element)
+                    if data_type is None and typed:
+                        continue
+
+                    if element.name == 'h1':
+                        data_type = data_type or default_title
+                        if data_type == Type.VOLUME_TITLE:
+                            volume_index += 1
+                            if self.discard_chapters:
+                                chapter_index = 0
+                            index = volume_index
+                        elif data_type == Type.CHAPTER_TITLE:
+                            chapter_index += 1
+                            index = chapter_index
+                        else:
+                            index = None
+                        current_type = data_type
+                        if data_type == Type.BOOK_TITLE:
+                            continue
+                    else:
+                        data_type = data_type or _content_type(current_type)
+                        if data_type not in _content_types:
+                            continue
+                        index = None
+
+                    yield _to_data(element, data_type, index)
+
+    @staticmethod
+    def __read_metadata(opf: ElementTree.Element) -> NovelData:
+        metadata = opf.find('opf:metadata', _namespaces)
+
+        def find_all(name: str) -> list[str]:
+            return [element.text or '' for element in metadata.iterfind(f'dc:{name}', _namespaces)]
+
+        title = find_all('title')
+        others = {
+            'authors': find_all('creator'),
+            'id': next(iter(find_all('identifier')), None),
+            'languages': find_all('language'),
+            'tags': find_all('subject'),
+        }
+        for name in ('publisher', 'date'):
+            if values := find_all(name):
+                others[name] = values[0]
+
+        return NovelData(title[0] if title else '', Type.BOOK_TITLE, **others)
+
+    @staticmethod
+    def __read_toc(epub: zipfile.ZipFile, opf: ElementTree.Element,
+                   manifest: dict[str, tuple[str, list[str]]]) -> set[str]:
+        """Returns the paths of the documents with children in the table of contents, i.e., the volumes."""
+        volumes = set()
+        nav_path = next((path for path, properties in manifest.values() if 'nav' in properties), None)
+        if nav_path is not None:
+            nav = ElementTree.fromstring(epub.read(nav_path))
+            for toc in nav.iterfind('.//xhtml:nav', _namespaces):
+                if toc.get(f'{{{_namespaces["epub"]}}}type') != 'toc':
+                    continue
+                for entry in toc.iterfind('.//xhtml:li', _namespaces):
+                    link = entry.find('xhtml:a', _namespaces)
+                    if link is not None and entry.find('xhtml:ol', _namespaces) is not None:
+                        volumes.add(_join(nav_path, link.get('href')))
+            return volumes
+
+        # EPUB 2 only has the NCX.
+        toc_id = opf.find('opf:spine', _namespaces).get('toc')
+        if toc_id is not None and toc_id in manifest:
+            ncx_path = manifest[toc_id][0]
+            ncx = ElementTree.fromstring(epub.read(ncx_path))
+            for point in ncx.iterfind('.//ncx:navPoint', _namespaces):
+                if point.find('ncx:navPoint', _namespaces) is not None:
+                    volumes.add(_join(ncx_path, point.find('ncx:content', _namespaces).get('src')))
+        return volumes
+
+
+def _join(base: str, href: str) -> str:
+    """Resolves a link relative to the document at `base` into a path in the zip, without the fragment."""
+    href = unquote(href.split('#', 1)[0])
+    return posixpath.normpath(posixpath.join(posixpath.dirname(base), href))
+
+
+def _get_type(element: Tag) -> Type | None:
+    """Returns the type named by the class of the element or its closest ancestor, if any."""
+    for tag in (element, *element.parents):
+        for name in tag.get('class') or []:
+            if name in Type.__members__:
+                return Type[name]
+    return None
+
+
+def _content_type(title_type: Type | None) -> Type:
+    if title_type == Type.VOLUME_TITLE:
+        return Type.VOLUME_INTRO
+    if title_type == Type.CHAPTER_TITLE:
+        return Type.CHAPTER_CONTENT
+    return Type.BOOK_INTRO
+
+
+def _to_data(element: Tag, data_type: Type, index: int | None) -> NovelData:
+    for line_break in element.find_all('br'):
+        line_break.replace_with('\n')
+    content = element.get_text().strip()
+    if not content:
+        images = [f'![{img.get("alt", "")}]({img.get("src", "")})' for img in element.find_all('img')]
+        content = ' '.join(images)
+
+    classes = [name for name in element.get('class') or [] if name not in Type.__members__]
+    if classes:
+        return NovelData(content, data_type, index, tag=' '.join(classes))
+    return NovelData(content, data_type, index)
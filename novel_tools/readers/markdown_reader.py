@@ -1,7 +1,8 @@
 from pydantic import BaseModel, DirectoryPath, Field
 from pathlib import Path
 from typing import Iterator
-from novel_tools.framework import NovelData, Type, Reader
+from novel_tools.framework import NovelData, Type, FileContext, SourceLine, Reader
+from novel_tools.utils import open_text
 
 
 class Options(BaseModel):
@@ -20,6 +21,8 @@ class MarkdownReader(Reader):
     Reads from a Markdown file. Only a strict subset of Markdown is supported. Namely, only titles (lines starting with
     `#`'s) will be recognized. Also, if a paragraph is split on several lines (separated by a single newline character),
     they will be treated as several paragraphs instead of one.
+
+    The file can be compressed, in the same way as TextReader.
     """
 
     def __init__(self, args):
@@ -32,12 +35,14 @@ class MarkdownReader(Reader):
 
     def read(self) -> Iterator[NovelData]:
         md_path = self.md_path if self.md_path.is_file() else self.in_dir / self.md_path
-        with md_path.open('rt', encoding=self.encoding) as f:
+        context = FileContext(md_path, self.encoding) if self.verbose else None
+        with open_text(md_path, self.encoding) as f:
             line_num = 0
             prev_newline = False
             for line in f:
                 line_num += 1
-                content = line.strip()
+                raw = line.rstrip()
+                content = raw.lstrip()
 
                 # In Markdown, double newline represents a new paragraph
                 if content == '':
@@ -54,5 +59,7 @@ class MarkdownReader(Reader):
                         data_type = self.levels[index]
                         content = content[index + 1:]
 
-                args = {'source': md_path, 'line_num': line_num, 'raw': line.rstrip()} if self.verbose else {}
-                yield NovelData(content, data_type, **args)
+                if context:
+                    yield SourceLine(content, context, line_num, raw, data_type)
+                else:
+                    yield NovelData(content, data_type)
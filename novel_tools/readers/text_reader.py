@@ -1,7 +1,14 @@
 from pydantic import BaseModel, DirectoryPath, Field
+import codecs
+import io
+import mmap
+import os
+import unicodedata
 from pathlib import Path
-from typing import Iterator
-from novel_tools.framework import NovelData, Reader
+from functools import partial
+from typing import Iterable, Iterator, Pattern, TextIO
+from novel_tools.framework import NovelData, FileContext, SourceLine, Reader
+from novel_tools.utils import LineIndex, detect_compression, open_text
 
 
 class Options(BaseModel):
@@ -15,10 +22,47 @@ class Options(BaseModel):
                                                             'one. Sometimes newline characters carry meanings, and we '
                                                             'do not want decorative newlines to mix with those '
                                                             'meaningful ones.')
+    mmap: bool = Field(default=False, description='If set to True, the file will be memory-mapped and decoded in large '
+                                                  'blocks instead of line by line, which is faster for large files. '
+                                                  'The result is the same.')
+    line_index: bool = Field(default=False, description='If set to True, an index of the byte offset of every line '
+                                                        'will be saved next to the text file as `<filename>.idx`, and '
+                                                        'reused as long as the file does not change. This lets '
+                                                        '`read_lines()` seek directly to any line range.')
+    reflow: bool = Field(default=False, description='If set to True, the lines of a paragraph that has been hard-wrapped '
+                                                    'at a fixed width will be joined back into a single line. CJK '
+                                                    'lines are joined directly, and others with a space. A line is '
+                                                    'never joined with an empty line, and the joined line keeps the '
+                                                    'line number of its first line.')
+    reflow_width: int = Field(default=0, ge=0, description='If larger than 0, a line shorter than this many characters '
+                                                           'ends the paragraph, as wrapped lines are filled up to the '
+                                                           'width.')
+    reflow_punctuation: str = Field(default='。！？…”’」』）.!?"\')', description='A line ending with any of these '
+                                                                            'characters ends the paragraph.')
+    reflow_indent: bool = Field(default=True, description='If set to True, an indented line starts a new paragraph.')
+    reflow_boundary: Pattern | None = Field(default=None, description='Lines matching this regex are never joined with '
+                                                                      'other lines. When the reader is used in a '
+                                                                      'workflow, the regexes of the NumberedMatchers '
+                                                                      'and SpecialMatchers, and the titles in the '
+                                                                      'lists of the CsvMatchers and TocMatchers, are '
+                                                                      'added as well, so that titles are never '
+                                                                      'joined.')
+    max_line_length: int = Field(default=0, ge=0, description='If larger than 0, lines longer than this many '
+                                                              'characters will be split into several, after the last '
+                                                              'sentence-final punctuation within the limit, or at the '
+                                                              'limit if there is none. The file is read in blocks, so '
+                                                              'that a huge line, or a file without newlines, never has '
+                                                              'to be held in memory as a whole. The pieces keep the '
+                                                              'line number of their line. Cannot be used with reflow.')
+    chunk_punctuation: str = Field(default='。！？…!?.', description='The sentence-final punctuation after which a '
+                                                                   'long line can be split.')
 
 
 class TextReader(Reader):
-    """Reads from a plain text file."""
+    """
+    Reads from a plain text file. The file can be compressed with gzip, xz, bzip2 or Zstandard, which is detected from
+    the extension, or from the first bytes of the file if the extension is unknown.
+    """
 
     def __init__(self, args):
         options = Options(**args)
@@ -27,21 +71,340 @@ class TextReader(Reader):
         self.encoding = options.encoding
         self.verbose = options.verbose
         self.merge_newlines = options.merge_newlines
+        self.mmap = options.mmap
+        self.line_index = options.line_index
+        self.reflow = options.reflow
+        self.reflow_width = options.reflow_width
+        self.reflow_punctuation = tuple(options.reflow_punctuation)
+        self.reflow_indent = options.reflow_indent
+        self.reflow_boundaries: list[Pattern] = [options.reflow_boundary] if options.reflow_boundary else []
+        self.reflow_boundary_lines: set[int] = set()
+        self.reflow_boundary_contents: set[str] = set()
+        self.max_line_length = options.max_line_length
+        self.chunk_punctuation = options.chunk_punctuation
+        if self.reflow and self.max_line_length:
+            raise ValueError('reflow and max_line_length cannot be used together.')
+
+    @property
+    def text_path(self) -> Path:
+        return self.filename if self.filename.is_file() else self.in_dir / self.filename
 
     def read(self) -> Iterator[NovelData]:
-        text_path = self.filename if self.filename.is_file() else self.in_dir / self.filename
-        with text_path.open('rt', encoding=self.encoding) as f:
-            line_num = 0
-            prev_newline = False
-            for line in f:
+        text_path = self.text_path
+        if self.line_index:
+            LineIndex.open(text_path, self.encoding)
+
+        if self.max_line_length:
+            with open_text(text_path, self.encoding) as f:
+                yield from self._to_data(_blocks(f), text_path)
+            return
+
+        # Compressed files cannot be mapped, but they give the same result when read as a stream.
+        if self.mmap and detect_compression(text_path) is None:
+            yield from self._to_data(self.__mmap_lines(text_path), text_path)
+            return
+
+        with open_text(text_path, self.encoding) as f:
+            yield from self._to_data(f, text_path)
+
+    def scan(self, locator: Pattern) -> Iterator[NovelData]:
+        """
+        Reads only the first line, and the lines at whose start `locator`, a MULTILINE regex, matches, e.g., the one
+        from `AggregateMatcher.locator()`. The file is decoded in blocks, and the lines are located with a single
+        `finditer()` on each block, so that nothing is done for the other lines. The data of the lines read is the same
+        as from `read()`. Cannot be used with reflow, max_line_length or merge_newlines.
+        """
+        if self.reflow or self.max_line_length or self.merge_newlines:
+            raise ValueError('Scanning does not support reflow, max_line_length or merge_newlines.')
+
+        text_path = self.text_path
+        with open_text(text_path, self.encoding) as f:
+            yield from self._to_data(_blocks(f), text_path, locator=locator)
+
+    def shards(self, count: int) -> list[tuple[int, int]]:
+        """
+        Splits the file into at most `count` byte ranges of roughly equal size. Every range starts at the beginning of a
+        line, so that each of them can be read independently with `read_range()`.
+        """
+        if '\n'.encode(self.encoding) != b'\n':
+            raise ValueError(f'Cannot split a file with encoding {self.encoding} at line boundaries.')
+
+        text_path = self.text_path
+        if detect_compression(text_path) is not None:
+            raise ValueError(f'Cannot split compressed file {text_path} at line boundaries.')
+        size = text_path.stat().st_size
+        shard_size = max(size // count, 1)
+        offsets = [0]
+        with text_path.open('rb') as f:
+            while offsets[-1] + shard_size < size:
+                f.seek(offsets[-1] + shard_size)
+                f.readline()
+                if f.tell() >= size:
+                    break
+                offsets.append(f.tell())
+
+        offsets.append(size)
+        return list(zip(offsets[:-1], offsets[1:]))
+
+    def read_range(self, start: int, end: int) -> Iterator[NovelData]:
+        """
+        Reads the lines within the byte range [start, end), which should be generated by `shards()`. Line numbers are
+        counted from the beginning of the range.
+        """
+        text_path = self.text_path
+        with text_path.open('rb') as f:
+            f.seek(start)
+            buffer = f.read(end - start)
+
+        yield from self._to_data(self.__decode(buffer), text_path)
+
+    def read_lines(self, first: int, last: int | None = None) -> Iterator[NovelData]:
+        """
+        Reads the lines from `first` to `last` (inclusive, defaults to the end), numbered from 1 as in `read()`. Only
+        the bytes of these lines are read, located with a `LineIndex`, which is saved if `line_index` is set.
+        Newlines are merged from the first line of the range.
+        """
+        text_path = self.text_path
+        start, end = LineIndex.open(text_path, self.encoding, self.line_index).byte_range(first, last)
+        with text_path.open('rb') as f:
+            f.seek(start)
+            buffer = f.read(end - start)
+
+        yield from self._to_data(self.__decode(buffer), text_path, first)
+
+    def __decode(self, buffer: bytes) -> Iterable[str]:
+        if self.max_line_length:
+            return _blocks(io.TextIOWrapper(io.BytesIO(buffer), self.encoding))
+        return split_lines(buffer, self.encoding)
+
+    def __mmap_lines(self, text_path: Path) -> Iterator[str]:
+        with text_path.open('rb') as f:
+            # Empty files cannot be mapped.
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                yield from split_lines(buffer, self.encoding)
+
+    def add_reflow_boundaries(self, patterns: Iterable[Pattern]):
+        """Adds regexes of lines that are never joined when reflowing, such as the titles."""
+        self.reflow_boundaries.extend(patterns)
+
+    def add_reflow_boundary_lines(self, line_nums: Iterable[int], contents: Iterable[str] = ()):
+        """
+        Adds the line numbers and the exact contents (without the leading and trailing whitespace) of lines that are
+        never joined when reflowing, such as the titles in a list.
+        """
+        self.reflow_boundary_lines.update(line_nums)
+        self.reflow_boundary_contents.update(contents)
+
+    def _to_data(self, lines: Iterable[str], text_path: Path, first_line: int = 1,
+                 locator: Pattern | None = None) -> Iterator[NovelData]:
+        """
+        Creates the data from the lines. If `max_line_length` or `locator` is set, `lines` can be any blocks of the text
+        instead, as long as the lines are separated by newline characters. If `locator` is set, only the first line and
+        the lines it matches are used.
+        """
+        context = FileContext(text_path, self.encoding) if self.verbose else None
+        merge_newlines = self.merge_newlines
+        prev_newline = False
+        if locator is not None:
+            numbered_lines = self.__scan(lines, locator, first_line)
+        elif self.reflow:
+            numbered_lines = self.__reflow(lines, first_line)
+        elif self.max_line_length:
+            numbered_lines = self.__chunk(lines, first_line)
+        else:
+            numbered_lines = enumerate(lines, first_line)
+        for line_num, line in numbered_lines:
+            # If there is no leading whitespace, content and raw will be the same string object.
+            raw = line.rstrip()
+            content = raw.lstrip()
+            if content == '' and merge_newlines:
+                prev_newline = not prev_newline
+                if prev_newline:
+                    continue
+            else:
+                prev_newline = False
+
+            yield SourceLine(content, context, line_num, raw) if context else NovelData(content)
+
+    @staticmethod
+    def __scan(blocks: Iterable[str], locator: Pattern, first_line: int) -> Iterator[tuple[int, str]]:
+        """
+        Yields the first line and the located lines with their line number. Only the unfinished last line of a block is
+        carried to the next one.
+        """
+        line_num = first_line
+        carry = ''
+        include_first = True
+        for block in blocks:
+            text = carry + block
+            end = text.rfind('\n') + 1
+            if end == 0:
+                carry = text
+                continue
+
+            yield from _locate(text, end, locator, line_num, include_first)
+            include_first = False
+            line_num += text.count('\n', 0, end)
+            carry = text[end:]
+
+        if carry:
+            yield from _locate(carry, len(carry), locator, line_num, include_first)
+
+    def __chunk(self, blocks: Iterable[str], first_line: int) -> Iterator[tuple[int, str]]:
+        """
+        Splits the blocks of text into lines, and the long lines into pieces, yielded with their line number. Only the
+        unfinished tail of a line, which is never longer than `max_line_length`, is carried to the next block.
+        """
+        line_num = first_line
+        tail = ''
+        for block in blocks:
+            lines = block.split('\n')
+            lines[0] = tail + lines[0]
+            tail = lines.pop()
+            for line in lines:
+                for piece in self.__split_line(line):
+                    yield line_num, piece
                 line_num += 1
-                content = line.strip()
-                if content == '' and self.merge_newlines:
-                    prev_newline = not prev_newline
-                    if prev_newline:
-                        continue
-                else:
-                    prev_newline = False
-
-                args = {'source': text_path, 'line_num': line_num, 'raw': line.rstrip()} if self.verbose else {}
-                yield NovelData(content, **args)
+
+            if len(tail) > self.max_line_length:
+                *pieces, tail = self.__split_line(tail)
+                for piece in pieces:
+                    yield line_num, piece
+
+        if tail:
+            for piece in self.__split_line(tail):
+                yield line_num, piece
+
+    def __split_line(self, line: str) -> list[str]:
+        """Splits the line into pieces of at most `max_line_length` characters, cut after punctuation if possible."""
+        max_length = self.max_line_length
+        pieces = []
+        start = 0
+        while len(line) - start > max_length:
+            end = start + max_length
+            cut = max(line.rfind(char, start, end) for char in self.chunk_punctuation)
+            # Keep the closing quotes with the sentence.
+            cut = cut + 1 if cut >= start else end
+            while cut < end and line[cut] in _closing_quotes:
+                cut += 1
+            pieces.append(line[start:cut])
+            start = cut
+
+        pieces.append(line[start:])
+        return pieces
+
+    def __reflow(self, lines: Iterable[str], first_line: int) -> Iterator[tuple[int, str]]:
+        """Joins the wrapped lines of each paragraph, and yields the paragraphs with the number of their first line."""
+        width = self.reflow_width
+        punctuation = self.reflow_punctuation
+        indent = self.reflow_indent
+        boundaries = self.reflow_boundaries
+        boundary_lines = self.reflow_boundary_lines
+        boundary_contents = self.reflow_boundary_contents
+        has_boundaries = bool(boundaries or boundary_lines or boundary_contents)
+
+        def is_boundary(line_num: int, content: str) -> bool:
+            return line_num in boundary_lines or content in boundary_contents or \
+                any(boundary.match(content) for boundary in boundaries)
+
+        paragraph: list[str] = []
+        paragraph_num = first_line
+        # Whether the next line can be joined to the paragraph.
+        open_ended = False
+        for line_num, line in enumerate(lines, first_line):
+            raw = line.rstrip()
+            content = raw.lstrip()
+            if open_ended and content and not (indent and len(content) != len(raw)) and \
+                    not is_boundary(line_num, content):
+                prev = paragraph[-1]
+                paragraph.append(content if _is_wide(prev[-1]) or _is_wide(content[0]) else ' ' + content)
+            else:
+                if paragraph:
+                    yield paragraph_num, ''.join(paragraph)
+                paragraph = [raw]
+                paragraph_num = line_num
+                if content and has_boundaries and is_boundary(line_num, content):
+                    open_ended = False
+                    continue
+
+            open_ended = content != '' and not content.endswith(punctuation) and len(content) >= width
+
+        if paragraph:
+            yield paragraph_num, ''.join(paragraph)
+
+
+BLOCK_SIZE = 1 << 20
+_closing_quotes = '”’」』）)"\''
+
+
+def _blocks(f: TextIO) -> Iterator[str]:
+    """Reads the text stream in blocks of `BLOCK_SIZE` characters."""
+    return iter(partial(f.read, BLOCK_SIZE), '')
+
+
+def split_lines(buffer, encoding: str, block_size: int = BLOCK_SIZE) -> Iterator[str]:
+    """
+    Decodes a bytes-like buffer in blocks and splits it into lines the same way as a file opened in text mode, i.e.,
+    with universal newlines, but without the line endings. If the encoding keeps `\n` as a single byte, the blocks are
+    cut right after a newline, so that hardly any line has to be stitched across two blocks.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    ascii_newline = '\n'.encode(encoding) == b'\n'
+    size = len(buffer)
+    start = 0
+    carry = ''
+    while start < size:
+        end = min(start + block_size, size)
+        if ascii_newline and end < size:
+            newline = buffer.rfind(b'\n', start, end)
+            if newline >= 0:
+                end = newline + 1
+
+        final = end == size
+        text = carry + decoder.decode(buffer[start:end], final)
+        start = end
+        # A trailing \r might be the first half of \r\n.
+        held = ''
+        if not final and text.endswith('\r'):
+            text = text[:-1]
+            held = '\r'
+
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        lines = text.split('\n')
+        carry = lines.pop() + held
+        yield from lines
+
+    if carry:
+        yield carry
+
+
+def _locate(text: str, end: int, locator: Pattern, line_num: int, include_first: bool) -> Iterator[tuple[int, str]]:
+    """
+    Yields the lines within `text[:end]` that start where the locator matches, and the first line if `include_first`
+    is set, with their line number. `line_num` is the number of the first line.
+    """
+    if include_first:
+        line_end = text.find('\n', 0, end)
+        yield line_num, text[:line_end if line_end >= 0 else end]
+
+    position = 0
+    for m in locator.finditer(text, 0, end):
+        start = m.start()
+        if start >= end:
+            break
+        if start == 0 and include_first:
+            continue
+
+        line_num += text.count('\n', position, start)
+        position = start
+        line_end = text.find('\n', start, end)
+        yield line_num, text[start:line_end if line_end >= 0 else end]
+
+
+def _is_wide(char: str) -> bool:
+    """Whether the character is a CJK (wide or full-width) character, which is written without spaces in between."""
+    return unicodedata.east_asian_width(char) in ('W', 'F')
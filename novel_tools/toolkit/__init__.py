@@ -1,7 +1,8 @@
-from .analyze_novel import analyze
+from .analyze_novel import analyze, analyze_async
 from .generate_docs import docgen
 
 __all__ = [
     analyze,
+    analyze_async,
     docgen
 ]
@@ -1,10 +1,21 @@
+import asyncio
+from concurrent.futures import Executor
 from pathlib import Path
-from novel_tools.framework import Worker
+from novel_tools.framework import Worker, PipelinedWorker, Profiler, Reader, Processor, Writer, AsyncWorker, \
+    ThreadedReader, ThreadedWriter
 from novel_tools.processors.matchers.__aggregate_matcher__ import AggregateMatcher
+from novel_tools.processors.matchers.__list_matcher__ import ListMatcher
+from novel_tools.processors.matchers.numbered_matcher import NumberedMatcher
+from novel_tools.processors.matchers.special_matcher import SpecialMatcher
+from novel_tools.readers.text_reader import TextReader
 from novel_tools.utils import create_workflow, Stage
+from .sharding import analyze_sharded
+from .scanning import analyze_scanned
 
 
-def analyze(config: dict, *, filename: Path | None = None, in_dir: Path | None = None, out_dir: Path | None = None):
+def analyze(config: dict, *, filename: Path | None = None, in_dir: Path | None = None, out_dir: Path | None = None,
+            batch_size: int = 1, pipelined: bool = False, queue_size: int = 16, processes: int | None = None,
+            profiler: Profiler | None = None, compiled: bool = False, scan: bool = False):
     """
     Invokes a Worker instance to analyze the novel.
 
@@ -38,7 +49,77 @@ def analyze(config: dict, *, filename: Path | None = None, in_dir: Path | None =
         in_dir: The input directory holding the novel and/or structure files. If it is not specified, it will use the
                 directory of the input file.
         out_dir: The output directory. Defaults to in_dir.
+        batch_size: The number of lines the Worker pulls from a reader at a time. Larger batches reduce the per-line
+                    call overhead of the processors and writers. Defaults to 1, i.e., one line at a time.
+        pipelined: If set to True, reading, processing and writing will run on separate threads, so that file I/O
+                   overlaps with processing. The output is identical to the sequential run. It is advised to use a
+                   larger batch_size with this option.
+        queue_size: The maximum number of batches waiting between two pipelined stages.
+        processes: If specified, the text file will be split into shards at line boundaries, and the matchers will run
+                   on the shards in this many processes. Only the matched titles are merged back and passed to the
+                   validators, transformers and writers, so this only supports workflows like `struct`: a single
+                   TextReader, NumberedMatchers and SpecialMatchers, TitleTransformers that only format titles, and
+                   writers that only write titles (CsvWriter and TocWriter). The output is identical to the serial
+                   run.
+        profiler: If specified, the timing and counters of every stage will be recorded into the profiler.
+        compiled: If set to True, the matchers, validators and transformers will be compiled into a single specialized
+                  function, which saves the overhead of calling every processor generically. The regexes of consecutive
+                  NumberedMatchers and SpecialMatchers are also fused into one, so that every line is matched only
+                  once. The output is identical. Ignored when using `processes`.
+        scan: If set to True, the lines that might be titles are located in whole blocks of the text, judging from the
+              literal prefixes of the matchers, and only these lines are matched. Like `processes`, this only supports
+              workflows like `struct`, and the output is identical. It cannot be used with `processes`, and the
+              TextReader cannot use reflow, max_line_length or merge_newlines.
     """
+    additional_args = _additional_args(filename, in_dir, out_dir)
+    if scan:
+        if processes is not None:
+            raise ValueError('scan and processes cannot be used together.')
+        analyze_scanned(config, additional_args, batch_size, profiler)
+        return
+
+    if processes is not None:
+        analyze_sharded(config, additional_args, processes, batch_size, profiler)
+        return
+
+    readers, processors, writers = _create_stages(config, additional_args, compiled)
+    if pipelined:
+        worker = PipelinedWorker(readers, processors, writers, batch_size, queue_size, profiler, compiled)
+    else:
+        worker = Worker(readers, processors, writers, batch_size, profiler, compiled)
+    worker.execute()
+
+
+async def analyze_async(config: dict, *, filename: Path | None = None, in_dir: Path | None = None,
+                        out_dir: Path | None = None, batch_size: int = 64, compiled: bool = False,
+                        executor: Executor | None = None, io_executor: Executor | None = None):
+    """
+    The asyncio version of `analyze()`, for use in async applications. The output is the same.
+
+    Args:
+        config: The configuration for the Worker instance.
+        filename: The novel's filename. See `analyze()`.
+        in_dir: The input directory holding the novel and/or structure files. See `analyze()`.
+        out_dir: The output directory. Defaults to in_dir.
+        batch_size: The number of lines that are read, processed and written at a time. Every batch of file I/O is a
+                    round trip to the thread pool, so this should not be too small.
+        compiled: See `analyze()`.
+        executor: If specified, the processors will run on this executor instead of the event loop, so that the loop is
+                  not blocked while they are busy. It must run them in this process, e.g., a ThreadPoolExecutor.
+        io_executor: The executor for the file I/O of the readers and writers. Defaults to the default executor of the
+                     event loop.
+    """
+    additional_args = _additional_args(filename, in_dir, out_dir)
+    loop = asyncio.get_running_loop()
+    # Creating the stages might read files as well, e.g., the templates of EpubWriter.
+    readers, processors, writers = await loop.run_in_executor(io_executor, _create_stages, config, additional_args,
+                                                              compiled)
+    readers = [ThreadedReader(reader, io_executor, batch_size) for reader in readers]
+    writers = [ThreadedWriter(writer, io_executor) for writer in writers]
+    await AsyncWorker(readers, processors, writers, batch_size, compiled, executor).execute()
+
+
+def _additional_args(filename: Path | None, in_dir: Path | None, out_dir: Path | None) -> dict:
     if filename is None and in_dir is None:
         raise ValueError('Either filename or in_dir needs to be specified.')
 
@@ -53,8 +134,24 @@ def analyze(config: dict, *, filename: Path | None = None, in_dir: Path | None =
     if filename:
         additional_args['text_filename'] = str(filename)
 
+    return additional_args
+
+
+def _create_stages(config: dict, additional_args: dict,
+                   compiled: bool = False) -> tuple[list[Reader], list[Processor], list[Writer]]:
     workflow = create_workflow(config, additional_args)
-    matcher = AggregateMatcher(workflow.get(Stage.matchers) or [])
-    processors = [matcher] + (workflow.get(Stage.validators) or []) + (workflow.get(Stage.transformers) or [])
-    worker = Worker(workflow.get(Stage.readers), processors, workflow.get(Stage.writers))
-    worker.execute()
+    matchers = workflow.get(Stage.matchers) or []
+    processors = [AggregateMatcher(matchers, fused=compiled)] + (workflow.get(Stage.validators) or []) + \
+                 (workflow.get(Stage.transformers) or [])
+    readers = workflow.get(Stage.readers)
+    # Titles must never be joined into a paragraph when the text is reflowed.
+    title_regexes = [stage.regex for stage in matchers if isinstance(stage, (NumberedMatcher, SpecialMatcher))]
+    list_matchers = [stage for stage in matchers if isinstance(stage, ListMatcher)]
+    for reader in readers:
+        if isinstance(reader, TextReader):
+            reader.add_reflow_boundaries(title_regexes)
+            if reader.reflow:
+                for matcher in list_matchers:
+                    reader.add_reflow_boundary_lines(*matcher.boundaries(reader.text_path))
+
+    return readers, processors, workflow.get(Stage.writers)
@@ -0,0 +1,51 @@
+from time import perf_counter
+from novel_tools.framework import NovelData, Worker, Profiler
+from novel_tools.processors.matchers.__aggregate_matcher__ import AggregateMatcher
+from novel_tools.readers.text_reader import TextReader
+from novel_tools.utils import create_workflow, Stage
+from .sharding import check_config, select_stages, TitleReader
+
+
+def scan_titles(config: dict, additional_args: dict) -> list[NovelData]:
+    """
+    Locates the lines that might be titles in whole blocks of the text, judging from the literal prefixes of the
+    matchers, and runs the matchers on these lines only. Returns the matched titles in order.
+    """
+    workflow = create_workflow(select_stages(config, [Stage.readers, Stage.matchers]), additional_args)
+    reader: TextReader = workflow[Stage.readers][0]
+    matcher = AggregateMatcher(workflow[Stage.matchers], fused=True)
+
+    titles = []
+    for i, data in enumerate(reader.scan(matcher.locator())):
+        new_data = matcher.process(data)
+        # The first line of the book is kept regardless, as TypeTransformer treats it as the book title.
+        if new_data is not data or i == 0:
+            titles.append(new_data)
+
+    return titles
+
+
+def analyze_scanned(config: dict, additional_args: dict, batch_size: int = 1, profiler: Profiler | None = None):
+    """
+    Runs the workflow with the matchers applied to the located lines only, see `scan_titles()`. As in the sharded run,
+    the validators, transformers and writers then run on the titles only, so the same workflows are supported.
+    """
+    check_config(config, 'Scanning')
+    reader_config = config[Stage.readers.value][0]
+    if reader_config.get('max_line_length', 0):
+        raise ValueError('Scanning does not support max_line_length.')
+
+    start = perf_counter()
+    titles = scan_titles(config, additional_args)
+    if profiler is not None:
+        # The text is scanned in blocks instead of lines, so it can only be recorded as a whole.
+        stats = profiler.add('Scan', 'reader')
+        stats.calls = 1
+        stats.items_out = len(titles)
+        stats.time = perf_counter() - start
+
+    workflow = create_workflow(select_stages(config, [Stage.validators, Stage.transformers, Stage.writers]),
+                               additional_args)
+    processors = workflow[Stage.validators] + workflow[Stage.transformers]
+    worker = Worker([TitleReader(titles)], processors, workflow[Stage.writers], batch_size, profiler)
+    worker.execute()
@@ -0,0 +1,133 @@
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import Iterator
+from novel_tools.framework import NovelData, Reader, Worker, Profiler
+from novel_tools.processors.matchers.__aggregate_matcher__ import AggregateMatcher
+from novel_tools.readers.text_reader import TextReader
+from novel_tools.utils import create_workflow, Stage
+
+# Stages that can be used in the sharded run. Matchers must be stateless to run on independent shards, and writers
+# must only consume titles, since content lines never leave the worker processes.
+shardable_matchers = {'NumberedMatcher', 'SpecialMatcher'}
+shardable_writers = {'CsvWriter', 'TocWriter'}
+# Transformers must give the titles the same result without seeing the other lines. TitleTransformer is only supported
+# if every unit formats titles, as the other lines it formats would be written by CsvWriter as well.
+shardable_transformers = {'TypeTransformer', 'TitleTransformer', 'PathTransformer', 'OrderTransformer',
+                          'PatternTransformer'}
+title_types = {'book_title', 'volume_title', 'chapter_title'}
+
+# Per-process state of the worker processes, created once by `_init_worker()`.
+_reader: TextReader | None = None
+_matcher: AggregateMatcher | None = None
+
+
+def check_config(config: dict, mode: str = 'Sharded analysis'):
+    """
+    Raises a ValueError if the config cannot be run in shards, or in another mode that only passes the titles to the
+    validators, transformers and writers, e.g., scanning. `mode` is the name of the mode in the error messages.
+    """
+    readers = config.get(Stage.readers.value) or []
+    if len(readers) != 1 or readers[0]['class'] != 'TextReader':
+        raise ValueError(f'{mode} requires exactly one TextReader.')
+    if readers[0].get('merge_newlines', False):
+        raise ValueError(f'{mode} does not support merge_newlines.')
+    if readers[0].get('reflow', False):
+        raise ValueError(f'{mode} does not support reflow.')
+
+    for matcher in config.get(Stage.matchers.value) or []:
+        if matcher['class'] not in shardable_matchers:
+            raise ValueError(f'{mode} does not support {matcher["class"]}.')
+
+    for transformer in config.get(Stage.transformers.value) or []:
+        if transformer['class'] not in shardable_transformers:
+            raise ValueError(f'{mode} does not support {transformer["class"]}.')
+        if transformer['class'] == 'TitleTransformer' and \
+                any(unit['filter'].get('type', '').lower() not in title_types for unit in transformer['units']):
+            raise ValueError(f'{mode} only supports TitleTransformer units that filter on a title type.')
+
+    for writer in config.get(Stage.writers.value) or []:
+        if writer['class'] not in shardable_writers:
+            raise ValueError(f'{mode} does not support {writer["class"]}.')
+
+
+def select_stages(config: dict, stages: list[Stage]) -> dict:
+    return {stage.value: config.get(stage.value) or [] for stage in stages}
+
+
+class TitleReader(Reader):
+    """Replays the merged title stream of the shards."""
+
+    def __init__(self, titles: list[NovelData]):
+        self.titles = titles
+
+    def read(self) -> Iterator[NovelData]:
+        yield from self.titles
+
+
+def _init_worker(config: dict, additional_args: dict):
+    global _reader, _matcher
+    workflow = create_workflow(select_stages(config, [Stage.readers, Stage.matchers]), additional_args)
+    _reader = workflow[Stage.readers][0]
+    _matcher = AggregateMatcher(workflow[Stage.matchers])
+
+
+def _match_shard(shard: tuple[int, int]) -> tuple[int, list[NovelData]]:
+    """Returns the number of lines in the shard, and the matched titles in order."""
+    start, _ = shard
+    titles = []
+    count = 0
+    for i, data in enumerate(_reader.read_range(*shard)):
+        new_data = _matcher.process(data)
+        # The first line of the book is kept regardless, as TypeTransformer treats it as the book title.
+        if new_data is not data or (start == 0 and i == 0):
+            titles.append(new_data)
+        # With max_line_length, the pieces of a long line share its line number, so the lines are counted by the line
+        # numbers. Without line numbers, there is nothing to shift, and every piece is counted as a line.
+        count = data.get('line_num') if data.has('line_num') else count + 1
+
+    return count, titles
+
+
+def match_titles(config: dict, additional_args: dict, processes: int) -> list[NovelData]:
+    """
+    Splits the text file into shards at line boundaries, runs the matchers of every shard in a process pool, and
+    merges the matched titles back in order. Line numbers are shifted so that they are relative to the whole file.
+    """
+    reader: TextReader = create_workflow(select_stages(config, [Stage.readers]), additional_args)[Stage.readers][0]
+    # Use more shards than processes, so that the work stays balanced if the titles are unevenly distributed.
+    shards = reader.shards(processes * 4)
+
+    titles = []
+    offset = 0
+    with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(config, additional_args)) as executor:
+        for count, shard_titles in executor.map(_match_shard, shards):
+            for title in shard_titles:
+                if title.has('line_num'):
+                    title.set(line_num=title.get('line_num') + offset)
+                titles.append(title)
+            offset += count
+
+    return titles
+
+
+def analyze_sharded(config: dict, additional_args: dict, processes: int, batch_size: int = 1,
+                    profiler: Profiler | None = None):
+    """
+    Runs the workflow with the matchers applied to the shards in parallel. Stateful processors (validators and
+    transformers) and the writers then run on the merged title stream only, which is much smaller than the book.
+    """
+    check_config(config)
+    start = perf_counter()
+    titles = match_titles(config, additional_args, processes)
+    if profiler is not None:
+        # The shards are read and matched in other processes, so they can only be recorded as a whole.
+        stats = profiler.add(f'Shards ({processes} processes)', 'reader')
+        stats.calls = 1
+        stats.items_out = len(titles)
+        stats.time = perf_counter() - start
+
+    workflow = create_workflow(select_stages(config, [Stage.validators, Stage.transformers, Stage.writers]),
+                               additional_args)
+    processors = workflow[Stage.validators] + workflow[Stage.transformers]
+    worker = Worker([TitleReader(titles)], processors, workflow[Stage.writers], batch_size, profiler)
+    worker.execute()
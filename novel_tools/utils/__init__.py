@@ -1,5 +1,9 @@
 from .helpers import to_num, purify_name, format_text
 from .scan_stages import Stage, get_config, create_workflow, get_all_classes
+from .line_index import LineIndex
+from .compression import detect_compression, strip_compression, open_text, decompress_stream
+from .archive import Archive
+from .patterns import has_group_references, literal_prefixes, length_range, prefilter, line_locator
 
 __all__ = [
     to_num,
@@ -8,5 +12,16 @@ __all__ = [
     Stage,
     get_config,
     create_workflow,
-    get_all_classes
+    get_all_classes,
+    LineIndex,
+    detect_compression,
+    strip_compression,
+    open_text,
+    decompress_stream,
+    Archive,
+    has_group_references,
+    literal_prefixes,
+    length_range,
+    prefilter,
+    line_locator
 ]
@@ -0,0 +1,70 @@
+import tarfile
+import zipfile
+from pathlib import Path, PurePosixPath
+from threading import Lock
+
+
+class Archive:
+    """
+    A read-only view of a zip or tar archive as a directory tree. If everything in the archive is inside a single
+    top-level directory, as is the case when a directory is archived as a whole, that directory is treated as the root.
+    Paths are relative to the root.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        if zipfile.is_zipfile(path):
+            self.zip = zipfile.ZipFile(path)
+            self.tar = None
+            names = [info.filename for info in self.zip.infolist() if not info.is_dir()]
+        elif tarfile.is_tarfile(path):
+            self.zip = None
+            self.tar = tarfile.open(path)
+            names = [member.name for member in self.tar.getmembers() if member.isfile()]
+        else:
+            raise ValueError(f'{path} is not a zip or tar archive.')
+
+        # Tar members cannot be read concurrently, so reads are serialized.
+        self.lock = Lock()
+        # Tar member names might start with `./`, which is normalized away.
+        files = {PurePosixPath(name): name for name in names}
+        tops = {file.parts[0] for file in files}
+        self.root = PurePosixPath(tops.pop()) if len(tops) == 1 and all(len(file.parts) > 1 for file in files) \
+            else PurePosixPath()
+
+        # file: name in the archive
+        self.members: dict[PurePosixPath, str] = {}
+        # directory: names of the children
+        self.children: dict[PurePosixPath, list[str]] = {PurePosixPath(): []}
+        for file, name in files.items():
+            relative = file.relative_to(self.root)
+            self.members[relative] = name
+            for parent, child in zip(relative.parents, (relative, *relative.parents)):
+                if parent in self.children:
+                    self.children[parent].append(child.name)
+                    break
+                self.children[parent] = [child.name]
+
+    def is_dir(self, path: PurePosixPath) -> bool:
+        return path in self.children
+
+    def is_file(self, path: PurePosixPath) -> bool:
+        return path in self.members
+
+    def iterdir(self, path: PurePosixPath) -> list[str]:
+        """Returns the names of the files and directories directly under the directory."""
+        return self.children[path]
+
+    def read_bytes(self, path: PurePosixPath) -> bytes:
+        with self.lock:
+            name = self.members[path]
+            if self.zip is not None:
+                return self.zip.read(name)
+            with self.tar.extractfile(name) as f:
+                return f.read()
+
+    def close(self):
+        if self.zip is not None:
+            self.zip.close()
+        else:
+            self.tar.close()
@@ -0,0 +1,101 @@
+import bz2
+import gzip
+import io
+import lzma
+from pathlib import Path
+from typing import BinaryIO, Callable, TextIO
+
+# compression: (extensions, magic bytes)
+compressions = {
+    'gzip': (('.gz',), b'\x1f\x8b'),
+    'xz': (('.xz', '.lzma'), b'\xfd7zXZ\x00'),
+    'bz2': (('.bz2',), b'BZh'),
+    'zstd': (('.zst', '.zstd'), b'\x28\xb5\x2f\xfd'),
+}
+_extensions = {extension: compression for compression, (extensions, _) in compressions.items()
+               for extension in extensions}
+# Files with these extensions are trusted to be plain text, and are not sniffed for magic bytes.
+_text_extensions = {'.txt', '.md', '.csv', '.json'}
+_magic_size = max(len(magic) for _, magic in compressions.values())
+
+
+def strip_compression(name: str) -> str:
+    """Removes the compression extension from the filename, e.g., `chapter.txt.gz` becomes `chapter.txt`."""
+    stem, dot, extension = name.rpartition('.')
+    return stem if dot and f'.{extension}'.lower() in _extensions else name
+
+
+def detect_compression(path: Path) -> str | None:
+    """
+    Returns the compression of the file, or None if it is not compressed. The extension is checked first, and if it is
+    neither a compression nor a plain text extension, the first bytes of the file are sniffed instead.
+    """
+    suffix = path.suffix.lower()
+    if suffix in _extensions:
+        return _extensions[suffix]
+    if suffix in _text_extensions:
+        return None
+
+    with path.open('rb') as f:
+        return _match_magic(f.read(_magic_size))
+
+
+def open_text(path: Path, encoding: str = 'utf-8', newline: str | None = None) -> TextIO:
+    """Opens the file for reading in text mode, decompressing it on the fly if it is compressed."""
+    compression = detect_compression(path)
+    if compression is None:
+        return path.open('rt', encoding=encoding, newline=newline)
+
+    return _opener(compression)(path, 'rt', encoding=encoding, newline=newline)
+
+
+def decompress_stream(f: BinaryIO, name: str) -> BinaryIO:
+    """
+    Wraps a binary stream with a decompressor if it is compressed, judging from `name` and the first bytes of the
+    stream. Closing the returned stream does not close `f`.
+    """
+    suffix = Path(name).suffix.lower()
+    compression = _extensions.get(suffix)
+    if compression is None and suffix not in _text_extensions:
+        if hasattr(f, 'peek'):
+            head = f.peek(_magic_size)[:_magic_size]
+        else:
+            position = f.tell()
+            head = f.read(_magic_size)
+            f.seek(position)
+        compression = _match_magic(head)
+
+    if compression is None:
+        return f
+
+    return _opener(compression)(f, 'rb')
+
+
+def _match_magic(head: bytes) -> str | None:
+    for compression, (_, magic) in compressions.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def _opener(compression: str) -> Callable[..., io.IOBase]:
+    if compression == 'gzip':
+        return gzip.open
+    if compression == 'xz':
+        return lzma.open
+    if compression == 'bz2':
+        return bz2.open
+
+    # Zstandard is only in the standard library from Python 3.14.
+    try:
+        from compression import zstd
+        return zstd.open
+    except ImportError:
+        pass
+
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError('Reading Zstandard-compressed files requires the zstandard package. Install it with '
+                         '`pip install zstandard`.')
+    return zstandard.open
@@ -1,50 +1,144 @@
+import re
+import unicodedata
+from functools import lru_cache
 from textwrap import dedent
 
-num_dict = {
-    "零": 0,
-    "〇": 0,
-    "一": 1,
-    "二": 2,
-    "两": 2,
-    "三": 3,
-    "四": 4,
-    "五": 5,
-    "六": 6,
-    "七": 7,
-    "八": 8,
-    "九": 9,
-    "十": 10,
-    "廿": 20,
-    "卅": 30,
-    "卌": 40,
-    "百": 100,
-    "千": 1000
-}
+# The digits in Chinese and Japanese, including the financial forms. Decimal digits in any script, e.g., full-width
+# ones, are also digits.
+digits = dict.fromkeys('零〇', 0) | dict.fromkeys('一壹壱弌幺', 1) | dict.fromkeys('二贰貳弐弍两兩', 2) | \
+    dict.fromkeys('三叁參参弎', 3) | dict.fromkeys('四肆', 4) | dict.fromkeys('五伍', 5) | dict.fromkeys('六陆陸', 6) | \
+    dict.fromkeys('七柒漆', 7) | dict.fromkeys('八捌', 8) | dict.fromkeys('九玖', 9)
+# Units that multiply the digits before them within a section of 4 digits.
+small_units = dict.fromkeys('十拾', 10) | dict.fromkeys('百佰', 100) | dict.fromkeys('千仟', 1000)
+# Units that multiply the whole section before them.
+large_units = dict.fromkeys('万萬', 10 ** 4) | dict.fromkeys('亿億', 10 ** 8) | {'兆': 10 ** 12}
+# Tens with a single character.
+tens = {'廿': 20, '卅': 30, '卌': 40}
+
+roman_values = {'I': 1, 'V': 5, 'X': 10, 'L': 50, 'C': 100, 'D': 500, 'M': 1000}
+roman_regex = re.compile('M{0,3}(CM|CD|D?C{0,3})(XC|XL|L?X{0,3})(IX|IV|V?I{0,3})')
 
 valid_filenames = dict((ord(char), None) for char in '\\/*?:"<>|\n')
 
 
 def to_num(num: str) -> int:
     """
-    Converts a chinese string to a number.
+    Converts a number to an int. The number can be in Arabic numerals in any script, e.g., full-width ones, in Chinese
+    or Japanese numerals, including the financial forms and the mix with Arabic numerals like "1百", or in Roman
+    numerals. Raises a ValueError if it is not a number.
+
+    For Chinese numerals, a single digit after the last unit is one unit lower, as in "三千五" (3500), unless there
+    is a zero before it, as in "三千零五" (3005). Digits without units are positional, as in "二〇二三" (2023).
     """
-    num = num.strip()
-    try:
-        value = 0
-        digit = 1
-
-        for i in range(len(num)):
-            v = num_dict[num[i]]
-            if v >= 10:
-                digit *= v
-                value += digit
-            elif i == len(num) - 1:
-                value += v
+    value = _to_num(num.strip())
+    if value is None:
+        raise ValueError(f'Not a number: {num}')
+    return value
+
+
+@lru_cache(maxsize=4096)
+def _to_num(num: str) -> int | None:
+    # Titles are matched again and again with the same indices, so the results are cached, including the failures.
+    if num.isdecimal():
+        return int(num)
+
+    value = _chinese_to_num(num)
+    if value is None:
+        value = _roman_to_num(num)
+    if value is None:
+        try:
+            # Signs and underscores, as before.
+            value = int(num)
+        except ValueError:
+            return None
+    return value
+
+
+def _chinese_to_num(num: str) -> int | None:
+    if not num:
+        return None
+
+    total = 0  # The sections that have been multiplied by a large unit
+    scale = 0  # The unit that the last section has been multiplied by, e.g., 10 ** 12 for "万亿"
+    large_unit = 0  # The last large unit
+    section = 0  # The sum within the current section, below any large unit
+    small_unit = 0  # The last small unit within the current section
+    number = None  # The digits since the last unit
+    count = 0  # The number of digits since the last unit
+    unit = 0  # The unit right before the digits, if any
+    for char in num:
+        digit = digits.get(char)
+        if digit is None and char.isdecimal():
+            digit = unicodedata.decimal(char)
+        if digit is not None:
+            number = digit if number is None else number * 10 + digit
+            count += 1
+            continue
+
+        if char in small_units or char in tens:
+            value = small_units.get(char, 10)
+            # The small units decrease within a section, and each of them multiplies a single digit.
+            if small_unit and value >= small_unit or number is not None and number >= 10:
+                return None
+            if char in tens:
+                if number is not None:
+                    return None
+                section += tens[char]
+            elif number is None:
+                # A unit without a digit, as in "十五", can only start a section.
+                if section != 0:
+                    return None
+                section += value
+            else:
+                # A zero only marks a gap, as in "一千零十".
+                section += (number or 1) * value
+            small_unit = value
+            unit = value
+        elif char in large_units:
+            value = large_units[char]
+            block = section + (number or 0)
+            if number is None and section == 0 and total == 0:  # e.g., "万" alone
+                block = 1
+            if block == 0:
+                # Right after another large unit, which is multiplied, as in "万亿".
+                if number is not None or value <= large_unit:
+                    return None
+                total *= value
+                scale *= value
             else:
-                digit = v
-    except KeyError:
-        value = int(num)
+                # The large units decrease, as in "一亿五千万".
+                if scale and value >= scale:
+                    return None
+                total += block * value
+                scale = value
+            large_unit = value
+            section = 0
+            small_unit = 0
+            unit = value
+        else:
+            return None
+        number = None
+        count = 0
+
+    if number is not None and count == 1 and unit >= 100:
+        number *= unit // 10
+    return total + section + (number or 0)
+
+
+def _roman_to_num(num: str) -> int | None:
+    # Compatibility forms like "Ⅻ" are decomposed into letters.
+    num = unicodedata.normalize('NFKC', num)
+    if num.islower():
+        num = num.upper()
+    if not num or not roman_regex.fullmatch(num):
+        return None
 
+    value = 0
+    for i, char in enumerate(num):
+        if i + 1 < len(num) and roman_values[char] < roman_values[num[i + 1]]:
+            value -= roman_values[char]
+        else:
+            value += roman_values[char]
     return value
 
 
@@ -0,0 +1,138 @@
+import hashlib
+import mmap
+import re
+import struct
+import sys
+from array import array
+from pathlib import Path
+from .compression import detect_compression
+
+_magic = b'NTLI'
+_version = 1
+# magic, version, file size, mtime (ns), digest, number of offsets
+_header = struct.Struct('<4sHQq16sQ')
+_sample_size = 1 << 16
+_newline = re.compile(rb'\r\n?|\n')
+
+
+class LineIndex:
+    """
+    The byte offsets of every line in a text file, so that any line or line range can be read by seeking instead of
+    scanning from the beginning. Lines are split the same way as a file opened in text mode, i.e., with universal
+    newlines, and numbered from 1.
+
+    The index can be saved next to the text file as `<filename>.idx`. It is keyed by the size, the modification time
+    and a hash of the beginning and the end of the text file, and will be rebuilt if any of them changes.
+    """
+
+    def __init__(self, offsets: array, size: int, mtime_ns: int, digest: bytes):
+        # offsets[i] is where line i + 1 starts; the last one is the file size.
+        self.offsets = offsets
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.digest = digest
+
+    def __len__(self):
+        """The number of lines."""
+        return len(self.offsets) - 1
+
+    def byte_range(self, first: int, last: int | None = None) -> tuple[int, int]:
+        """Returns the byte range [start, end) of the lines from `first` to `last` (inclusive, defaults to the end)."""
+        last = len(self) if last is None else min(last, len(self))
+        if first < 1 or first > last + 1:
+            raise ValueError(f'Invalid line range: {first} to {last}.')
+
+        return self.offsets[first - 1], self.offsets[last]
+
+    @staticmethod
+    def index_path(text_path: Path) -> Path:
+        return text_path.with_name(text_path.name + '.idx')
+
+    @classmethod
+    def build(cls, text_path: Path, encoding: str = 'utf-8') -> 'LineIndex':
+        """Scans the text file for line boundaries."""
+        if '\r\n'.encode(encoding) != b'\r\n':
+            raise ValueError(f'Cannot index the lines of a file with encoding {encoding}.')
+        if detect_compression(text_path) is not None:
+            raise ValueError(f'Cannot index the lines of compressed file {text_path}.')
+
+        with text_path.open('rb') as f:
+            stat = text_path.stat()
+            offsets = array('Q', [0])
+            if stat.st_size > 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    if buffer.find(b'\r') < 0:
+                        offsets.extend(m.end() for m in re.finditer(b'\n', buffer))
+                    else:
+                        offsets.extend(m.end() for m in _newline.finditer(buffer))
+
+            if offsets[-1] != stat.st_size:
+                offsets.append(stat.st_size)
+
+            return cls(offsets, stat.st_size, stat.st_mtime_ns, _digest(f, stat.st_size))
+
+    @classmethod
+    def load(cls, text_path: Path) -> 'LineIndex | None':
+        """Loads the saved index of the text file. Returns None if it does not exist or is out of date."""
+        index_path = cls.index_path(text_path)
+        if not index_path.is_file():
+            return None
+
+        with index_path.open('rb') as f:
+            header = f.read(_header.size)
+            if len(header) != _header.size:
+                return None
+            magic, version, size, mtime_ns, digest, count = _header.unpack(header)
+            if magic != _magic or version != _version:
+                return None
+
+            stat = text_path.stat()
+            if size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+                return None
+
+            offsets = array('Q')
+            try:
+                offsets.fromfile(f, count)
+            except EOFError:
+                return None
+
+        if sys.byteorder == 'big':
+            offsets.byteswap()
+
+        with text_path.open('rb') as f:
+            if _digest(f, size) != digest:
+                return None
+
+        return cls(offsets, size, mtime_ns, digest)
+
+    def save(self, text_path: Path):
+        offsets = self.offsets
+        if sys.byteorder == 'big':
+            offsets = array('Q', offsets)
+            offsets.byteswap()
+
+        with self.index_path(text_path).open('wb') as f:
+            f.write(_header.pack(_magic, _version, self.size, self.mtime_ns, self.digest, len(offsets)))
+            offsets.tofile(f)
+
+    @classmethod
+    def open(cls, text_path: Path, encoding: str = 'utf-8', save: bool = True) -> 'LineIndex':
+        """Loads the saved index of the text file, or builds one (and saves it if `save` is set) if it is unusable."""
+        index = cls.load(text_path)
+        if index is None:
+            index = cls.build(text_path, encoding)
+            if save:
+                index.save(text_path)
+
+        return index
+
+
+def _digest(f, size: int) -> bytes:
+    """Hashes the size, the first and the last 64 KiB of the file."""
+    h = hashlib.blake2b(str(size).encode(), digest_size=16)
+    f.seek(0)
+    h.update(f.read(_sample_size))
+    if size > _sample_size:
+        f.seek(max(size - _sample_size, _sample_size))
+        h.update(f.read())
+    return h.digest()
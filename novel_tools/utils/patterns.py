@@ -0,0 +1,138 @@
+import re
+import sys
+from operator import methodcaller
+from typing import Callable, Iterator, Pattern
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:  # Python 3.10
+    import sre_parse
+    import sre_constants
+
+
+def _walk(items) -> Iterator[tuple]:
+    """Yields every (op, argument) pair in a parsed pattern, including the nested ones."""
+    for op, av in items:
+        yield op, av
+        for arg in av if isinstance(av, (tuple, list)) else (av,):
+            if isinstance(arg, sre_parse.SubPattern):
+                yield from _walk(arg)
+            elif isinstance(arg, list):  # The branches of an alternation
+                for branch in arg:
+                    if isinstance(branch, sre_parse.SubPattern):
+                        yield from _walk(branch)
+
+
+def has_group_references(pattern: Pattern) -> bool:
+    """
+    Returns True if the pattern refers to its groups by number or name, i.e., backreferences or conditionals, so that
+    it cannot be embedded into a larger pattern where its groups are renumbered.
+    """
+    parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    return any(op in (sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS) for op, _ in _walk(parsed))
+
+
+# Give up on the prefixes if there are too many alternatives, as checking them would be no cheaper than the regex.
+_max_prefixes = 64
+
+
+def _prefixes(items) -> tuple[set[str], bool]:
+    """
+    Returns the literal strings that every match of the parsed items starts with, and whether every match is exactly
+    one of them, i.e., whether the prefixes of the items after these can be appended.
+    """
+    prefixes = {''}
+    for op, av in items:
+        if op == sre_constants.AT and av in (sre_constants.AT_BEGINNING, sre_constants.AT_BEGINNING_STRING):
+            continue
+
+        if op == sre_constants.LITERAL:
+            alternatives, complete = {chr(av)}, True
+        elif op == sre_constants.IN and all(item_op == sre_constants.LITERAL for item_op, _ in av):
+            alternatives, complete = {chr(char) for _, char in av}, True
+        elif op == sre_constants.SUBPATTERN and not av[1] and not av[2]:  # A group without inline flags
+            alternatives, complete = _prefixes(av[-1])
+        elif op == sre_constants.BRANCH:
+            alternatives, complete = set(), True
+            for branch in av[1]:
+                branch_prefixes, branch_complete = _prefixes(branch)
+                alternatives |= branch_prefixes
+                complete = complete and branch_complete
+        else:
+            return prefixes, False
+
+        prefixes = {prefix + alternative for prefix in prefixes for alternative in alternatives}
+        if len(prefixes) > _max_prefixes:
+            return {''}, False
+        if not complete:
+            return prefixes, False
+
+    return prefixes, True
+
+
+def literal_prefixes(pattern: Pattern) -> tuple[str, ...] | None:
+    """
+    Returns the literal strings that every match of the pattern (with `match()`) starts with, or None if there is no
+    such literal. Only literals, character sets of literals, groups and alternations are looked into, so the result
+    might be shorter than it could be, but never wrong.
+    """
+    if pattern.flags & re.IGNORECASE:
+        return None
+
+    prefixes, _ = _prefixes(sre_parse.parse(pattern.pattern, pattern.flags))
+    if '' in prefixes:
+        return None
+
+    # A prefix that starts with another prefix is redundant.
+    prefixes = sorted(prefixes)
+    return tuple(prefix for i, prefix in enumerate(prefixes) if i == 0 or not prefix.startswith(prefixes[i - 1]))
+
+
+def length_range(pattern: Pattern) -> tuple[int, int | None]:
+    """
+    Returns the minimum and maximum length of a string that the pattern can match with `match()`. The maximum is None
+    if it is unbounded, which is the case unless the pattern ends with `$` or `\\Z`.
+    """
+    parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    min_width, max_width = parsed.getwidth()
+    if max_width >= sre_constants.MAXREPEAT or not len(parsed):
+        return min_width, None
+
+    op, av = parsed[-1]
+    if op == sre_constants.AT and av == sre_constants.AT_END_STRING:
+        return min_width, max_width
+    if op == sre_constants.AT and av == sre_constants.AT_END and not pattern.flags & re.MULTILINE:
+        # `$` also matches before a newline at the end.
+        return min_width, max_width + 1
+    return min_width, None
+
+
+def prefilter(prefixes: tuple[str, ...] | None, min_length: int = 0,
+              max_length: int | None = None) -> Callable[[str], bool] | None:
+    """
+    Returns a function that tells whether a string could match a pattern with the given prefixes and length range (see
+    `literal_prefixes()` and `length_range()`), or None if every string could. It is cheaper than the regex, so
+    that the strings that cannot match are rejected before it runs.
+    """
+    if prefixes is not None and min_length <= min(len(prefix) for prefix in prefixes):
+        min_length = 0
+    if prefixes is None and min_length == 0 and max_length is None:
+        return None
+    if min_length == 0 and max_length is None:
+        return methodcaller('startswith', prefixes)
+
+    max_length = sys.maxsize if max_length is None else max_length
+    if prefixes is None:
+        return lambda s: min_length <= len(s) <= max_length
+    return lambda s: min_length <= len(s) <= max_length and s.startswith(prefixes)
+
+
+def line_locator(prefixes: tuple[str, ...] | None) -> Pattern:
+    """
+    Returns a MULTILINE regex that matches at the start of every line whose content, i.e., without the leading
+    whitespace, starts with one of the prefixes, or at the start of every line if there are no prefixes. It is used to
+    find the lines worth matching in a whole block of text with `finditer()`.
+    """
+    if prefixes is None:
+        return re.compile('^', re.MULTILINE)
+    return re.compile(f'^[^\\S\\n]*(?:{"|".join(map(re.escape, prefixes))})', re.MULTILINE)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, DirectoryPath, Field
-from abc import ABC
+from abc import ABC, abstractmethod
 from pathlib import Path
 from novel_tools.framework import NovelData, Type, Writer
 
@@ -16,15 +16,20 @@ class Structure:
 class BaseOptions(BaseModel):
     out_dir: DirectoryPath = Field(description='The working directory.')
     debug: bool = Field(default=False, description='If set to True, will print the error message to the terminal.')
+    stream: bool = Field(default=False, description='If set to True, each chapter will be written as soon as the next '
+                                                    'title arrives, instead of keeping the whole book in memory until '
+                                                    'the end. The book title and introduction must come before the '
+                                                    'first volume/chapter title.')
 
 
 class StructureWriter(Writer, ABC):
     """
     Abstract class that generates the novel hierarchy as it accepts the data. The `write()` method is left to child
-    classes to implement.
+    classes to implement. See `StreamingStructureWriter` for writers that write the hierarchy part by part.
     """
     out_dir: Path
     debug: bool
+    stream: bool
     structure: Structure
     curr_volume: Structure = None
     curr_chapter: Structure = None
@@ -34,6 +39,7 @@ class StructureWriter(Writer, ABC):
         self.structure = Structure()
         self.out_dir = options.out_dir
         self.debug = options.debug
+        self.stream = options.stream
 
     def accept(self, data: NovelData) -> None:
         if self.debug and data.get('error', '') != '':
@@ -46,23 +52,33 @@ class StructureWriter(Writer, ABC):
                 self.structure.contents.append(data)
             case Type.VOLUME_TITLE:
                 self.has_volumes = True
-                self.curr_volume = Structure()
-                self.curr_volume.title = data
-                self.structure.children.append(self.curr_volume)
+                volume = Structure()
+                volume.title = data
+                self._add_volume(volume)
+                self.curr_volume = volume
             case Type.VOLUME_INTRO:
                 self.curr_volume.contents.append(data)
             case Type.CHAPTER_TITLE:
-                self.curr_chapter = Structure()
-                self.curr_chapter.title = data
-                if self.has_volumes:
-                    self.curr_volume.children.append(self.curr_chapter)
-                else:
-                    self.structure.children.append(self.curr_chapter)
+                chapter = Structure()
+                chapter.title = data
+                self._add_chapter(chapter)
+                self.curr_chapter = chapter
             case Type.CHAPTER_CONTENT:
                 self.curr_chapter.contents.append(data)
             case _:
                 print(f'Unrecognized data type: {data.type}')
 
+    def _add_volume(self, volume: Structure) -> None:
+        """Adds a new volume to the hierarchy. It becomes the current volume afterwards."""
+        self.structure.children.append(volume)
+
+    def _add_chapter(self, chapter: Structure) -> None:
+        """Adds a new chapter to the hierarchy. It becomes the current chapter afterwards."""
+        if self.has_volumes:
+            self.curr_volume.children.append(chapter)
+        else:
+            self.structure.children.append(chapter)
+
     def _join_content(self, contents: list[NovelData]) -> str:
         contents_str = []
         for content in contents:
@@ -70,22 +86,25 @@ class StructureWriter(Writer, ABC):
 
         return ''.join(contents_str).strip()
 
+    def _clean_intro(self, contents: list[NovelData], data_type: Type) -> list[NovelData]:
+        intro = self._join_content(contents)
+        return [] if intro == '' else [NovelData(intro, data_type)]
+
+    def _clean_chapter(self, contents: list[NovelData]) -> list[NovelData]:
+        return [NovelData(self._join_content(contents), Type.CHAPTER_CONTENT)]
+
     def _cleanup(self):
-        intro = self._join_content(self.structure.contents)
-        self.structure.contents = [] if intro == '' else [NovelData(intro, Type.BOOK_INTRO)]
+        self.structure.contents = self._clean_intro(self.structure.contents, Type.BOOK_INTRO)
 
         if self.has_volumes:
             for volume in self.structure.children:
-                intro = self._join_content(volume.contents)
-                volume.contents = [] if intro == '' else [NovelData(intro, Type.VOLUME_INTRO)]
+                volume.contents = self._clean_intro(volume.contents, Type.VOLUME_INTRO)
 
                 for chapter in volume.children:
-                    content = self._join_content(chapter.contents)
-                    chapter.contents = [NovelData(content, Type.CHAPTER_CONTENT)]
+                    chapter.contents = self._clean_chapter(chapter.contents)
         else:
             for chapter in self.structure.children:
-                content = self._join_content(chapter.contents)
-                chapter.contents = [NovelData(content, Type.CHAPTER_CONTENT)]
+                chapter.contents = self._clean_chapter(chapter.contents)
 
     @staticmethod
     def _get_content(data: NovelData):
@@ -94,3 +113,101 @@ class StructureWriter(Writer, ABC):
     @classmethod
     def _get_filename(cls, data: NovelData):
         return data.get('filename', cls._get_content(data))
+
+
+class StreamingStructureWriter(StructureWriter, ABC):
+    """
+    Abstract class of the structure writers whose output is produced by the `_write_*()` hooks, either all at once in
+    `write()`, or chapter by chapter as the data arrives if `stream` is set.
+    """
+
+    def init_fields(self, options: BaseOptions):
+        super().init_fields(options)
+        self.__head_written = False
+        self.__volume_written = False
+        self.__volume_count = 0
+        self.__chapter_count = 0
+
+    def _add_volume(self, volume: Structure) -> None:
+        if self.stream:
+            self.__flush()
+            self.__volume_written = False
+        else:
+            super()._add_volume(volume)
+
+    def _add_chapter(self, chapter: Structure) -> None:
+        if self.stream:
+            self.__flush()
+        else:
+            super()._add_chapter(chapter)
+
+    def write(self) -> None:
+        # The output is closed even if writing fails, so that no file is left open. In stream mode, the Workers also
+        # close the writers if the run fails before `write()`.
+        try:
+            if self.stream:
+                self.__flush()
+                self._write_end()
+                return
+
+            self._cleanup()
+            self._write_head(self.structure)
+
+            if self.has_volumes:
+                volumes = self.structure.children
+            else:
+                default_volume = Structure()
+                default_volume.children = self.structure.children
+                volumes = [default_volume]
+
+            for i, volume in enumerate(volumes):
+                self._write_volume(volume, i == 0)
+                for j, chapter in enumerate(volume.children):
+                    self._write_chapter(chapter, j == 0)
+
+            self._write_end()
+        finally:
+            self.close()
+
+    def __flush(self):
+        """Writes everything that has been accepted but not yet written, and frees the finished chapter."""
+        if not self.__head_written:
+            self.structure.contents = self._clean_intro(self.structure.contents, Type.BOOK_INTRO)
+            self._write_head(self.structure)
+            self.__head_written = True
+            if not self.has_volumes:
+                self.curr_volume = Structure()
+
+        if self.curr_volume is not None and not self.__volume_written:
+            self.curr_volume.contents = self._clean_intro(self.curr_volume.contents, Type.VOLUME_INTRO)
+            self._write_volume(self.curr_volume, self.__volume_count == 0)
+            self.__volume_written = True
+            self.__volume_count += 1
+            self.__chapter_count = 0
+
+        if self.curr_chapter is not None:
+            self.curr_chapter.contents = self._clean_chapter(self.curr_chapter.contents)
+            self._write_chapter(self.curr_chapter, self.__chapter_count == 0)
+            self.__chapter_count += 1
+            self.curr_chapter = None
+
+    @abstractmethod
+    def _write_head(self, book: Structure) -> None:
+        """Writes the book title and introduction. The introduction, if any, has been joined into a single NovelData."""
+        pass
+
+    @abstractmethod
+    def _write_volume(self, volume: Structure, first: bool) -> None:
+        """
+        Writes the volume title and introduction. The title is None for the default volume of a book without volumes.
+        """
+        pass
+
+    @abstractmethod
+    def _write_chapter(self, chapter: Structure, first: bool) -> None:
+        """Writes a chapter, whose contents have been joined into a single NovelData."""
+        pass
+
+    def _write_end(self) -> None:
+        """Finishes the output after the last chapter. Anything that is still open is released in `close()`."""
+        pass
@@ -30,6 +30,9 @@ class CsvWriter(Writer):
 
         self.list.append(data)
 
+    def accept_batch(self, batch: list[NovelData]) -> None:
+        self.list.extend(data for data in batch if data.has('formatted'))
+
     def write(self) -> None:
         with self.csv_path.open('wt', newline='') as f:
             writer = csv.DictWriter(f, fieldnames=self.field_names)
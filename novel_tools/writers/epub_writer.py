@@ -61,6 +61,8 @@ class EpubWriter(StructureWriter):
 
     def __init__(self, args):
         options = Options(**args)
+        if options.stream:
+            raise ValueError('EpubWriter does not support streaming, as the epub can only be packed at the end.')
         self.init_fields(options)
         self.in_dir: Path = options.in_dir
         self.encoding = options.encoding
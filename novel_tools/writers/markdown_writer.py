@@ -1,6 +1,7 @@
 from pydantic import Field
+from typing import TextIO
 from novel_tools.framework import Type, NovelData
-from .__structure_writer__ import StructureWriter, Structure, BaseOptions
+from .__structure_writer__ import StreamingStructureWriter, Structure, BaseOptions
 from novel_tools.utils import purify_name
 
 
@@ -16,9 +17,9 @@ class Options(BaseOptions):
                                                            'treated as the same paragraph.')
 
 
-class MarkdownWriter(StructureWriter):
+class MarkdownWriter(StreamingStructureWriter):
     """
-    Writes the entire novel to a Markdown file.
+    Writes the entire novel to a Markdown file. If `stream` is set, each chapter is written as soon as it is complete.
     If a title field has been passed from a TitleTransformer and has the 'formatted' field filled, then the field will
     be prioritized.
     """
@@ -26,36 +27,46 @@ class MarkdownWriter(StructureWriter):
     def __init__(self, args):
         options = Options(**args)
         self.init_fields(options)
+        self.file: TextIO | None = None
         self.use_title = options.use_title
         self.filename = options.md_filename
         self.levels = {Type[key.upper()]: '#' * value + ' ' for key, value in options.levels.items()}
         self.write_newline = options.write_newline
 
-    def write(self) -> None:
-        self._cleanup()
-
-        title = self.structure.title
-        title_text = self._get_content(title) if title else ''
+    def _write_head(self, book: Structure) -> None:
+        title = book.title
         filename = purify_name(self._get_filename(title) + '.md' if self.use_title else self.filename)
-        with (self.out_dir / filename).open('wt') as f:
-            if title:
-                f.write(self.levels.get(Type.BOOK_TITLE, '') + title_text + '\n\n')
+        self.file = (self.out_dir / filename).open('wt')
+        if title:
+            self.file.write(self.levels.get(Type.BOOK_TITLE, '') + self._get_content(title) + '\n\n')
+
+        # Write intro
+        if len(book.contents) > 0:
+            self.file.write(book.contents[0].content)
+            self.file.write('\n\n')
+
+    def _write_volume(self, volume: Structure, first: bool) -> None:
+        if not first:
+            self.file.write('\n\n')
+
+        if title := volume.title:
+            self.file.write(self.levels.get(Type.VOLUME_TITLE, '') + self._get_content(title) + '\n\n')
+
+        if len(volume.contents) > 0:
+            self.file.write(volume.contents[0].content)
+            self.file.write('\n\n')
 
-            # Write intro
-            if len(self.structure.contents) > 0:
-                f.write(self.structure.contents[0].content)
-                f.write('\n\n')
+    def _write_chapter(self, chapter: Structure, first: bool) -> None:
+        if not first:
+            self.file.write('\n\n')
 
-            # Write volume
-            if self.has_volumes:
-                for i in range(len(self.structure.children)):
-                    self.__write_volume(self.structure.children[i], f)
-                    if i != len(self.structure.children) - 1:
-                        f.write('\n\n')
-            else:
-                default_volume = Structure()
-                default_volume.children = self.structure.children
-                self.__write_volume(default_volume, f)
+        self.file.write(self.levels.get(Type.CHAPTER_TITLE, '') + self._get_content(chapter.title) + '\n\n')
+        self.file.write(chapter.contents[0].content)
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
 
     def _join_content(self, contents: list[NovelData]) -> str:
         contents_str = []
@@ -65,19 +76,3 @@ class MarkdownWriter(StructureWriter):
                 contents_str.append('\n')
 
         return ''.join(contents_str).strip()
-
-    def __write_volume(self, volume: Structure, f):
-        if title := volume.title:
-            f.write(self.levels.get(Type.VOLUME_TITLE, '') + self._get_content(title) + '\n\n')
-
-        if len(volume.contents) > 0:
-            f.write(volume.contents[0].content)
-            f.write('\n\n')
-
-        for i in range(len(volume.children)):
-            chapter = volume.children[i]
-            title = chapter.title
-            f.write(self.levels.get(Type.CHAPTER_TITLE, '') + self._get_content(title) + '\n\n')
-            f.write(chapter.contents[0].content)
-            if i != len(volume.children) - 1:
-                f.write('\n\n')
@@ -1,5 +1,6 @@
 from pydantic import Field
-from .__structure_writer__ import StructureWriter, Structure, BaseOptions
+from typing import TextIO
+from .__structure_writer__ import StreamingStructureWriter, Structure, BaseOptions
 from novel_tools.utils import purify_name
 
 
@@ -9,9 +10,9 @@ class Options(BaseOptions):
                                                                'False.')
 
 
-class TextWriter(StructureWriter):
+class TextWriter(StreamingStructureWriter):
     """
-    Writes the entire novel to a text file.
+    Writes the entire novel to a text file. If `stream` is set, each chapter is written as soon as it is complete.
     If a title field has been passed from a TitleTransformer and has the 'formatted' field filled, then the field will
     be prioritized.
     """
@@ -19,47 +20,41 @@ class TextWriter(StructureWriter):
     def __init__(self, args):
         options = Options(**args)
         self.init_fields(options)
+        self.file: TextIO | None = None
         self.use_title = options.use_title
         self.filename = options.text_filename
 
-    def write(self) -> None:
-        self._cleanup()
-
-        title = self.structure.title
-        title_text = self._get_content(title) if title else ''
+    def _write_head(self, book: Structure) -> None:
+        title = book.title
         filename = purify_name(self._get_filename(title) + '.txt' if self.use_title else self.filename)
-        with (self.out_dir / filename).open('wt') as f:
-            if title:
-                f.write(title_text + '\n\n')
+        self.file = (self.out_dir / filename).open('wt')
+        if title:
+            self.file.write(self._get_content(title) + '\n\n')
 
-            # Write intro
-            if len(self.structure.contents) > 0:
-                f.write(self.structure.contents[0].content)
-                f.write('\n\n')
+        # Write intro
+        if len(book.contents) > 0:
+            self.file.write(book.contents[0].content)
+            self.file.write('\n\n')
 
-            # Write volume
-            if self.has_volumes:
-                for i in range(len(self.structure.children)):
-                    self.__write_volume(self.structure.children[i], f)
-                    if i != len(self.structure.children) - 1:
-                        f.write('\n\n')
-            else:
-                default_volume = Structure()
-                default_volume.children = self.structure.children
-                self.__write_volume(default_volume, f)
+    def _write_volume(self, volume: Structure, first: bool) -> None:
+        if not first:
+            self.file.write('\n\n')
 
-    def __write_volume(self, volume: Structure, f):
         if title := volume.title:
-            f.write(self._get_content(title) + '\n\n')
+            self.file.write(self._get_content(title) + '\n\n')
 
         if len(volume.contents) > 0:
-            f.write(volume.contents[0].content)
-            f.write('\n\n')
+            self.file.write(volume.contents[0].content)
+            self.file.write('\n\n')
+
+    def _write_chapter(self, chapter: Structure, first: bool) -> None:
+        if not first:
+            self.file.write('\n\n')
+
+        self.file.write(self._get_content(chapter.title) + '\n\n')
+        self.file.write(chapter.contents[0].content)
 
-        for i in range(len(volume.children)):
-            chapter = volume.children[i]
-            title = chapter.title
-            f.write(self._get_content(title) + '\n\n')
-            f.write(chapter.contents[0].content)
-            if i != len(volume.children) - 1:
-                f.write('\n\n')
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -1,5 +1,6 @@
 import argparse
 from pathlib import Path
+from novel_tools.framework import Profiler
 from novel_tools.toolkit import analyze, docgen
 from novel_tools.utils import get_config
 
@@ -8,13 +9,23 @@ def do_analyze(args):
     config_filename = args.toolkit + '_config.json'
     input_path = Path(args.input)
     output_path = Path(args.output) if args.output is not None else None
+    profiler = Profiler() if args.profile is not None else None
     if input_path.is_file():
         in_dir = input_path.parent
         config = get_config(config_filename, in_dir)
-        analyze(config, filename=input_path, out_dir=output_path)
+        analyze(config, filename=input_path, out_dir=output_path, profiler=profiler, compiled=args.compiled,
+                scan=args.scan)
     else:
         config = get_config(config_filename, input_path)
-        analyze(config, in_dir=input_path, out_dir=output_path)
+        analyze(config, in_dir=input_path, out_dir=output_path, profiler=profiler, compiled=args.compiled,
+                scan=args.scan)
+
+    if profiler is not None:
+        if args.profile == '':
+            print(profiler.report())
+        else:
+            with Path(args.profile).open('wt') as f:
+                f.write(profiler.to_json())
 
 
 def start():
@@ -31,6 +42,15 @@ def start():
                                 help='Input filename or directory name. If it is a file, it will only be recognized by'
                                      ' TextReader, and it must contain the full path.')
     analyze_parser.add_argument('-o', '--output', default=None, help='Output directory name.')
+    analyze_parser.add_argument('-p', '--profile', nargs='?', const='', default=None,
+                                help='Records the time and counters of every stage. If a filename is given, the report '
+                                     'will be written to it as json; otherwise, it will be printed as a table.')
+    analyze_parser.add_argument('-c', '--compiled', action='store_true',
+                                help='Compiles the processors into a single specialized function, and fuses the regexes '
+                                     'of the matchers. The output is the same, but it runs faster on large novels.')
+    analyze_parser.add_argument('-s', '--scan', action='store_true',
+                                help='Only matches the lines that might be titles, located in whole blocks of the text. '
+                                     'The output is the same, but it only supports toolkits like struct.')
     analyze_parser.set_defaults(func=do_analyze)
 
     # generate_docs
@@ -0,0 +1,110 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pytest import fixture
+from novel_tools.framework import NovelData, Type, Worker, AsyncWorker, AsyncReader, ThreadedReader, ThreadedWriter, \
+    Reader, Processor, Writer
+
+
+class StubReader(Reader):
+    def __init__(self, contents: list[str]):
+        self.contents = contents
+        self.closed = False
+
+    def read(self):
+        try:
+            for content in self.contents:
+                yield NovelData(content)
+        finally:
+            self.closed = True
+
+
+class StubAsyncReader(AsyncReader):
+    def __init__(self, contents: list[str]):
+        self.contents = contents
+
+    async def read(self):
+        for content in self.contents:
+            await asyncio.sleep(0)
+            yield NovelData(content)
+
+
+class StubProcessor(Processor):
+    def process(self, data: NovelData) -> NovelData:
+        if data.content.startswith('Chapter'):
+            data.type = Type.CHAPTER_TITLE
+        return data
+
+
+class StubWriter(Writer):
+    def __init__(self, accepted_types: set | None = None):
+        self.accepted_types = accepted_types
+        self.list = []
+        self.written = False
+
+    def accept(self, data: NovelData) -> None:
+        self.list.append(data)
+
+    def write(self) -> None:
+        self.written = True
+
+
+@fixture
+def contents():
+    return [['Chapter 1', 'Lorem', 'Ipsum'], ['Chapter 2', 'Dolor']]
+
+
+def run(contents: list[list[str]], accepted_types: set | None = None, **kwargs) -> StubWriter:
+    writer = StubWriter(accepted_types)
+    readers = [ThreadedReader(StubReader(reader_contents)) for reader_contents in contents]
+    asyncio.run(AsyncWorker(readers, [StubProcessor()], [ThreadedWriter(writer)], **kwargs).execute())
+    assert writer.written
+    return writer
+
+
+def test_execute(contents: list[list[str]]):
+    writer = StubWriter()
+    Worker([StubReader(reader_contents) for reader_contents in contents], [StubProcessor()], [writer]).execute()
+    for batch_size in [1, 2, 100]:
+        assert run(contents, batch_size=batch_size).list == writer.list
+    with ThreadPoolExecutor(1) as executor:
+        assert run(contents, batch_size=2, executor=executor).list == writer.list
+    assert run(contents, compiled=True).list == writer.list
+
+
+def test_dispatch(contents: list[list[str]]):
+    assert run(contents, {Type.CHAPTER_TITLE}, batch_size=2).list == [NovelData('Chapter 1', Type.CHAPTER_TITLE),
+                                                                      NovelData('Chapter 2', Type.CHAPTER_TITLE)]
+
+
+def test_read_batches():
+    async def read_batches(reader: AsyncReader) -> list[list[str]]:
+        return [[data.content for data in batch] async for batch in reader.read_batches(2)]
+
+    contents = ['Lorem', 'Ipsum', 'Dolor']
+    assert asyncio.run(read_batches(StubAsyncReader(contents))) == [['Lorem', 'Ipsum'], ['Dolor']]
+    assert asyncio.run(read_batches(ThreadedReader(StubReader(contents)))) == [['Lorem', 'Ipsum'], ['Dolor']]
+
+
+def test_threaded_reader_close():
+    async def read_first(reader: AsyncReader) -> NovelData:
+        batches = reader.read_batches(1)
+        batch = await anext(batches)
+        await batches.aclose()
+        return batch[0]
+
+    reader = StubReader(['Lorem', 'Ipsum'])
+    assert asyncio.run(read_first(ThreadedReader(reader))) == NovelData('Lorem')
+    assert reader.closed
+
+
+def test_close(contents: list[list[str]]):
+    class ClosingProcessor(StubProcessor):
+        closed = False
+
+        def close(self) -> None:
+            self.closed = True
+
+    processor = ClosingProcessor()
+    readers = [ThreadedReader(StubReader(reader_contents)) for reader_contents in contents]
+    asyncio.run(AsyncWorker(readers, [processor], [ThreadedWriter(StubWriter())]).execute())
+    assert processor.closed
@@ -0,0 +1,33 @@
+from novel_tools.framework import NovelData, Type, Processor, compile_pipeline
+from novel_tools.framework.compiler import _cache
+
+
+class RetypeProcessor(Processor):
+    def __init__(self, from_type: Type, to_type: Type, tags: set | None = None):
+        self.accepted_types = {from_type}
+        self.accepted_tags = tags
+        self.to_type = to_type
+
+    def process(self, data: NovelData) -> NovelData:
+        data.type = self.to_type
+        return data
+
+
+def test_compile_pipeline():
+    processors = [RetypeProcessor(Type.UNRECOGNIZED, Type.CHAPTER_TITLE),
+                  RetypeProcessor(Type.CHAPTER_TITLE, Type.VOLUME_TITLE, {'special'}),
+                  RetypeProcessor(Type.CHAPTER_TITLE, Type.CHAPTER_CONTENT, {None})]
+    pipeline = compile_pipeline(processors)
+    assert pipeline(NovelData('Lorem')).type == Type.CHAPTER_CONTENT
+    assert pipeline(NovelData('Lorem', tag='special')).type == Type.VOLUME_TITLE
+    assert pipeline(NovelData('Lorem', Type.BOOK_INTRO)).type == Type.BOOK_INTRO
+
+
+def test_cache():
+    processors = [RetypeProcessor(Type.BOOK_TITLE, Type.BOOK_INTRO), RetypeProcessor(Type.BOOK_INTRO, Type.BOOK_TITLE)]
+    compile_pipeline(processors)
+    size = len(_cache)
+    pipeline = compile_pipeline([RetypeProcessor(Type.BOOK_TITLE, Type.VOLUME_TITLE),
+                                 RetypeProcessor(Type.BOOK_INTRO, Type.BOOK_TITLE)])
+    assert len(_cache) == size
+    assert pipeline(NovelData('Lorem', Type.BOOK_TITLE)).type == Type.VOLUME_TITLE
@@ -0,0 +1,122 @@
+from copy import deepcopy
+from pathlib import Path
+from pytest import raises
+from novel_tools.framework import NovelData, Type, FileContext, SourceLine
+
+
+def test_slots():
+    data = NovelData('Lorem')
+    assert not hasattr(data, '__dict__')
+    with raises(AttributeError):
+        data.extra = 'Ipsum'
+
+
+def test_lazy_others():
+    data = NovelData('Lorem')
+    assert data._others is None
+    assert not data.has('tag')
+    assert data.get('tag') is None
+    assert data.get('tag', 'special') == 'special'
+    assert data.flat_dict() == {'type': Type.UNRECOGNIZED, 'content': 'Lorem', 'index': None}
+    assert data._others is None
+
+    data.set(tag='special')
+    assert data.has('tag')
+    assert data.get('tag') == 'special'
+    assert data.others == {'tag': 'special'}
+
+
+def test_pop():
+    data = NovelData('Lorem', tag='special')
+    assert data.pop('tag') == 'special'
+    assert not data.has('tag')
+    with raises(KeyError):
+        NovelData('Lorem').pop('tag')
+
+
+def test_others_mutation():
+    data = NovelData('Lorem')
+    data.others['tag'] = 'special'
+    assert data.get('tag') == 'special'
+
+
+def test_eq():
+    assert NovelData('Lorem') == NovelData('Lorem')
+    assert NovelData('Lorem') != NovelData('Ipsum')
+    assert NovelData('Lorem', tag='special') != NovelData('Lorem')
+    assert NovelData('Lorem', tag='special') == NovelData('Lorem', tag='special')
+
+    # An empty others dict is the same as one that has never been allocated.
+    data = NovelData('Lorem')
+    _ = data.others
+    assert data == NovelData('Lorem')
+
+
+def test_copy():
+    data = NovelData('Lorem', Type.CHAPTER_TITLE, 1, source=Path('text.txt'))
+    copied = data.copy()
+    assert copied == data
+    copied.set(tag='special')
+    assert not data.has('tag')
+    assert deepcopy(NovelData('Lorem')) == NovelData('Lorem')
+
+
+def test_shallow_copy():
+    authors = ['Lorem']
+    data = NovelData('Lorem', Type.CHAPTER_TITLE, 1, source=Path('text.txt'), authors=authors)
+    copied = data.copy(deep=False)
+    assert copied == data
+    assert copied is not data
+
+    # Fields can be replaced independently.
+    copied.content = 'Ipsum'
+    copied.index = 2
+    copied.set(source=Path('other.txt'), tag='special')
+    copied.pop('authors')
+    assert data == NovelData('Lorem', Type.CHAPTER_TITLE, 1, source=Path('text.txt'), authors=authors)
+
+    data.set(error='Error')
+    assert not copied.has('error')
+
+    # Values themselves are shared.
+    assert data.copy(deep=False).get('authors') is authors
+    assert data.copy().get('authors') is not authors
+
+    empty = NovelData('Lorem').copy(deep=False)
+    assert empty._others is None
+
+
+def test_source_line():
+    context = FileContext(Path('text.txt'), 'utf-8')
+    data = SourceLine('Lorem', context, 1, '  Lorem')
+    expected = NovelData('Lorem', source=Path('text.txt'), line_num=1, raw='  Lorem')
+    assert data == expected
+    assert expected == data
+    assert data._others is None
+    assert data.has('source') and data.has('line_num') and data.has('raw')
+    assert data.get('source') is context.source
+    assert data.get('line_num') == 1
+    assert data.flat_dict(['content', 'source', 'raw']) == {'content': 'Lorem', 'source': Path('text.txt'),
+                                                           'raw': '  Lorem'}
+    assert data.copy(deep=False) == expected
+    assert data.copy() == expected
+
+
+def test_source_line_set():
+    context = FileContext(Path('text.txt'), 'utf-8')
+    data = SourceLine('Lorem', context, 1, 'Lorem')
+    data.set(source=Path('relative.txt'), tag='special')
+    assert data.get('source') == Path('relative.txt')
+    assert context.source == Path('text.txt')
+    assert data == NovelData('Lorem', source=Path('relative.txt'), line_num=1, raw='Lorem', tag='special')
+    assert data.pop('raw') == 'Lorem'
+    assert not data.has('raw')
+    assert data == NovelData('Lorem', source=Path('relative.txt'), line_num=1, tag='special')
+
+
+def test_source_line_others():
+    data = SourceLine('Lorem', FileContext(Path('text.txt'), 'utf-8'), 1, 'Lorem')
+    others = data.others | {'tag': 'special'}
+    assert others == {'source': Path('text.txt'), 'line_num': 1, 'raw': 'Lorem', 'tag': 'special'}
+    data.others['line_num'] = 2
+    assert data.get('line_num') == 2
@@ -0,0 +1,71 @@
+import json
+from novel_tools.framework import NovelData, Type, Worker, Profiler, Reader, Writer
+from novel_tools.processors.matchers.numbered_matcher import NumberedMatcher
+from novel_tools.processors.matchers.__aggregate_matcher__ import AggregateMatcher
+
+
+class StubReader(Reader):
+    def read(self):
+        for content in ['Chapter 1 Lorem', 'Ipsum', 'Chapter 2 Dolor', 'Sit']:
+            yield NovelData(content)
+
+
+class StubWriter(Writer):
+    def __init__(self):
+        self.list = []
+
+    def accept(self, data: NovelData) -> None:
+        self.list.append(data)
+
+    def write(self) -> None:
+        pass
+
+
+def execute(batch_size: int) -> tuple[Profiler, StubWriter]:
+    profiler = Profiler()
+    writer = StubWriter()
+    matcher = AggregateMatcher([NumberedMatcher({'type': 'chapter_title', 'regex': '^Chapter (.+) (.+)$'})])
+    Worker([StubReader()], [matcher], [writer], batch_size, profiler).execute()
+    return profiler, writer
+
+
+def test_profile():
+    profiler, writer = execute(1)
+    assert writer.list[0] == NovelData('Lorem', Type.CHAPTER_TITLE, 1)
+    reader, matcher, writer = profiler.stages
+    assert (reader.name, reader.calls, reader.items_out) == ('StubReader', 5, 4)
+    assert (matcher.name, matcher.calls, matcher.items_in, matcher.items_out) == ('AggregateMatcher', 4, 4, 4)
+    assert (matcher.children[0].name, matcher.children[0].hits) == ('NumberedMatcher', 2)
+    assert (writer.name, writer.calls, writer.items_in) == ('StubWriter', 5, 4)
+
+
+def test_profile_batch():
+    profiler, _ = execute(3)
+    _, matcher, writer = profiler.stages
+    assert (matcher.calls, matcher.items_in, matcher.items_out) == (2, 4, 4)
+    assert matcher.children[0].hits == 2
+    assert (writer.calls, writer.items_in) == (3, 4)
+
+
+def test_report():
+    profiler, _ = execute(1)
+    report = profiler.report().splitlines()
+    assert report[0].split() == ['Stage', 'Kind', 'Calls', 'In', 'Out', 'Hits', 'Time', '(s)', '%']
+    assert report[2].split()[:5] == ['AggregateMatcher', 'processor', '4', '4', '4']
+    # The lines that cannot match the prefix of the regex are not passed to the matcher at all.
+    assert report[3].split()[:6] == ['NumberedMatcher', 'matcher', '2', '2', '2', '2']
+    stages = json.loads(profiler.to_json())['stages']
+    assert [stage['name'] for stage in stages] == ['StubReader', 'AggregateMatcher', 'StubWriter']
+
+
+def test_profile_fused():
+    profiler = Profiler()
+    matcher = AggregateMatcher([NumberedMatcher({'type': 'chapter_title', 'regex': '^Chapter (.+) (.+)$'}),
+                                NumberedMatcher({'type': 'volume_title', 'regex': '^Volume (.+) (.+)$'})], fused=True)
+    Worker([StubReader()], [matcher], [StubWriter()], 1, profiler, compiled=True).execute()
+    _, matcher, _ = profiler.stages
+    fused = matcher.children[0]
+    assert (fused.name, fused.hits) == ('_FusedMatcher', 2)
+    # The hits are recorded under the matchers that were fused.
+    assert [(child.name, child.hits) for child in fused.children] == [('NumberedMatcher', 2), ('NumberedMatcher', 0)]
+    assert profiler.report().splitlines()[5].split()[:2] == ['NumberedMatcher', 'matcher']
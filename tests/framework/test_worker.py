@@ -0,0 +1,168 @@
+from pytest import fixture, raises
+from novel_tools.framework import NovelData, Type, Worker, PipelinedWorker, Reader, Processor, Writer
+
+
+class StubReader(Reader):
+    def __init__(self, contents: list[str]):
+        self.contents = contents
+
+    def read(self):
+        for content in self.contents:
+            yield NovelData(content)
+
+
+class StubProcessor(Processor):
+    def __init__(self):
+        self.calls = 0
+
+    def process(self, data: NovelData) -> NovelData:
+        self.calls += 1
+        if data.content.startswith('Chapter'):
+            data.type = Type.CHAPTER_TITLE
+        return data
+
+
+class StubWriter(Writer):
+    def __init__(self):
+        self.list = []
+        self.written = False
+
+    def accept(self, data: NovelData) -> None:
+        self.list.append(data)
+
+    def write(self) -> None:
+        self.written = True
+
+
+@fixture
+def readers():
+    return [StubReader(['Chapter 1', 'Lorem', 'Ipsum']), StubReader(['Chapter 2', 'Dolor'])]
+
+
+def run(readers: list[Reader], **kwargs) -> StubWriter:
+    writer = StubWriter()
+    Worker(readers, [StubProcessor()], [writer], **kwargs).execute()
+    assert writer.written
+    return writer
+
+
+def test_execute(readers: list[Reader]):
+    writer = run(readers)
+    assert writer.list == [NovelData('Chapter 1', Type.CHAPTER_TITLE), NovelData('Lorem'), NovelData('Ipsum'),
+                           NovelData('Chapter 2', Type.CHAPTER_TITLE), NovelData('Dolor')]
+
+
+def test_batch(readers: list[Reader]):
+    for batch_size in [2, 3, 100]:
+        assert run(readers, batch_size=batch_size).list == run(readers).list
+
+
+def test_invalid_batch_size(readers: list[Reader]):
+    with raises(ValueError):
+        Worker(readers, [], [], batch_size=0)
+
+
+class FailingProcessor(Processor):
+    def process(self, data: NovelData) -> NovelData:
+        if data.content == 'Ipsum':
+            raise ValueError('Failed.')
+        return data
+
+
+def test_pipelined(readers: list[Reader]):
+    for batch_size, queue_size in [(1, 1), (2, 1), (3, 16)]:
+        writer = StubWriter()
+        PipelinedWorker(readers, [StubProcessor()], [writer], batch_size, queue_size).execute()
+        assert writer.written
+        assert writer.list == run(readers).list
+
+
+def test_pipelined_error(readers: list[Reader]):
+    writer = StubWriter()
+    with raises(ValueError, match='Failed.'):
+        PipelinedWorker(readers, [FailingProcessor()], [writer], queue_size=1).execute()
+    assert not writer.written
+
+
+class TitleProcessor(Processor):
+    """Counts the chapter titles, and only declares to accept them."""
+
+    def __init__(self):
+        self.accepted_types = {Type.CHAPTER_TITLE}
+        self.calls = 0
+
+    def process(self, data: NovelData) -> NovelData:
+        self.calls += 1
+        data.set(count=self.calls)
+        return data
+
+
+class TaggedWriter(StubWriter):
+    def __init__(self):
+        super().__init__()
+        self.accepted_types = {Type.CHAPTER_TITLE}
+        self.accepted_tags = {None}
+
+
+def test_dispatch(readers: list[Reader]):
+    expected = [NovelData('Chapter 1', Type.CHAPTER_TITLE, count=1), NovelData('Chapter 2', Type.CHAPTER_TITLE, count=2)]
+    for batch_size in [1, 2, 100]:
+        # The type is only known after StubProcessor, so the dispatch must follow the type changes.
+        processors = [StubProcessor(), TitleProcessor()]
+        writer = TaggedWriter()
+        Worker(readers, processors, [writer], batch_size).execute()
+        assert processors[0].calls == 5
+        assert processors[1].calls == 2
+        assert writer.list == expected
+
+
+def test_compiled(readers: list[Reader]):
+    for batch_size in [1, 2]:
+        processors = [StubProcessor(), TitleProcessor()]
+        writer = TaggedWriter()
+        Worker(readers, processors, [writer], batch_size, compiled=True).execute()
+        assert processors[0].calls == 5
+        assert processors[1].calls == 2
+        assert writer.list == [NovelData('Chapter 1', Type.CHAPTER_TITLE, count=1),
+                               NovelData('Chapter 2', Type.CHAPTER_TITLE, count=2)]
+
+
+class ClosingProcessor(StubProcessor):
+    def __init__(self, writer: StubWriter):
+        super().__init__()
+        self.writer = writer
+        self.closed_before_write = None
+
+    def close(self) -> None:
+        self.closed_before_write = not self.writer.written
+
+
+def test_close(readers: list[Reader]):
+    for worker_type, kwargs in [(Worker, {}), (Worker, {'batch_size': 2}), (Worker, {'compiled': True}),
+                                (PipelinedWorker, {'batch_size': 2})]:
+        writer = StubWriter()
+        processor = ClosingProcessor(writer)
+        worker_type(readers, [processor], [writer], **kwargs).execute()
+        assert processor.closed_before_write
+
+
+class ClosableWriter(StubWriter):
+    def __init__(self):
+        super().__init__()
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_close_writers(readers: list[Reader]):
+    for worker_type, kwargs in [(Worker, {}), (Worker, {'batch_size': 2}), (PipelinedWorker, {'batch_size': 2})]:
+        writer = ClosableWriter()
+        worker_type(readers, [StubProcessor()], [writer], **kwargs).execute()
+        assert writer.written and writer.closed
+
+        # The writers are closed even if the run fails.
+        writer = ClosableWriter()
+        with raises(ValueError, match='Failed.'):
+            worker_type(readers, [FailingProcessor()], [writer], **kwargs).execute()
+        assert not writer.written and writer.closed
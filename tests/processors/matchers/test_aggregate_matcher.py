@@ -1,16 +1,17 @@
-from pytest import fixture
+from pytest import fixture, mark
+import re
 from novel_tools.framework import NovelData, Type
 from novel_tools.processors.matchers.numbered_matcher import NumberedMatcher
 from novel_tools.processors.matchers.special_matcher import SpecialMatcher
 from novel_tools.processors.matchers.__aggregate_matcher__ import AggregateMatcher
 
 
-@fixture
-def aggregate_matcher():
+@fixture(params=[False, True], ids=['sequential', 'fused'])
+def aggregate_matcher(request):
     return AggregateMatcher([
         NumberedMatcher({'type': 'volume_title', 'regex': 'Volume (.+) (.+)'}),
         SpecialMatcher({'type': 'chapter_title', 'affixes': ['Introduction', 'Prelude'], 'regex': '^{affixes} (.+)$'})
-    ])
+    ], fused=request.param)
 
 
 def test_numbered(aggregate_matcher: AggregateMatcher):
@@ -23,3 +24,92 @@ def test_special(aggregate_matcher: AggregateMatcher):
     before = NovelData('Introduction Test')
     after = aggregate_matcher.process(before)
     assert after == NovelData('Test', Type.CHAPTER_TITLE, -1, affix='Introduction', tag='special')
+
+
+def test_process_batch(aggregate_matcher: AggregateMatcher):
+    after = aggregate_matcher.process_batch([NovelData('Volume 1 Test'), NovelData('Lorem'),
+                                             NovelData('Introduction Test')])
+    assert after == [NovelData('Test', Type.VOLUME_TITLE, 1), NovelData('Lorem'),
+                     NovelData('Test', Type.CHAPTER_TITLE, -1, affix='Introduction', tag='special')]
+
+
+@mark.parametrize('fused', [False, True])
+def test_priority(fused: bool):
+    matcher = AggregateMatcher([
+        NumberedMatcher({'type': 'chapter_title', 'regex': '^Chapter (.+?) (.+)$'}),
+        NumberedMatcher({'type': 'volume_title', 'regex': '^(?:Chapter|Volume) (.+?) (.+)$'}),
+        SpecialMatcher({'type': 'chapter_title', 'affixes': [], 'regex': '^(Chapter) (.+)$'})
+    ], fused=fused)
+    assert matcher.process_batch([
+        NovelData('Chapter 1 Test'),
+        # Not a valid number for the first matcher, so the next one is tried.
+        NovelData('Chapter One Test'),
+        NovelData('Volume 2 Test'),
+        # Only the matchers of the same type are tried.
+        NovelData('Volume 3 Test', Type.CHAPTER_TITLE),
+        NovelData('Chapter Two Test', Type.CHAPTER_TITLE),
+        NovelData('Chapter 4 Test', Type.VOLUME_TITLE),
+        NovelData('Chapter 5 Test', Type.CHAPTER_CONTENT),
+    ]) == [
+        NovelData('Test', Type.CHAPTER_TITLE, 1),
+        NovelData('One Test', Type.CHAPTER_TITLE, 0, affix='', tag='special'),
+        NovelData('Test', Type.VOLUME_TITLE, 2),
+        NovelData('Volume 3 Test', Type.CHAPTER_TITLE),
+        NovelData('Two Test', Type.CHAPTER_TITLE, 0, affix='', tag='special'),
+        NovelData('Test', Type.VOLUME_TITLE, 4),
+        NovelData('Chapter 5 Test', Type.CHAPTER_CONTENT),
+    ]
+
+
+def test_unfusable():
+    matchers = [
+        NumberedMatcher({'type': 'chapter_title', 'regex': '^Chapter (.+?) (.+)$'}),
+        NumberedMatcher({'type': 'chapter_title', 'regex': '^Section (.+?) (.+)$'}),
+        # Refers to its group by number.
+        NumberedMatcher({'type': 'chapter_title', 'regex': r'^(\w)\1 (.+)$'}),
+        NumberedMatcher({'type': 'volume_title', 'regex': '^Volume (.+?) (.+)$'}),
+        # Different flags.
+        NumberedMatcher({'type': 'volume_title', 'regex': re.compile('^Book (.+?) (.+)$', re.IGNORECASE)}),
+    ]
+    matcher = AggregateMatcher(matchers, fused=True)
+    assert len(matcher.matchers) == 4
+    assert matcher.matchers[1:] == matchers[2:]
+    assert matcher.process(NovelData('11 Test')) == NovelData('Test', Type.CHAPTER_TITLE, 1)
+    assert matcher.process(NovelData('book 2 Test')) == NovelData('Test', Type.VOLUME_TITLE, 2)
+
+
+def test_prefilter():
+    matcher = AggregateMatcher([
+        NumberedMatcher({'type': 'chapter_title', 'regex': '^Chapter (.+?) (.+)$'}),
+        SpecialMatcher({'type': 'chapter_title', 'affixes': ['Introduction', 'Prelude'], 'regex': '^{affixes} (.+)$'})
+    ])
+    assert matcher.accepts('Chapter 1 Test') and matcher.accepts('Prelude Test')
+    assert not matcher.accepts('Lorem ipsum') and not matcher.accepts('')
+    # Any line could match a regex that does not start with a literal, unless it is too short.
+    matcher = AggregateMatcher(matcher.matchers + [NumberedMatcher({'type': 'volume_title', 'regex': '(.+) Volume'})])
+    assert matcher.accepts('Lorem ipsum') and not matcher.accepts('Lorem')
+
+
+@mark.parametrize('fused', [False, True])
+def test_max_length(fused: bool):
+    matcher = AggregateMatcher([
+        NumberedMatcher({'type': 'chapter_title', 'regex': '^第(.+?)章(.*)$', 'max_length': 20}),
+        NumberedMatcher({'type': 'volume_title', 'regex': '^第(.+?)卷(.*)$', 'max_length': 20}),
+        SpecialMatcher({'type': 'chapter_title', 'affixes': ['第'], 'regex': '^{affixes}(.*)$'})
+    ], fused=fused)
+    long_line = '第一章' + '长' * 100
+    expected = [
+        NovelData('Test', Type.CHAPTER_TITLE, 1),
+        # Too long for the first matcher, so the next one is tried.
+        NovelData('一章' + '长' * 100, Type.CHAPTER_TITLE, -1, affix='第', tag='special'),
+    ]
+    assert matcher.process_batch([NovelData('第一章 Test'), NovelData(long_line)]) == expected
+    process = matcher.compile()
+    assert [process(NovelData('第一章 Test')), process(NovelData(long_line))] == expected
+
+    matcher = AggregateMatcher([
+        NumberedMatcher({'type': 'chapter_title', 'regex': '^第(.+?)章(.*)$', 'max_length': 20}),
+        NumberedMatcher({'type': 'volume_title', 'regex': '^第(.+?)卷(.*)$'})
+    ], fused=fused)
+    assert matcher.process(NovelData(long_line)) == NovelData(long_line)
+    assert matcher.compile()(NovelData(long_line)) == NovelData(long_line)
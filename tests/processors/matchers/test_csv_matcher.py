@@ -127,3 +127,48 @@ def test_invalid(mocker: MockerFixture):
     mocker.patch('pathlib.Path.open', mocker.mock_open(read_data=csv))
     with raises(ValueError, match='Type of title is not specified in file or arguments.'):
         CsvMatcher({'in_dir': Path()})
+
+
+@mark.data('''
+    content,line_num
+    Lorem,2
+    Ipsum,5
+    Dolor,8
+    Sit,11
+''', {'data_type': 'chapter_title', 'lookahead': 1})
+def test_lookahead(csv_matcher: CsvMatcher, capsys):
+    # Lorem is missing, and Sit comes before Dolor.
+    results = [csv_matcher.process(NovelData(content, line_num=line_num))
+               for content, line_num in [('Ipsum', 5), ('Sit', 11), ('Dolor', 8)]]
+    assert [(data.type, data.index, data.get('list_index')) for data in results] == [
+        (Type.CHAPTER_TITLE, 2, 2), (Type.CHAPTER_TITLE, 4, 4), (Type.CHAPTER_TITLE, 3, 3)]
+
+    csv_matcher.close()
+    assert capsys.readouterr().out == 'CsvMatcher: 1 title(s) in the list were not matched:\n  Lorem (line 2)\n'
+
+
+@mark.data('''
+    content,line_num
+    Lorem,2
+    Ipsum,5
+    Dolor,8
+''', {'data_type': 'chapter_title'})
+def test_stall(csv_matcher: CsvMatcher):
+    # Without lookahead, a missing title stops the titles after it from being matched.
+    assert csv_matcher.process(NovelData('Ipsum', line_num=5)).type == Type.UNRECOGNIZED
+    assert csv_matcher.process(NovelData('Dolor', line_num=8)).type == Type.UNRECOGNIZED
+
+
+@mark.data('''
+    content
+    Lorem
+    Ipsum
+    Lorem
+    Dolor
+''', {'data_type': 'chapter_title', 'unordered': True})
+def test_unordered(csv_matcher: CsvMatcher, capsys):
+    results = [csv_matcher.process(NovelData(content)) for content in ['Dolor', 'Lorem', 'Lorem', 'Lorem', 'Ipsum']]
+    assert [data.get('list_index') for data in results] == [4, 1, 3, None, 2]
+
+    csv_matcher.close()
+    assert capsys.readouterr().out == ''
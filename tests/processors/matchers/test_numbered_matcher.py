@@ -57,3 +57,31 @@ def test_tag(numbered_matcher: NumberedMatcher):
     before = NovelData('Extra 1 Test')
     after = numbered_matcher.process(before)
     assert after == NovelData('Test', Type.VOLUME_TITLE, 1, tag='extras', matched=True)
+
+
+def test_compile(numbered_matcher: NumberedMatcher):
+    process = numbered_matcher.compile()
+    for before in [NovelData('Volume 1 Test'), NovelData('Volume abc Test'), NovelData('Volume 1 Test', Type.VOLUME_TITLE),
+                   NovelData('Volume 1 Test', Type.CHAPTER_TITLE), NovelData('Lorem', Type.UNRECOGNIZED, source='a')]:
+        assert process(before) == numbered_matcher.process(before)
+
+
+@mark.parametrize('regex, prefixes, length_range', [
+    ('^Volume (.+) (.+)$', ('Volume ',), (10, None)),
+    ('^(?:Book|Volume|Vol\\.) ?(\\d{1,3})()$', ('Book', 'Vol.', 'Volume'), (5, 11)),
+    ('^第([一二三])[卷部]()\\Z', ('第一卷', '第一部', '第三卷', '第三部', '第二卷', '第二部'), (3, 3)),
+    ('^(a|)Volume (.+)()', ('Volume ', 'aVolume '), (8, None)),
+    ('^.Volume (.+)()', None, (9, None)),
+    ('(?i)^Volume (.+)()', None, (8, None)),
+])
+def test_prefilter(regex: str, prefixes: tuple[str, ...] | None, length_range: tuple[int, int | None]):
+    numbered_matcher = NumberedMatcher({'type': 'volume_title', 'regex': regex})
+    assert numbered_matcher.prefixes == prefixes
+    assert (numbered_matcher.min_length, numbered_matcher.max_length) == length_range
+
+
+@mark.args({'max_length': 13})
+def test_max_length(numbered_matcher: NumberedMatcher):
+    assert numbered_matcher.process(NovelData('Volume 1 Test')).type == Type.VOLUME_TITLE
+    assert numbered_matcher.process(NovelData('Volume 1 Tests')).type == Type.UNRECOGNIZED
+    assert numbered_matcher.compile()(NovelData('Volume 1 Tests')).type == Type.UNRECOGNIZED
@@ -44,3 +44,22 @@ def test_index(toc_matcher: TocMatcher):
     before = NovelData('Chapter One', line_num=25)
     after = toc_matcher.process(before)
     assert after == NovelData('Chapter 1', Type.CHAPTER_TITLE, 1, line_num=25, list_index=2, matched=True)
+
+
+@mark.data('''
+    Volume 1\t1
+    \tChapter 1\t25
+    \tChapter 2\t50
+''', {'has_volume': True, 'discard_chapters': False, 'lookahead': 1})
+def test_lookahead(toc_matcher: TocMatcher, capsys):
+    before = NovelData('Chapter One', line_num=25)
+    after = toc_matcher.process(before)
+    assert after == NovelData('Chapter 1', Type.CHAPTER_TITLE, 1, line_num=25, list_index=2, matched=True)
+
+    # Volume 1 is missing, but the titles after it are still matched.
+    before = NovelData('Chapter 2', line_num=50)
+    after = toc_matcher.process(before)
+    assert after == NovelData('Chapter 2', Type.CHAPTER_TITLE, 2, line_num=50, list_index=3, matched=True)
+
+    toc_matcher.close()
+    assert capsys.readouterr().out == 'TocMatcher: 1 title(s) in the list were not matched:\n  Volume 1 (line 1)\n'
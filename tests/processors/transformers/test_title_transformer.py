@@ -59,3 +59,12 @@ def test_transform(title_transformer: TitleTransformer):
     after = title_transformer.process(before)
     assert after.get('formatted') == 'Special Ipsum'
     assert after.get('filename') == 'Chapter Ipsum'
+
+
+def test_compile(title_transformer: TitleTransformer):
+    process = title_transformer.compile()
+    for before in [NovelData('Book Title', Type.BOOK_TITLE), NovelData('Lorem', Type.VOLUME_TITLE, 1),
+                   NovelData('Lorem', Type.VOLUME_TITLE, 1, tag='special'),
+                   NovelData('Ipsum', Type.CHAPTER_TITLE, 1, tag='special'),
+                   NovelData('Ipsum', Type.BOOK_INTRO, type=Type.CHAPTER_TITLE, tag='special')]:
+        assert process(before.copy()) == title_transformer.process(before.copy())
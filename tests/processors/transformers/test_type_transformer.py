@@ -55,3 +55,14 @@ def test_process_no_volume(type_transformer: TypeTransformer):
     before = NovelData('', Type.CHAPTER_TITLE)
     after = type_transformer.process(before)
     assert after.type == Type.CHAPTER_TITLE
+
+
+def test_process_batch():
+    batch = [NovelData('Title'), NovelData('Intro'), NovelData('Volume 1', Type.VOLUME_TITLE), NovelData('Intro'),
+             NovelData('Chapter 1', Type.CHAPTER_TITLE), NovelData('Content')]
+    reference = TypeTransformer({})
+    expected = [reference.process(data.copy()) for data in batch]
+
+    type_transformer = TypeTransformer({})
+    after = type_transformer.process_batch(batch[:3]) + type_transformer.process_batch(batch[3:])
+    assert after == expected
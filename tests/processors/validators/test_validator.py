@@ -86,3 +86,20 @@ def test_index(index_validator: StubValidator):
     after = index_validator.process(before)
     assert after == NovelData('First', Type.VOLUME_TITLE, 128, original_index=1,
                               error='Missing - expected: 128, actual: 1')
+
+
+def test_no_aliasing(overwrite_validator: StubValidator):
+    before = NovelData('First', Type.VOLUME_TITLE, 1, tag='special')
+    after = overwrite_validator.process(before)
+    assert after is not before
+    assert before == NovelData('First', Type.VOLUME_TITLE, 1, tag='special')
+
+    after.set(tag='changed')
+    before.set(error='Error')
+    assert before.get('tag') == 'special'
+    assert not after.has('error')
+
+    before = NovelData('Duplicate', Type.VOLUME_TITLE, 1)
+    after = overwrite_validator.process(before)
+    assert before == NovelData('Duplicate', Type.VOLUME_TITLE, 1)
+    assert after.index == 2 and after.has('error')
@@ -1,3 +1,4 @@
+import gzip
 from pathlib import Path
 from pytest import fixture, FixtureRequest, mark, raises
 from pytest_mock import MockerFixture
@@ -35,3 +36,35 @@ def test_invalid(mocker: MockerFixture):
     mocker.patch('pathlib.Path.open', mocker.mock_open(read_data=csv))
     with raises(ValueError, match='csv does not contain valid columns.'):
         CsvReader({'in_dir': Path()})
+
+
+@mark.data('''
+    content,index,line_num,source,valid,path
+
+    Test Chapter,,abc,chapters/1.txt,,chapters/1.txt
+''')
+def test_types(read: Iterator[NovelData]):
+    data = next(read)
+    assert data == NovelData('Test Chapter', Type.UNRECOGNIZED, None, line_num=None, source=Path('chapters/1.txt'),
+                             valid='', path='chapters/1.txt')
+    with raises(StopIteration):
+        next(read)
+
+
+def test_convert(mocker: MockerFixture):
+    csv = format_text('''
+    content,line_num,valid,path
+    Test Chapter,3,1,chapters/1.txt
+    ''')
+    mocker.patch('pathlib.Path.open', mocker.mock_open(read_data=csv))
+    reader = CsvReader({'in_dir': Path(), 'types': {'line_num': 'int', 'valid': 'bool', 'path': 'Path'},
+                        'join_dir': ['path']})
+    assert list(reader.read()) == [
+        NovelData('Test Chapter', line_num=3, valid=True, path=Path('chapters/1.txt'))
+    ]
+
+
+def test_compressed(tmp_path: Path):
+    (tmp_path / 'list.csv.gz').write_bytes(gzip.compress('type,content,index\nchapter_title,Test Chapter,1\n'.encode()))
+    read = CsvReader({'csv_filename': 'list.csv.gz', 'in_dir': tmp_path}).read()
+    assert list(read) == [NovelData('Test Chapter', Type.CHAPTER_TITLE, 1)]
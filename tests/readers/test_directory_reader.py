@@ -1,8 +1,12 @@
+import gzip
+import shutil
 from pathlib import Path
 from pytest import fixture, FixtureRequest, mark, raises
+from pytest_mock import MockerFixture
 from typing import Iterator
 from novel_tools.framework import NovelData, Type
-from novel_tools.readers.directory_reader import DirectoryReader
+from novel_tools.readers.directory_reader import DirectoryReader, cache_dirname, blob_suffix
+from novel_tools.readers.text_reader import TextReader
 
 
 def transform_list(file_list: list[str], volume: str = '') -> list[Path]:
@@ -108,3 +112,98 @@ def test_merge_newlines(read: Iterator[NovelData], test_directory: Path):
 
     with raises(StopIteration):
         next(read)
+
+
+@mark.parametrize('directory', ['test_contents', 'test_discard', 'test_intro', 'test_merge_newlines'])
+@mark.parametrize('read_contents', [False, True])
+def test_prefetch(reader_directory: Path, directory: str, read_contents: bool):
+    args = {'in_dir': reader_directory / 'directory_reader' / directory, 'read_contents': read_contents,
+            'discard_chapters': True}
+    expected = list(DirectoryReader(args).read())
+    for prefetch in [1, 2, 8]:
+        assert list(DirectoryReader(args | {'prefetch': prefetch}).read()) == expected
+
+
+@mark.parametrize('read_contents', [False, True])
+def test_cache(reader_directory: Path, tmp_path: Path, mocker: MockerFixture, read_contents: bool):
+    in_dir = tmp_path / 'novel'
+    shutil.copytree(reader_directory / 'directory_reader' / 'test_intro', in_dir)
+    args = {'in_dir': in_dir, 'read_contents': read_contents, 'discard_chapters': False}
+    expected = list(DirectoryReader(args).read())
+    assert list(DirectoryReader(args | {'cache': True}).read()) == expected
+    assert (in_dir / cache_dirname / 'manifest.json').is_file()
+
+    # Unchanged files are served from the cache, even after being moved.
+    (in_dir / 'Volume 1').rename(in_dir / 'Volume 2')
+    expected = list(DirectoryReader(args).read())
+    spy = mocker.spy(TextReader, 'read')
+    assert list(DirectoryReader(args | {'cache': True}).read()) == expected
+    assert spy.call_count == 0
+
+    # Only the changed file is read again.
+    chapter_path = next((in_dir / 'Volume 2').glob('Chapter*'))
+    with chapter_path.open('at') as f:
+        f.write('\nNew line')
+    expected = list(DirectoryReader(args).read())
+    spy.reset_mock()
+    assert list(DirectoryReader(args | {'cache': True, 'prefetch': 2}).read()) == expected
+    assert spy.call_count == 1
+    # The outdated blob has been removed.
+    file_count = 3 if read_contents else 1
+    blobs = list((in_dir / cache_dirname).glob(f'*{blob_suffix}'))
+    assert len(blobs) == file_count
+
+    # Blobs that are not valid are read again.
+    blobs[0].write_text('[[1], [2]]')
+    spy.reset_mock()
+    assert list(DirectoryReader(args | {'cache': True}).read()) == expected
+    assert spy.call_count == 1
+
+    spy.reset_mock()
+    assert list(DirectoryReader(args | {'cache': True, 'rebuild_cache': True}).read()) == expected
+    assert spy.call_count == file_count
+
+
+def test_cache_modes(reader_directory: Path, tmp_path: Path, mocker: MockerFixture):
+    in_dir = tmp_path / 'novel'
+    shutil.copytree(reader_directory / 'directory_reader' / 'test_intro', in_dir)
+    args = {'in_dir': in_dir, 'discard_chapters': False, 'cache': True}
+    expected = {read_contents: list(DirectoryReader(args | {'read_contents': read_contents}).read())
+                for read_contents in [True, False]}
+
+    # Runs with and without the contents keep each other's blobs.
+    spy = mocker.spy(TextReader, 'read')
+    for read_contents in [True, False, True, False]:
+        assert list(DirectoryReader(args | {'read_contents': read_contents}).read()) == expected[read_contents]
+    assert spy.call_count == 0
+
+
+def test_compressed(reader_directory: Path, tmp_path: Path):
+    in_dir = tmp_path / 'novel'
+    shutil.copytree(reader_directory / 'directory_reader' / 'test_intro', in_dir)
+    args = {'in_dir': in_dir, 'read_contents': True, 'discard_chapters': False}
+    expected = [(data.content, data.type, data.index) for data in DirectoryReader(args).read()]
+
+    for text_path in list(in_dir.rglob('*.txt')):
+        text_path.with_name(text_path.name + '.gz').write_bytes(gzip.compress(text_path.read_bytes()))
+        text_path.unlink()
+    assert [(data.content, data.type, data.index) for data in DirectoryReader(args).read()] == expected
+
+
+@mark.parametrize('archive_format', ['zip', 'gztar'])
+@mark.parametrize('prefetch', [0, 2])
+def test_archive(reader_directory: Path, tmp_path: Path, archive_format: str, prefetch: int):
+    in_dir = reader_directory / 'directory_reader' / 'test_intro'
+    args = {'read_contents': True, 'discard_chapters': False, 'prefetch': prefetch}
+    expected = list(DirectoryReader(args | {'in_dir': in_dir}).read())
+
+    # The archive contains the directory itself, which is treated as the root.
+    archive = Path(shutil.make_archive(str(tmp_path / 'novel'), archive_format, in_dir.parent, in_dir.name))
+    actual = list(DirectoryReader(args | {'in_dir': archive}).read())
+    assert [(data.content, data.type, data.index) for data in actual] == \
+           [(data.content, data.type, data.index) for data in expected]
+    assert [data.get('source').relative_to(archive) for data in actual] == \
+           [data.get('source').relative_to(in_dir) for data in expected]
+
+    with raises(ValueError, match='The cache is not supported when reading from an archive.'):
+        DirectoryReader(args | {'in_dir': archive, 'cache': True})
@@ -0,0 +1,69 @@
+import zipfile
+from pathlib import Path
+from novel_tools.framework import NovelData, Type
+from novel_tools.readers.epub_reader import EpubReader
+from novel_tools.writers.epub_writer import EpubWriter
+
+
+def test_read(tmp_path: Path):
+    (tmp_path / 'cover.jpg').write_bytes(b'\xff\xd8\xff\xe0')
+    (tmp_path / 'metadata.html').write_text('<body><div class="BOOK_TITLE">{title}</div><div class="METADATA">'
+                                            '{authors}</div><div class="BOOK_INTRO">{introduction}</div></body>')
+    writer = EpubWriter({'out_dir': tmp_path, 'in_dir': tmp_path, 'include_nav': True,
+                         'metadata_template': 'metadata.html'})
+    expected = [
+        NovelData('Book', Type.BOOK_TITLE, authors=['Author'], id='book', languages=['en'], tags=['Tag'],
+                  publisher='Publisher', date='2020-01-01T00:00:00'),
+        NovelData('Book Intro', Type.BOOK_INTRO),
+        NovelData('Volume 1', Type.VOLUME_TITLE, 1, order='1'),
+        NovelData('Volume Intro', Type.VOLUME_INTRO),
+        NovelData('Chapter 1', Type.CHAPTER_TITLE, 1, order='1'),
+        NovelData('Content 1', Type.CHAPTER_CONTENT, tag='quote'),
+        NovelData('', Type.CHAPTER_CONTENT),
+        NovelData('Content 2', Type.CHAPTER_CONTENT),
+        NovelData('Volume 2', Type.VOLUME_TITLE, 2, order='2'),
+        NovelData('Chapter 2', Type.CHAPTER_TITLE, 2, order='1'),
+        NovelData('Content 3', Type.CHAPTER_CONTENT),
+    ]
+    for data in expected:
+        writer.accept(data)
+    writer.write()
+
+    for data in expected:
+        if data.has('order'):
+            data.pop('order')
+    assert list(EpubReader({'epub_filename': 'Book.epub', 'in_dir': tmp_path}).read()) == expected
+    assert [data.index for data in EpubReader({'epub_filename': 'Book.epub', 'in_dir': tmp_path,
+                                               'discard_chapters': True}).read() if data.index is not None] == \
+           [1, 1, 2, 1]
+
+
+def test_ncx(tmp_path: Path):
+    """An epub without classes or a nav document, where the structure comes from the NCX."""
+    with zipfile.ZipFile(tmp_path / 'book.epub', 'w') as epub:
+        epub.writestr('META-INF/container.xml', '''<container xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+            <rootfiles><rootfile full-path="OEBPS/content.opf"/></rootfiles></container>''')
+        epub.writestr('OEBPS/content.opf', '''<package xmlns="http://www.idpf.org/2007/opf">
+            <metadata xmlns:dc="http://purl.org/dc/elements/1.1/"><dc:title>Book</dc:title></metadata>
+            <manifest>
+                <item id="ncx" href="toc.ncx"/>
+                <item id="volume" href="text/volume.html"/>
+                <item id="chapter" href="text/chapter%201.html"/>
+            </manifest>
+            <spine toc="ncx"><itemref idref="volume"/><itemref idref="chapter"/></spine></package>''')
+        epub.writestr('OEBPS/toc.ncx', '''<ncx xmlns="http://www.daisy.org/z3986/2005/ncx/"><navMap>
+            <navPoint><content src="text/volume.html"/>
+                <navPoint><content src="text/chapter%201.html#start"/></navPoint>
+            </navPoint></navMap></ncx>''')
+        epub.writestr('OEBPS/text/volume.html', '<html><body><h1>Volume</h1><p>Intro</p></body></html>')
+        epub.writestr('OEBPS/text/chapter 1.html', '<html><body><h1>Chapter</h1><p>Content<br/>More</p>'
+                                                   '<p><img src="a.jpg" alt="A"/></p></body></html>')
+
+    assert list(EpubReader({'epub_filename': 'book.epub', 'in_dir': tmp_path}).read()) == [
+        NovelData('Book', Type.BOOK_TITLE, authors=[], id=None, languages=[], tags=[]),
+        NovelData('Volume', Type.VOLUME_TITLE, 1),
+        NovelData('Intro', Type.VOLUME_INTRO),
+        NovelData('Chapter', Type.CHAPTER_TITLE, 1),
+        NovelData('Content\nMore', Type.CHAPTER_CONTENT),
+        NovelData('![A](a.jpg)', Type.CHAPTER_CONTENT),
+    ]
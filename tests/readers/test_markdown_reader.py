@@ -1,3 +1,4 @@
+import lzma
 from pathlib import Path
 from pytest import fixture, FixtureRequest, mark, raises
 from pytest_mock import MockerFixture
@@ -41,3 +42,9 @@ def test_levels(read: Iterator[NovelData]):
     assert next(read) == NovelData('### Unknown', Type.UNRECOGNIZED)
     with raises(StopIteration):
         next(read)
+
+
+def test_compressed(tmp_path: Path):
+    (tmp_path / 'text.md.xz').write_bytes(lzma.compress('# Title\n\nText 1'.encode()))
+    read = MarkdownReader({'md_filename': 'text.md.xz', 'in_dir': tmp_path}).read()
+    assert list(read) == [NovelData('Title', Type.BOOK_TITLE), NovelData('Text 1', Type.UNRECOGNIZED)]
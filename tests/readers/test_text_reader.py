@@ -1,9 +1,15 @@
+import bz2
+import gzip
+import lzma
+import re
+from io import StringIO
 from pathlib import Path
-from pytest import fixture, FixtureRequest, mark, raises
+from pytest import fixture, FixtureRequest, importorskip, mark, raises
 from pytest_mock import MockerFixture
 from typing import Iterator
 from novel_tools.framework import NovelData, Type
-from novel_tools.readers.text_reader import TextReader
+from novel_tools.readers.text_reader import TextReader, split_lines
+from novel_tools.utils import LineIndex
 
 
 @fixture
@@ -39,3 +45,139 @@ def test_merge_newlines(read: Iterator[NovelData]):
     assert next(read) == NovelData('line 4', Type.UNRECOGNIZED)
     with raises(StopIteration):
         next(read)
+
+
+def test_shards(reader_directory: Path):
+    text_reader = TextReader({'text_filename': 'shards.txt', 'in_dir': reader_directory / 'text_reader'})
+    expected = list(text_reader.read())
+    for count in range(1, 8):
+        shards = text_reader.shards(count)
+        assert shards[0][0] == 0
+        assert all(shards[i][1] == shards[i + 1][0] for i in range(len(shards) - 1))
+        assert [data for shard in shards for data in text_reader.read_range(*shard)] == expected
+
+
+@mark.parametrize('filename', ['shards.txt', 'newlines.txt'])
+@mark.parametrize('args', [{}, {'verbose': True}, {'merge_newlines': True}])
+def test_mmap(reader_directory: Path, filename: str, args: dict):
+    args |= {'text_filename': filename, 'in_dir': reader_directory / 'text_reader'}
+    expected = list(TextReader(args).read())
+    assert list(TextReader(args | {'mmap': True}).read()) == expected
+
+
+def test_mmap_empty(tmp_path: Path):
+    (tmp_path / 'empty.txt').touch()
+    assert list(TextReader({'text_filename': 'empty.txt', 'in_dir': tmp_path, 'mmap': True}).read()) == []
+
+
+@mark.parametrize('encoding', ['utf-8', 'gbk', 'utf-16'])
+def test_split_lines(reader_directory: Path, encoding: str):
+    with (reader_directory / 'text_reader' / 'newlines.txt').open('rt', encoding='utf-8', newline='') as f:
+        text = f.read()
+    expected = [line.rstrip('\r\n') for line in StringIO(text, newline=None)]
+    buffer = text.encode(encoding)
+    for block_size in range(1, 9):
+        assert list(split_lines(buffer, encoding, block_size)) == expected
+
+
+@mark.parametrize('filename', ['shards.txt', 'newlines.txt'])
+def test_read_lines(reader_directory: Path, tmp_path: Path, filename: str):
+    text_path = tmp_path / filename
+    text_path.write_bytes((reader_directory / 'text_reader' / filename).read_bytes())
+    text_reader = TextReader({'text_filename': filename, 'in_dir': tmp_path, 'verbose': True, 'line_index': True})
+    expected = list(text_reader.read())
+    assert LineIndex.index_path(text_path).is_file()
+    assert len(LineIndex.load(text_path)) == len(expected)
+    for first in range(1, len(expected) + 1):
+        for last in [first, first + 2, None]:
+            assert list(text_reader.read_lines(first, last)) == expected[first - 1:last]
+
+
+def test_line_index_outdated(tmp_path: Path):
+    text_path = tmp_path / 'text.txt'
+    text_path.write_text('line 1\nline 2\n')
+    LineIndex.open(text_path)
+    assert LineIndex.load(text_path) is not None
+
+    text_path.write_text('line 1\nline 2\nline 3')
+    assert LineIndex.load(text_path) is None
+    text_reader = TextReader({'text_filename': 'text.txt', 'in_dir': tmp_path, 'line_index': True})
+    assert list(text_reader.read_lines(3)) == [NovelData('line 3')]
+    assert len(LineIndex.load(text_path)) == 3
+
+
+@mark.parametrize('compression', ['gz', 'xz', 'bz2', 'zst'])
+@mark.parametrize('suffix', [True, False])
+def test_compressed(reader_directory: Path, tmp_path: Path, compression: str, suffix: bool):
+    if compression == 'zst':
+        zstd = importorskip('zstandard')
+        compress = zstd.ZstdCompressor().compress
+    else:
+        compress = {'gz': gzip.compress, 'xz': lzma.compress, 'bz2': bz2.compress}[compression]
+
+    text_path = reader_directory / 'text_reader' / 'newlines.txt'
+    # Without a known suffix, the compression is detected from the magic bytes.
+    filename = f'newlines.txt.{compression}' if suffix else 'newlines'
+    (tmp_path / filename).write_bytes(compress(text_path.read_bytes()))
+    expected = list(TextReader({'text_filename': str(text_path)}).read())
+    assert list(TextReader({'text_filename': filename, 'in_dir': tmp_path}).read()) == expected
+    assert list(TextReader({'text_filename': filename, 'in_dir': tmp_path, 'mmap': True}).read()) == expected
+    with raises(ValueError, match='Cannot index the lines of compressed file'):
+        list(TextReader({'text_filename': filename, 'in_dir': tmp_path, 'line_index': True}).read())
+
+
+@mark.data('　　第一段，\n第一段。\n　　第二段，\n第二段\n\n第三段\nThe quick\nbrown fox.\n  Indented', {'reflow': True})
+def test_reflow(read: Iterator[NovelData]):
+    assert list(read) == [NovelData('第一段，第一段。'), NovelData('第二段，第二段'), NovelData(''),
+                          NovelData('第三段The quick brown fox.'), NovelData('Indented')]
+
+
+@mark.data('abcdef\nab\ncd\nChapter 1\nef', {'reflow': True, 'reflow_width': 5, 'reflow_boundary': '^Chapter',
+                                              'verbose': True})
+def test_reflow_boundary(read: Iterator[NovelData]):
+    source = Path('text.txt')
+    assert list(read) == [NovelData('abcdef ab', source=source, line_num=1, raw='abcdef ab'),
+                          NovelData('cd', source=source, line_num=3, raw='cd'),
+                          NovelData('Chapter 1', source=source, line_num=4, raw='Chapter 1'),
+                          NovelData('ef', source=source, line_num=5, raw='ef')]
+
+
+def test_reflow_boundary_lines(mocker: MockerFixture):
+    mocker.patch('pathlib.Path.open', mocker.mock_open(read_data='Title\nab\ncd\nSection\nef\ngh'))
+    reader = TextReader({'in_dir': Path(), 'reflow': True})
+    reader.add_reflow_boundary_lines([1], ['Section'])
+    assert list(reader.read()) == [NovelData('Title'), NovelData('ab cd'), NovelData('Section'), NovelData('ef gh')]
+
+
+@mark.parametrize('block_size', [1, 3, 7, 1 << 20])
+def test_max_line_length(mocker: MockerFixture, block_size: int):
+    mocker.patch('novel_tools.readers.text_reader.BLOCK_SIZE', block_size)
+    text = '第一句。第二句！“第三句？”第四句很长很长很长\n\nshort\n' + 'x' * 12
+    mocker.patch('pathlib.Path.open', mocker.mock_open(read_data=text))
+    read = TextReader({'in_dir': Path(), 'max_line_length': 5, 'verbose': True}).read()
+    assert [(data.content, data.get('line_num')) for data in read] == [
+        ('第一句。', 1), ('第二句！', 1), ('“第三句？', 1), ('”第四句很', 1), ('长很长很长', 1), ('', 2), ('short', 3),
+        ('xxxxx', 4), ('xxxxx', 4), ('xx', 4)
+    ]
+
+
+def test_max_line_length_reflow():
+    with raises(ValueError, match='reflow and max_line_length cannot be used together.'):
+        TextReader({'max_line_length': 5, 'reflow': True})
+
+
+@mark.parametrize('block_size', [1, 4, 1 << 20])
+def test_scan(mocker: MockerFixture, tmp_path: Path, block_size: int):
+    mocker.patch('novel_tools.readers.text_reader.BLOCK_SIZE', block_size)
+    text_path = tmp_path / 'text.txt'
+    text_path.write_bytes('Book\r\n\r\n第一章 A\r\n　内容\r\n  第二章 B \r\n第\r\n内容第三章\n番外'.encode())
+    reader = TextReader({'text_filename': str(text_path), 'verbose': True})
+    locator = re.compile('^[^\\S\\n]*(?:第|番外)', re.MULTILINE)
+    expected = [data for data in reader.read() if data.get('line_num') == 1 or data.content.startswith(('第', '番外'))]
+    assert [data.get('line_num') for data in expected] == [1, 3, 5, 6, 8]
+    assert list(reader.scan(locator)) == expected
+
+
+def test_scan_unsupported():
+    with raises(ValueError, match='Scanning does not support'):
+        next(TextReader({'merge_newlines': True}).scan(re.compile('^', re.MULTILINE)))
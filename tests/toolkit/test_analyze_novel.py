@@ -1,7 +1,9 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from pytest import mark
+from pytest import mark, raises
 from pytest_mock import MockerFixture
-from novel_tools.toolkit import analyze
+from novel_tools.toolkit import analyze, analyze_async
 from novel_tools.utils import get_config
 
 
@@ -115,3 +117,173 @@ def test_struct_4(toolkit_directories: tuple[Path, Path]):
 
     assert_file(output_dir / 'toc.txt', data_dir / 'toc.txt')
     assert_file(output_dir / 'list.csv', data_dir / 'list.csv')
+
+
+@mark.slow
+def test_struct_4_batch(toolkit_directories: tuple[Path, Path]):
+    data_dir, output_dir = toolkit_directories
+    data_dir = data_dir / 'Novel 4'
+    analyze(get_config('struct_config.json', data_dir), filename=data_dir / 'Novel 4.txt', out_dir=output_dir,
+            batch_size=7)
+
+    assert_file(output_dir / 'toc.txt', data_dir / 'toc.txt')
+    assert_file(output_dir / 'list.csv', data_dir / 'list.csv')
+
+
+@mark.slow
+def test_create_3_pipelined(toolkit_directories: tuple[Path, Path]):
+    data_dir, output_dir = toolkit_directories
+    data_dir = data_dir / 'Novel 3'
+    analyze(get_config('create_config.json', data_dir), filename=data_dir / 'Novel 3.txt', out_dir=output_dir,
+            batch_size=4, pipelined=True, queue_size=2)
+
+    assert_file(output_dir / 'Test 3.md', data_dir / 'Novel 3.md')
+
+
+@mark.slow
+def test_struct_compiled(toolkit_directories: tuple[Path, Path]):
+    data_dir, output_dir = toolkit_directories
+    for novel in ['Novel 2', 'Novel 3', 'Novel 4']:
+        novel_dir = data_dir / novel
+        for batch_size in [1, 5]:
+            analyze(get_config('struct_config.json', novel_dir), filename=novel_dir / f'{novel}.txt',
+                    out_dir=output_dir, batch_size=batch_size, compiled=True)
+
+            for structure_file in ['toc.txt', 'list.csv']:
+                if (novel_dir / structure_file).is_file():
+                    assert_file(output_dir / structure_file, novel_dir / structure_file)
+
+
+@mark.slow
+def test_split_compiled(toolkit_directories: tuple[Path, Path], mocker: MockerFixture):
+    data_dir, output_dir = toolkit_directories
+    data_dir = data_dir / 'Novel 1'
+    mocker.patch('builtins.print')
+    analyze(get_config('split_config.json', data_dir), filename=data_dir / 'Novel 1.txt', out_dir=output_dir,
+            compiled=True)
+
+    assert_directory(output_dir, data_dir / 'dir')
+
+
+@mark.slow
+def test_struct_sharded(toolkit_directories: tuple[Path, Path]):
+    data_dir, output_dir = toolkit_directories
+    for novel in ['Novel 2', 'Novel 3', 'Novel 4']:
+        novel_dir = data_dir / novel
+        analyze(get_config('struct_config.json', novel_dir), filename=novel_dir / f'{novel}.txt', out_dir=output_dir,
+                processes=2)
+
+        for structure_file in ['toc.txt', 'list.csv']:
+            if (novel_dir / structure_file).is_file():
+                assert_file(output_dir / structure_file, novel_dir / structure_file)
+
+
+@mark.slow
+def test_struct_sharded_chunked(toolkit_directories: tuple[Path, Path]):
+    data_dir, output_dir = toolkit_directories
+    for novel in ['Novel 2', 'Novel 3', 'Novel 4']:
+        novel_dir = data_dir / novel
+        config = get_config('struct_config.json', novel_dir)
+        # The pieces of a split line share its line number, which must not shift the line numbers of later shards.
+        config['readers'][0]['max_line_length'] = 40
+        results = []
+        for processes in [None, 3]:
+            analyze(config, filename=novel_dir / f'{novel}.txt', out_dir=output_dir, processes=processes)
+            results.append([(output_dir / structure_file).read_text() for structure_file in ['toc.txt', 'list.csv']
+                            if (novel_dir / structure_file).is_file()])
+
+        assert results[0] == results[1]
+
+
+def test_sharded_unsupported(toolkit_directories: tuple[Path, Path]):
+    data_dir, output_dir = toolkit_directories
+    data_dir = data_dir / 'Novel 3'
+    with raises(ValueError):
+        analyze(get_config('create_config.json', data_dir), filename=data_dir / 'Novel 3.txt', out_dir=output_dir,
+                processes=2)
+
+
+@mark.parametrize('mode', [{'processes': 2}, {'scan': True}], ids=['sharded', 'scan'])
+def test_intro_units_unsupported(toolkit_directories: tuple[Path, Path], mode: dict):
+    data_dir, output_dir = toolkit_directories
+    data_dir = data_dir / 'Novel 3'
+    config = get_config('struct_config.json', data_dir)
+    # The introductions are not passed to the transformers, but CsvWriter would write them once formatted.
+    transformer = next(stage for stage in config['transformers'] if stage['class'] == 'TitleTransformer')
+    transformer['units'].append({'filter': {'type': 'book_intro'}, 'format': '{content}'})
+    with raises(ValueError, match='only supports TitleTransformer units that filter on a title type.'):
+        analyze(config, filename=data_dir / 'Novel 3.txt', out_dir=output_dir, **mode)
+
+
+def test_struct_scan(toolkit_directories: tuple[Path, Path]):
+    data_dir, output_dir = toolkit_directories
+    for novel in ['Novel 2', 'Novel 3', 'Novel 4']:
+        novel_dir = data_dir / novel
+        analyze(get_config('struct_config.json', novel_dir), filename=novel_dir / f'{novel}.txt', out_dir=output_dir,
+                scan=True)
+
+        for structure_file in ['toc.txt', 'list.csv']:
+            if (novel_dir / structure_file).is_file():
+                assert_file(output_dir / structure_file, novel_dir / structure_file)
+
+
+def test_scan_unsupported(toolkit_directories: tuple[Path, Path]):
+    data_dir, output_dir = toolkit_directories
+    data_dir = data_dir / 'Novel 3'
+    config = get_config('struct_config.json', data_dir)
+    config['readers'][0]['max_line_length'] = 100
+    with raises(ValueError, match='max_line_length'):
+        analyze(config, filename=data_dir / 'Novel 3.txt', out_dir=output_dir, scan=True)
+    with raises(ValueError, match='^Scanning requires exactly one TextReader.$'):
+        analyze(get_config('create_config.json', data_dir), filename=data_dir / 'Novel 3.txt', out_dir=output_dir,
+                scan=True)
+    config = get_config('struct_config.json', data_dir)
+    config['readers'][0]['reflow'] = True
+    with raises(ValueError, match='^Scanning does not support reflow.$'):
+        analyze(config, filename=data_dir / 'Novel 3.txt', out_dir=output_dir, scan=True)
+
+
+@mark.slow
+def test_struct_reflow(toolkit_directories: tuple[Path, Path]):
+    data_dir, output_dir = toolkit_directories
+    for novel in ['Novel 2', 'Novel 3', 'Novel 4']:
+        novel_dir = data_dir / novel
+        config = get_config('struct_config.json', novel_dir)
+        # The titles are never joined, so the structure is the same.
+        for reader in config['readers']:
+            reader['reflow'] = True
+        analyze(config, filename=novel_dir / f'{novel}.txt', out_dir=output_dir)
+
+        for structure_file in ['toc.txt', 'list.csv']:
+            if (novel_dir / structure_file).is_file():
+                assert_file(output_dir / structure_file, novel_dir / structure_file)
+
+
+def test_create_reflow(tmp_path: Path):
+    (tmp_path / 'text.txt').write_text('Book\nPrologue\nThe quick\nbrown fox.\nChapter One\nJumps over\nthe dog.\n')
+    (tmp_path / 'list.csv').write_text('type,content,line_num\nCHAPTER_TITLE,Prologue,2\nCHAPTER_TITLE,One,5\n')
+    config = {
+        'readers': [{'class': 'TextReader', 'verbose': True, 'reflow': True}],
+        'matchers': [{'class': 'CsvMatcher'}],
+        'transformers': [{'class': 'TypeTransformer'}],
+        'writers': [{'class': 'MarkdownWriter', 'use_title': False}]
+    }
+    analyze(config, filename=tmp_path / 'text.txt')
+
+    # The titles do not end with punctuation, but are never joined with the paragraphs after them.
+    assert (tmp_path / 'text.md').read_text() == \
+           '# Book\n\n### Prologue\n\nThe quick brown fox.\n\n### One\n\nJumps over the dog.'
+
+
+@mark.slow
+def test_async(toolkit_directories: tuple[Path, Path]):
+    data_dir, output_dir = toolkit_directories
+    for novel in ['Novel 2', 'Novel 3', 'Novel 4']:
+        novel_dir = data_dir / novel
+        with ThreadPoolExecutor(1) as executor:
+            asyncio.run(analyze_async(get_config('struct_config.json', novel_dir), filename=novel_dir / f'{novel}.txt',
+                                      out_dir=output_dir, executor=executor))
+
+        for structure_file in ['toc.txt', 'list.csv']:
+            if (novel_dir / structure_file).is_file():
+                assert_file(output_dir / structure_file, novel_dir / structure_file)
@@ -0,0 +1,103 @@
+import random
+from pytest import mark, raises
+from novel_tools.utils import to_num
+
+digits = '零一二三四五六七八九'
+units = ['', '十', '百', '千']
+
+
+def to_chinese(num: int) -> str:
+    """Writes the number in the standard form, e.g., 10005 is 一万零五, and 15 is 十五."""
+    if num == 0:
+        return digits[0]
+
+    result = ''
+    zero = False
+    for large_value, large_unit in [(10 ** 8, '亿'), (10 ** 4, '万'), (1, '')]:
+        section, num = divmod(num, large_value)
+        if section == 0:
+            zero = zero or bool(result)
+            continue
+
+        for i in reversed(range(4)):
+            digit = section // 10 ** i % 10
+            if digit == 0:
+                zero = zero or bool(result)
+                continue
+            if zero:
+                result += digits[0]
+                zero = False
+            result += digits[digit] + units[i]
+        result += large_unit
+
+    return result[1:] if result.startswith('一十') else result
+
+
+def to_roman(num: int) -> str:
+    result = ''
+    for value, letters in [(1000, 'M'), (900, 'CM'), (500, 'D'), (400, 'CD'), (100, 'C'), (90, 'XC'), (50, 'L'),
+                           (40, 'XL'), (10, 'X'), (9, 'IX'), (5, 'V'), (4, 'IV'), (1, 'I')]:
+        count, num = divmod(num, value)
+        result += letters * count
+    return result
+
+
+def test_exhaustive():
+    financial = str.maketrans('一二三四五六七八九十百千', '壹贰叁肆伍陆柒捌玖拾佰仟')
+    full_width = str.maketrans('0123456789', '０１２３４５６７８９')
+    for num in range(10 ** 5):
+        chinese = to_chinese(num)
+        assert to_num(chinese) == num, chinese
+        assert to_num(chinese.translate(financial)) == num, chinese
+        assert to_num(str(num).translate(full_width)) == num
+
+
+def test_sampled():
+    rng = random.Random(0)
+    for num in [rng.randrange(10 ** 8) for _ in range(20000)] + [10 ** 8, 10 ** 8 + 1]:
+        assert to_num(to_chinese(num)) == num, to_chinese(num)
+
+
+def test_roman():
+    for num in range(1, 4000):
+        roman = to_roman(num)
+        assert to_num(roman) == num
+        assert to_num(roman.lower()) == num
+
+
+@mark.parametrize('num, value', [
+    ('  十一 ', 11),
+    ('两百', 200),
+    ('三千五', 3500),
+    ('一百五', 150),
+    ('两万三', 23000),
+    ('三千零五', 3005),
+    ('一二三', 123),
+    ('二〇二三', 2023),
+    ('1百', 100),
+    ('3千5百', 3500),
+    ('１２万', 120000),
+    ('廿一', 21),
+    ('卅', 30),
+    ('一万亿', 10 ** 12),
+    ('一万亿五千亿', 15 * 10 ** 11),
+    ('一千零十', 1010),
+    ('一百廿', 120),
+    ('弐拾参', 23),
+    ('壱萬', 10000),
+    ('Ⅻ', 12),
+    ('ⅩⅣ', 14),
+    ('ⅳ', 4),
+    ('-3', -3),
+])
+def test_forms(num: str, value: int):
+    assert to_num(num) == value
+
+
+@mark.parametrize('num', [
+    '', '十人', 'One', 'IIII', 'Xii', 'VX', '二廿', '1.5',
+    '四千千', '千百', '十十', '百五百', '五五十', '二十千五', '一百一十一十', '一亿一亿', '一万一亿', '亿万',
+])
+def test_invalid(num: str):
+    with raises(ValueError):
+        to_num(num)
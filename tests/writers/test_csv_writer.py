@@ -55,3 +55,14 @@ def test_additional_fields(csv_writer: CsvWriter, writer_directory: Path):
     csv_path = writer_directory / 'list.csv'
     assert_csv(csv_path, ['type,index,content,formatted,tag,raw',
                           'VOLUME_TITLE,1,Lorem,Volume 1. Lorem,special,Volume One Lorem'])
+
+
+def test_accept_batch(csv_writer: CsvWriter, writer_directory: Path):
+    csv_writer.accept_batch([NovelData('Title', Type.BOOK_TITLE),
+                             NovelData('Lorem', Type.VOLUME_TITLE, 1, formatted='Volume 1. Lorem'),
+                             NovelData('Content', Type.VOLUME_INTRO)])
+
+    csv_writer.write()
+    csv_path = writer_directory / 'list.csv'
+    assert_csv(csv_path, ['type,index,content,formatted',
+                          'VOLUME_TITLE,1,Lorem,Volume 1. Lorem'])
@@ -143,3 +143,26 @@ def test_debug(directory_writer: DirectoryWriter, mocker: MockerFixture):
 
     directory_writer.write()
     mp.assert_called_once_with('Error')
+
+
+@mark.args({'stream': True})
+def test_stream(directory_writer: DirectoryWriter, writer_directory: Path):
+    data = NovelData('Intro', Type.BOOK_INTRO)
+    directory_writer.accept(data)
+    data = NovelData('Ipsum', Type.CHAPTER_TITLE, 1, formatted='Chapter 1 Ipsum')
+    directory_writer.accept(data)
+    data = NovelData('Content', Type.CHAPTER_CONTENT)
+    directory_writer.accept(data)
+    assert not (writer_directory / 'default' / 'Chapter 1 Ipsum.txt').exists()
+    data = NovelData('Dolor', Type.CHAPTER_TITLE, 2, formatted='Chapter 2 Dolor')
+    directory_writer.accept(data)
+    assert (writer_directory / 'default' / 'Chapter 1 Ipsum.txt').is_file()
+
+    directory_writer.write()
+    assert_directory(writer_directory, {
+        '_intro.txt': 'Intro',
+        'default': {
+            'Chapter 1 Ipsum.txt': 'Chapter 1 Ipsum\n\nContent',
+            'Chapter 2 Dolor.txt': 'Chapter 2 Dolor\n\n'
+        }
+    })
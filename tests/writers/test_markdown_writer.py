@@ -114,3 +114,28 @@ def test_debug(markdown_writer: MarkdownWriter, writer_directory: Path, mocker:
 
     markdown_writer.write()
     mp.assert_called_once_with('Error')
+
+
+@mark.args({
+    'use_title': False,
+    'stream': True,
+    'write_newline': True,
+})
+def test_stream(markdown_writer: MarkdownWriter, writer_directory: Path):
+    data = NovelData('Title', Type.BOOK_TITLE)
+    markdown_writer.accept(data)
+    data = NovelData('Volume', Type.VOLUME_TITLE)
+    markdown_writer.accept(data)
+    data = NovelData('Title', Type.CHAPTER_TITLE, formatted='Chapter 1')
+    markdown_writer.accept(data)
+    data = NovelData('Content', Type.CHAPTER_CONTENT)
+    markdown_writer.accept(data)
+    data = NovelData('Content 2', Type.CHAPTER_CONTENT)
+    markdown_writer.accept(data)
+    data = NovelData('Title', Type.CHAPTER_TITLE, formatted='Chapter 2')
+    markdown_writer.accept(data)
+    assert markdown_writer.curr_volume.children == []
+
+    markdown_writer.write()
+    md_path = writer_directory / 'text.md'
+    assert_md(md_path, '# Title\n\n## Volume\n\n### Chapter 1\n\nContent\n\nContent 2\n\n### Chapter 2\n\n')
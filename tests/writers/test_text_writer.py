@@ -1,5 +1,5 @@
 from pathlib import Path
-from pytest import fixture, FixtureRequest, mark
+from pytest import fixture, FixtureRequest, mark, raises
 from pytest_mock import MockerFixture
 from novel_tools.framework import NovelData, Type
 from novel_tools.writers.text_writer import TextWriter
@@ -95,3 +95,60 @@ def test_debug(text_writer: TextWriter, writer_directory: Path, mocker: MockerFi
 
     text_writer.write()
     mp.assert_called_once_with('Error')
+
+
+@mark.parametrize('book', [
+    [
+        NovelData('Title', Type.BOOK_TITLE),
+        NovelData('Book Intro', Type.BOOK_INTRO),
+        NovelData('Volume 1', Type.VOLUME_TITLE),
+        NovelData('Volume Intro', Type.VOLUME_INTRO),
+        NovelData('Chapter 1', Type.CHAPTER_TITLE),
+        NovelData('Content 1', Type.CHAPTER_CONTENT),
+        NovelData('', Type.CHAPTER_CONTENT),
+        NovelData('Chapter 2', Type.CHAPTER_TITLE),
+        NovelData('Volume 2', Type.VOLUME_TITLE),
+        NovelData('Volume 3', Type.VOLUME_TITLE),
+        NovelData('Chapter 3', Type.CHAPTER_TITLE),
+        NovelData('Content 3', Type.CHAPTER_CONTENT),
+    ],
+    [
+        NovelData('Book Intro', Type.BOOK_INTRO),
+        NovelData('Chapter 1', Type.CHAPTER_TITLE),
+        NovelData('Content 1', Type.CHAPTER_CONTENT),
+        NovelData('Chapter 2', Type.CHAPTER_TITLE),
+        NovelData('Content 2', Type.CHAPTER_CONTENT),
+    ],
+    [
+        NovelData('Title', Type.BOOK_TITLE),
+    ],
+])
+def test_stream(book: list[NovelData], writer_directory: Path):
+    writer = TextWriter({'use_title': False, 'out_dir': writer_directory})
+    stream_writer = TextWriter({'use_title': False, 'text_filename': 'stream.txt', 'stream': True,
+                                'out_dir': writer_directory})
+    for data in book:
+        writer.accept(data)
+        stream_writer.accept(data)
+
+    writer.write()
+    stream_writer.write()
+    with (writer_directory / 'text.txt').open('rt') as f:
+        assert_text(writer_directory / 'stream.txt', f.read())
+
+
+@mark.parametrize('stream', [False, True])
+def test_close_on_error(writer_directory: Path, mocker: MockerFixture, stream: bool):
+    writer = TextWriter({'use_title': False, 'stream': stream, 'out_dir': writer_directory})
+    mocker.patch.object(writer, '_write_chapter', side_effect=RuntimeError('Failed'))
+    with raises(RuntimeError, match='Failed'):
+        for data in [NovelData('Title', Type.BOOK_TITLE), NovelData('Chapter 1', Type.CHAPTER_TITLE),
+                     NovelData('Content', Type.CHAPTER_CONTENT), NovelData('Chapter 2', Type.CHAPTER_TITLE)]:
+            writer.accept(data)
+        writer.write()
+
+    # In stream mode, the chapter fails before `write()`, and the Worker closes the writer instead.
+    assert (writer.file is None) != stream
+    writer.close()
+    assert writer.file is None
+    assert_text(writer_directory / 'text.txt', 'Title\n\n')